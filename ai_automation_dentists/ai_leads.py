@@ -16,20 +16,50 @@ Usage:
     3. pip install requests beautifulsoup4 gspread
     4. python ai_leads.py
 
+    python ai_leads.py --trace run.json       # also write a JSON timing trace
+    python ai_leads.py --profile [out.prof]   # run under cProfile
+    python ai_leads.py --reaudit [days]       # re-check old non-leads (conditional GET)
+    python ai_leads.py --queries              # query yield / cost-per-lead report
+    python ai_leads.py --rescore              # re-tier stored audits after editing GAP_RULES / SCORE_WEIGHTS
+    python ai_leads.py --rescore --dry-run    # ...just print the new tier counts
+    python ai_leads.py --workers 16           # audit 16 domains at once (1 = serial)
+    python ai_leads.py --shard 1/3            # one of 3 copies sharing this DB (queries split, domains leased)
+    python ai_leads.py --serve-frontier [port] --frontier-host 0.0.0.0 --frontier-token SECRET
+                                              # coordinate copies on other machines...
+    python ai_leads.py --shard 2/3 --coordinator http://host:8765 --frontier-token SECRET
+                                              # ...which run like this
+
 Output: ai_leads_YYYY-MM-DD.csv + Google Sheet (real-time)
 """
 
-import requests
 import csv
 import re
 import time
 import sqlite3
 import random
 import os
-from datetime import datetime, date
-from urllib.parse import urlparse
-from bs4 import BeautifulSoup
+import sys
+import json
+import math
+import threading
+import hashlib
+import zlib
+import html as html_lib
+import itertools
+from collections import defaultdict, Counter
+from contextlib import contextmanager
+from datetime import datetime, date, timedelta
+from urllib.parse import urlparse, urljoin, unquote
 import socket
+# requests, bs4, gspread, dnspython, numpy, multiprocessing, concurrent.futures,
+# http.server and urllib.request are imported where they are used, so
+# --queries / --rescore don't pay ~150 ms for libraries they never touch
+# (python bench.py --imports keeps this honest)
+from signal_rules import (
+    SNIPPET_RULES, RULES_BY_NAME, GAP_RULES, rules_in, match_rules, gaps_from_hits,
+    GAP_NO_BOOKING, GAP_NO_CHATBOT, GAP_NO_REVIEWS, GAP_NO_PORTAL,
+    GAP_NO_SMS, GAP_PHONE_ONLY, GAP_PAPER_FORMS, GAP_NO_EMAIL_MKTG,
+)
 
 # ============================================================
 # CONFIG
@@ -42,10 +72,34 @@ GOOGLE_SHEET_URL = ""
 DAILY_LEAD_TARGET = 600
 BRAVE_SEARCH_DELAY = 0.06
 SITE_AUDIT_DELAY = 0.8
+SUBPAGE_DELAY = 0.2           # between /contact, /about... fetches on one site
 REQUEST_TIMEOUT = 12
+PREFLIGHT_TIMEOUT = 2         # DNS + TCP connect budget per host before any GET is sent
+PREFLIGHT_WORKERS = 64        # hosts checked at once in the pre-flight pass
+AUDIT_WORKERS = 8             # domains fetched/verified at once (--workers N; 1 = one by one)
+ANALYZER_PROCESSES = None     # HTML analysis processes; None = one per core, 0 = in the I/O threads
+FETCH_MAX_BYTES = 2 * 1024 * 1024   # stop downloading a page after 2 MB
+FETCH_CHUNK_BYTES = 64 * 1024
 BRAVE_COUNT = 20
+BRAVE_COST_PER_1K = 3.0       # USD per 1,000 Brave API calls
+BRAVE_MAX_OFFSET = 9          # Brave serves at most 10 pages (offset 0-9) per query
+SEARCH_PAGE_MIN_NEW = 5       # only fetch the next page if this one gave this many new domains
+SEARCH_CACHE_DAYS = 7         # reuse cached search result pages for this long
+QUERY_RETIRE_AFTER = 3        # retire a query after this many runs in a row with no new domains...
+QUERY_RETIRE_DAYS = 60        # ...and give it another try after this long
+QUERY_EXPLORATION = 0.3       # UCB bonus weight — higher = try unproven queries more often
+QUERY_LEAD_WEIGHT = 5         # one lead is worth this many fresh domains when ranking queries
+PRESCORE_HISTORY_WEIGHT = 10  # pre-score points for a query/niche whose candidates were all leads
+PRESCORE_PRIOR = 20           # past candidates a query/niche needs before its own lead rate dominates
 MIN_TOTAL_SCORE = 30          # lower bar since we now require contact info
+REAUDIT_AFTER_DAYS = 30       # --reaudit revisits non-leads not checked for this long
 DB_FILE = "ai_leads_history.db"
+SHARD = (0, 1)                # (index, count), 0-based — --shard 2/4 on the command line is (1, 4)
+COORDINATOR_URL = ""          # --coordinator http://host:8765 — frontier on another machine
+FRONTIER_PORT = 8765          # --serve-frontier listens here
+FRONTIER_HOST = "127.0.0.1"   # ...on this interface — --frontier-host 0.0.0.0 to accept other machines
+FRONTIER_TOKEN = ""           # --frontier-token — shared secret; the coordinator and every copy need the same one
+LEASE_SECONDS = 600           # a claimed domain goes back to the pool if not reported by then
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 TODAY = date.today().isoformat()
@@ -60,6 +114,92 @@ HEADERS = {
 }
 
 api_calls = 0
+search_cache_hits = 0
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+# ============================================================
+# RUN TIMING — per-stage wall time, summarised at end of run
+# ============================================================
+
+_stage_times = defaultdict(list)  # stage -> [seconds, ...]
+_trace_events = []                # Chrome trace events (only when tracing)
+_trace_enabled = False
+_run_start = time.perf_counter()
+
+
+def record_stage(stage, elapsed, start=None):
+    """Record one occurrence of a pipeline stage that took `elapsed` seconds."""
+    _stage_times[stage].append(elapsed)
+    if _trace_enabled:
+        if start is None:
+            start = time.perf_counter() - elapsed
+        _trace_events.append({
+            "name": stage, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+            "ts": int((start - _run_start) * 1e6), "dur": int(elapsed * 1e6),
+        })
+
+
+@contextmanager
+def timed(stage):
+    """Time the enclosed block as one occurrence of `stage`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - start, start)
+
+
+def throttle(seconds):
+    """Deliberate politeness delay — timed so the summary shows what it costs."""
+    with timed("throttle"):
+        time.sleep(seconds)
+
+
+def _percentile(sorted_vals, pct):
+    """Nearest-rank percentile of an already-sorted list."""
+    if not sorted_vals:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_vals)))
+    return sorted_vals[rank - 1]
+
+
+def timing_summary():
+    """{stage: {count, total, mean, p50, p90, p99, max}} — seconds."""
+    summary = {}
+    for stage, vals in _stage_times.items():
+        vals = sorted(vals)
+        summary[stage] = {
+            "count": len(vals),
+            "total": sum(vals),
+            "mean": sum(vals) / len(vals),
+            "p50": _percentile(vals, 50),
+            "p90": _percentile(vals, 90),
+            "p99": _percentile(vals, 99),
+            "max": vals[-1],
+        }
+    return summary
+
+
+def print_timing_summary():
+    summary = timing_summary()
+    if not summary:
+        return
+    wall = time.perf_counter() - _run_start
+    print(f"\n{'='*60}")
+    print(f"  TIMING — {wall:,.1f}s wall")
+    print(f"  {'stage':<16}{'count':>7}{'total s':>10}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}")
+    print(f"  {'─'*58}")
+    for stage, st in sorted(summary.items(), key=lambda kv: -kv[1]["total"]):
+        print(f"  {stage:<16}{st['count']:>7}{st['total']:>10.1f}"
+              f"{st['p50']*1000:>9.0f}{st['p90']*1000:>9.0f}{st['p99']*1000:>9.0f}")
+    print(f"{'='*60}\n")
+
+
+def write_trace(path):
+    """Write the run's timing as JSON — loadable in chrome://tracing / Perfetto."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": _trace_events, "summary": timing_summary()}, f)
+    print(f"  [✓] Timing trace: {path}")
 
 # ============================================================
 # SKIP LISTS — big corps, directories, media, platforms
@@ -151,6 +291,108 @@ SKIP_DOMAINS = {
     "greenwichtime.com", "petfoodindustry.com",
 }
 
+# ── Public suffixes — the part of a hostname the registry owns ──
+# Built-in rules cover the multi-label suffixes of the markets we search.
+# Drop Mozilla's public_suffix_list.dat (https://publicsuffix.org/list/)
+# next to this script to use the full list instead — same syntax,
+# including "*.x" wildcards and "!y.x" exceptions. Any other TLD counts
+# as a one-label suffix.
+PUBLIC_SUFFIX_FILE = "public_suffix_list.dat"
+
+BUILTIN_PUBLIC_SUFFIXES = """
+co.uk org.uk me.uk ltd.uk plc.uk net.uk ac.uk gov.uk nhs.uk sch.uk police.uk
+com.au net.au org.au edu.au gov.au asn.au id.au
+co.nz net.nz org.nz ac.nz govt.nz school.nz geek.nz gen.nz kiwi.nz maori.nz
+co.in net.in org.in firm.in gen.in ind.in ac.in edu.in gov.in res.in
+co.za org.za net.za gov.za ac.za web.za
+co.jp or.jp ne.jp ac.jp go.jp ad.jp ed.jp gr.jp lg.jp
+co.kr or.kr ne.kr re.kr pe.kr go.kr ac.kr
+com.sg net.sg org.sg edu.sg gov.sg per.sg
+com.hk net.hk org.hk edu.hk gov.hk idv.hk
+co.il org.il net.il ac.il gov.il muni.il
+com.mx org.mx net.mx gob.mx edu.mx
+com.br net.br org.br gov.br edu.br
+ab.ca bc.ca mb.ca nb.ca nf.ca nl.ca ns.ca nt.ca nu.ca on.ca pe.ca qc.ca sk.ca yk.ca gc.ca
+ak.us al.us ar.us az.us ca.us co.us ct.us dc.us de.us fl.us ga.us hi.us ia.us id.us il.us
+in.us ks.us ky.us la.us ma.us md.us me.us mi.us mn.us mo.us ms.us mt.us nc.us nd.us ne.us
+nh.us nj.us nm.us nv.us ny.us oh.us ok.us or.us pa.us ri.us sc.us sd.us tn.us tx.us ut.us
+va.us vt.us wa.us wi.us wv.us wy.us
+"""
+
+# Suffix labels that mean government, education, military or nonprofit
+NONBUSINESS_SUFFIX_LABELS = {"gov", "govt", "gob", "edu", "ac", "sch", "school",
+                             "mil", "nhs", "police", "org"}
+# "or"/"go" only mean that under some TLDs — smithdental.or.us is an Oregon business
+NONBUSINESS_SUFFIXES = {
+    "or.jp", "go.jp", "or.kr", "go.kr", "or.id", "go.id", "or.th", "go.th",
+    "or.ke", "go.ke", "or.tz", "go.tz", "or.ug", "go.ug", "or.cr", "go.cr", "or.at",
+}
+
+
+def build_suffix_trie(rules):
+    """
+    Domains/rules → trie of reversed labels ("co.uk" → {"uk": {"co": {"$": True}}}).
+    "$" marks a rule, "!" an exception rule.
+    """
+    trie = {}
+    for rule in rules:
+        rule = rule.strip().lower()
+        if not rule or rule.startswith("//"):
+            continue
+        node = trie
+        for label in reversed(rule.lstrip("!").split(".")):
+            node = node.setdefault(label, {})
+        node["!" if rule.startswith("!") else "$"] = True
+    return trie
+
+
+def load_public_suffixes():
+    path = os.path.join(SCRIPT_DIR, PUBLIC_SUFFIX_FILE)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return build_suffix_trie(line.split()[0] for line in f if line.strip())
+    return build_suffix_trie(BUILTIN_PUBLIC_SUFFIXES.split())
+
+
+PUBLIC_SUFFIX_TRIE = load_public_suffixes()
+SKIP_TRIE = build_suffix_trie(SKIP_DOMAINS)
+
+
+def public_suffix_length(labels):
+    """How many trailing labels of `labels` are the public suffix (at least 1)."""
+    node = PUBLIC_SUFFIX_TRIE
+    length = 1  # implicit "*" rule: any TLD
+    for depth, label in enumerate(reversed(labels), 1):
+        child = node.get(label)
+        if child is not None and "!" in child:
+            return depth - 1
+        wildcard = node.get("*")
+        if wildcard is not None and "$" in wildcard:
+            length = depth
+        if child is None:
+            break
+        if "$" in child:
+            length = depth
+        node = child
+    return min(length, len(labels))
+
+
+def is_skip_domain(host):
+    """True if `host` is a SKIP_DOMAINS entry or any subdomain of one."""
+    return in_trie(SKIP_TRIE, host)
+
+
+def in_trie(trie, host):
+    """True if `host` or any parent domain of it is a rule in `trie`."""
+    node = trie
+    for label in reversed(host.split(".")):
+        node = node.get(label)
+        if node is None:
+            return False
+        if "$" in node:
+            return True
+    return False
+
 # ── JUNK TITLE PATTERNS ─────────────────────────────────────
 # If the page title matches ANY of these, it's not a business homepage
 
@@ -175,36 +417,22 @@ JUNK_TITLE_PATTERNS = [
 ]
 JUNK_TITLE_RE = re.compile("|".join(JUNK_TITLE_PATTERNS), re.I)
 
-# ── ENTERPRISE SIGNALS (links/text in the page) ─────────────
-# If a site has 3+ of these, it's too big to be your client
-
-ENTERPRISE_KEYWORDS = [
-    "investor relations", "investors", "annual report",
-    "press releases", "newsroom", "media center",
-    "careers", "join our team", "open positions", "we're hiring",
-    "global offices", "our locations", "worldwide",
-    "nasdaq", "nyse", "stock price", "sec filing",
-    "fortune 500", "fortune 100",
-    "enterprise solutions", "enterprise platform",
-]
-
-# ── NONPROFIT / NGO SIGNALS (skip if 2+ found) ──────────────
-NONPROFIT_KEYWORDS = [
-    "501(c)", "501c3", "nonprofit", "non-profit", "tax-exempt",
-    "tax exempt", "charitable organization", "donate now",
-    "make a donation", "support our mission", "our mission",
-    "volunteer opportunities", "volunteer with us",
-    "fundraising", "grant funding", "annual fund",
-    "board of directors", "board members",
-    "community outreach", "public benefit",
-]
-
 # ============================================================
 # SQLITE HISTORY DB
 # ============================================================
 
+# Raw signal bitsets + numerics in audit_features (see --rescore)
+AUDIT_FEATURE_COLUMNS = [
+    "gap_bits", "present_bits", "revenue_bits", "smb_bits", "homepage_bits",
+    "enterprise_hits", "has_phone", "cms", "page_size_kb", "load_time",
+]
+
+
 def init_db():
-    conn = sqlite3.connect(DB_PATH)
+    # Several shards may share the DB: WAL lets readers and one writer
+    # overlap, and the timeout waits out the other writers' locks
+    conn = sqlite3.connect(DB_PATH, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
     c = conn.cursor()
     c.execute("""
         CREATE TABLE IF NOT EXISTS seen_domains (
@@ -223,6 +451,73 @@ def init_db():
             PRIMARY KEY (query, run_date)
         )
     """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS search_cache (
+            query TEXT NOT NULL,
+            page_offset INTEGER NOT NULL,
+            fetched_date TEXT NOT NULL,
+            results TEXT NOT NULL,
+            PRIMARY KEY (query, page_offset)
+        )
+    """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS query_yield (
+            query TEXT PRIMARY KEY,
+            runs INTEGER NOT NULL DEFAULT 0,
+            results INTEGER NOT NULL DEFAULT 0,
+            new_domains INTEGER NOT NULL DEFAULT 0,
+            leads INTEGER NOT NULL DEFAULT 0,
+            api_calls INTEGER NOT NULL DEFAULT 0,
+            dry_runs INTEGER NOT NULL DEFAULT 0,
+            last_run TEXT NOT NULL
+        )
+    """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS domain_validators (
+            domain TEXT PRIMARY KEY,
+            etag TEXT DEFAULT '',
+            last_modified TEXT DEFAULT '',
+            content_hash TEXT DEFAULT '',
+            checked_date TEXT NOT NULL
+        )
+    """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS audit_features (
+            domain TEXT PRIMARY KEY,
+            audit_date TEXT NOT NULL,
+            exact INTEGER NOT NULL DEFAULT 1,
+            gap_weight INTEGER NOT NULL,
+            smb_signals INTEGER NOT NULL,
+            n_revenue_signals INTEGER NOT NULL,
+            contact_score INTEGER NOT NULL,
+            total_score INTEGER NOT NULL,
+            tier TEXT NOT NULL,
+            gap_bits INTEGER,
+            present_bits INTEGER,
+            revenue_bits INTEGER,
+            smb_bits INTEGER,
+            homepage_bits INTEGER,
+            enterprise_hits INTEGER,
+            has_phone INTEGER,
+            cms TEXT,
+            page_size_kb REAL,
+            load_time REAL
+        )
+    """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS frontier (
+            domain TEXT PRIMARY KEY,
+            info TEXT NOT NULL,
+            added TEXT NOT NULL,
+            lease_owner TEXT DEFAULT '',
+            lease_until REAL DEFAULT 0,
+            done INTEGER NOT NULL DEFAULT 0,
+            outcome TEXT DEFAULT '',
+            priority REAL NOT NULL DEFAULT 0
+        )
+    """)
+    c.execute("CREATE INDEX IF NOT EXISTS frontier_open ON frontier (done, lease_until)")
+    c.execute("CREATE INDEX IF NOT EXISTS frontier_priority ON frontier (done, priority DESC)")
     c.execute("""
         CREATE TABLE IF NOT EXISTS run_stats (
             run_date TEXT PRIMARY KEY,
@@ -243,19 +538,129 @@ def load_seen_domains(conn):
 
 
 def mark_domain_seen(conn, domain, was_lead, niche="", score=0):
+    with timed("db"):
+        c = conn.cursor()
+        c.execute("""
+            INSERT INTO seen_domains (domain, first_seen, last_seen, was_lead, niche, score)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(domain) DO UPDATE SET last_seen=?, was_lead=MAX(was_lead, ?),
+            score=CASE WHEN excluded.score > 0 THEN excluded.score ELSE score END
+        """, (domain, TODAY, TODAY, int(was_lead), niche, score, TODAY, int(was_lead)))
+        conn.commit()
+
+
+def save_validators(conn, domain, validators):
+    """Remember ETag / Last-Modified / body hash so a re-audit can skip unchanged sites."""
+    with timed("db"):
+        conn.execute("""
+            INSERT INTO domain_validators (domain, etag, last_modified, content_hash, checked_date)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(domain) DO UPDATE SET etag=excluded.etag, last_modified=excluded.last_modified,
+                content_hash=excluded.content_hash, checked_date=excluded.checked_date
+        """, (domain, validators["etag"], validators["last_modified"],
+              validators["content_hash"], TODAY))
+        conn.commit()
+
+
+def touch_validators(conn, domain):
+    """Site unchanged since last check — just bump the check date."""
+    with timed("db"):
+        conn.execute("UPDATE domain_validators SET checked_date = ? WHERE domain = ?", (TODAY, domain))
+        conn.commit()
+
+
+def get_reaudit_candidates(conn, older_than_days):
+    """Non-lead domains not checked for `older_than_days`: [(domain, niche, etag, last_modified, content_hash)]."""
+    cutoff = (date.today() - timedelta(days=older_than_days)).isoformat()
     c = conn.cursor()
     c.execute("""
-        INSERT INTO seen_domains (domain, first_seen, last_seen, was_lead, niche, score)
-        VALUES (?, ?, ?, ?, ?, ?)
-        ON CONFLICT(domain) DO UPDATE SET last_seen=?, was_lead=MAX(was_lead, ?)
-    """, (domain, TODAY, TODAY, int(was_lead), niche, score, TODAY, int(was_lead)))
-    conn.commit()
+        SELECT s.domain, s.niche, v.etag, v.last_modified, v.content_hash
+        FROM seen_domains s
+        LEFT JOIN domain_validators v ON v.domain = s.domain
+        WHERE s.was_lead = 0
+          AND COALESCE(v.checked_date, s.last_seen) <= ?
+        ORDER BY COALESCE(v.checked_date, s.last_seen) ASC
+    """, (cutoff,))
+    return c.fetchall()
+
+
+def save_audit_features(conn, domain, features, total_score, tier):
+    """Keep the raw signals and scoring inputs so rule changes can be re-scored offline (--rescore)."""
+    columns = ["exact", "gap_weight", "smb_signals", "n_revenue_signals", "contact_score"]
+    columns += AUDIT_FEATURE_COLUMNS
+    with timed("db"):
+        conn.execute(f"""
+            INSERT OR REPLACE INTO audit_features
+            (domain, audit_date, {", ".join(columns)}, total_score, tier)
+            VALUES (?, ?, {", ".join("?" * len(columns))}, ?, ?)
+        """, (domain, TODAY, *(features[col] for col in columns), total_score, tier))
+        conn.commit()
 
 
 def log_query(conn, query):
+    with timed("db"):
+        c = conn.cursor()
+        c.execute("INSERT OR IGNORE INTO query_log (query, run_date) VALUES (?, ?)", (query, TODAY))
+        conn.commit()
+
+
+def record_query_yield(conn, query, results, new_domains, api_calls_used):
+    """One search run of `query`. dry_runs counts consecutive runs with no new domains."""
+    with timed("db"):
+        conn.execute("""
+            INSERT INTO query_yield (query, runs, results, new_domains, api_calls, dry_runs, last_run)
+            VALUES (?, 1, ?, ?, ?, ?, ?)
+            ON CONFLICT(query) DO UPDATE SET
+                runs = runs + 1,
+                results = results + excluded.results,
+                new_domains = new_domains + excluded.new_domains,
+                api_calls = api_calls + excluded.api_calls,
+                dry_runs = CASE WHEN excluded.new_domains > 0 THEN 0 ELSE dry_runs + 1 END,
+                last_run = excluded.last_run
+        """, (query, results, new_domains, api_calls_used, int(new_domains == 0), TODAY))
+        conn.commit()
+
+
+def credit_query_lead(conn, query):
+    """A domain found by `query` turned into a lead."""
+    with timed("db"):
+        conn.execute("UPDATE query_yield SET leads = leads + 1 WHERE query = ?", (query,))
+        conn.commit()
+
+
+def get_query_yield(conn):
+    """{query: (runs, new_domains, leads, api_calls, dry_runs, last_run)}"""
     c = conn.cursor()
-    c.execute("INSERT OR IGNORE INTO query_log (query, run_date) VALUES (?, ?)", (query, TODAY))
-    conn.commit()
+    c.execute("SELECT query, runs, new_domains, leads, api_calls, dry_runs, last_run FROM query_yield")
+    return {row[0]: row[1:] for row in c.fetchall()}
+
+
+def get_cached_search(conn, query, offset):
+    """Cached result list for (query, offset) if fetched within SEARCH_CACHE_DAYS, else None."""
+    cutoff = (date.today() - timedelta(days=SEARCH_CACHE_DAYS)).isoformat()
+    with timed("db"):
+        c = conn.cursor()
+        c.execute("SELECT results FROM search_cache WHERE query = ? AND page_offset = ? AND fetched_date > ?",
+                  (query, offset, cutoff))
+        row = c.fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def cache_search(conn, query, offset, results):
+    with timed("db"):
+        conn.execute("""
+            INSERT OR REPLACE INTO search_cache (query, page_offset, fetched_date, results)
+            VALUES (?, ?, ?, ?)
+        """, (query, offset, TODAY, json.dumps(results)))
+        conn.commit()
+
+
+def purge_search_cache(conn):
+    """Drop cached result pages older than SEARCH_CACHE_DAYS."""
+    cutoff = (date.today() - timedelta(days=SEARCH_CACHE_DAYS)).isoformat()
+    with timed("db"):
+        conn.execute("DELETE FROM search_cache WHERE fetched_date <= ?", (cutoff,))
+        conn.commit()
 
 
 def get_used_queries_today(conn):
@@ -308,7 +713,7 @@ CSV_FIELDS = [
     "Email", "Email_Verified", "Phone", "Contact_Page",
     "Total_Score", "Automation_Score", "Biz_Fit_Score", "Budget_Score", "Contact_Score",
     "Automation_Gaps", "Revenue_Signals", "CMS",
-    "Page_Load_Time", "Page_Size_KB",
+    "Page_Load_Time", "Page_Size_KB", "Gap_Codes", "Address",
 ]
 
 
@@ -346,7 +751,8 @@ def push_lead_to_sheets(row):
         return False
     try:
         values = [str(row.get(f, "")) for f in CSV_FIELDS]
-        _sheets_ws.append_row(values, value_input_option="USER_ENTERED")
+        with timed("sheets"):
+            _sheets_ws.append_row(values, value_input_option="USER_ENTERED")
         return True
     except Exception as e:
         print(f"  [!] Sheets push failed: {e}")
@@ -417,21 +823,108 @@ def build_queries():
     return queries
 
 
+def schedule_queries(queries, query_yield):
+    """
+    Order (query, label) pairs best-first by past yield (UCB1): each query's
+    fresh domains + QUERY_LEAD_WEIGHT x leads per API call, plus an
+    exploration bonus that shrinks the more often it has run. A never-run
+    query is scored as an average query run once, so proven winners go
+    first and untested ones beat proven duds. Exhausted queries
+    (QUERY_RETIRE_AFTER dry runs in a row) sit out for QUERY_RETIRE_DAYS.
+    Returns (ordered, n_retired).
+    """
+    retry_before = (date.today() - timedelta(days=QUERY_RETIRE_DAYS)).isoformat()
+    tried = [row for row in query_yield.values() if row[3]]
+    total_calls = sum(row[3] for row in tried) + 1
+
+    def mean_yield(row):
+        runs, new_domains, leads, calls = row[:4]
+        return (new_domains + QUERY_LEAD_WEIGHT * leads) / (calls * BRAVE_COUNT)
+
+    prior = sum(mean_yield(row) for row in tried) / len(tried) if tried else 0.0
+    ranked = []
+    n_retired = 0
+    for query, label in queries:
+        row = query_yield.get(query)
+        if row is None or row[3] == 0:
+            mean, calls = prior, 1
+        else:
+            dry_runs, last_run = row[4:]
+            if dry_runs >= QUERY_RETIRE_AFTER and last_run > retry_before:
+                n_retired += 1
+                continue
+            mean, calls = mean_yield(row), row[3]
+        bonus = QUERY_EXPLORATION * math.sqrt(2 * math.log(total_calls) / calls)
+        ranked.append((mean + bonus, random.random(), query, label))
+    ranked.sort(reverse=True)
+    return [(query, label) for _, _, query, label in ranked], n_retired
+
+
+def print_query_report(limit=15):
+    """Best and worst queries by cost per lead (--queries)."""
+    conn = init_db()
+    rows = conn.execute("""
+        SELECT query, runs, new_domains, leads, api_calls, dry_runs
+        FROM query_yield ORDER BY leads * 1.0 / MAX(api_calls, 1) DESC, new_domains DESC
+    """).fetchall()
+    conn.close()
+    if not rows:
+        print("  [!] No query history yet — run ai_leads.py first")
+        return
+
+    def line(row):
+        query, runs, new_domains, leads, calls, dry_runs = row
+        cost = calls / 1000 * BRAVE_COST_PER_1K
+        per_lead = f"${cost / leads:.3f}" if leads else "—"
+        retired = " (retired)" if dry_runs >= QUERY_RETIRE_AFTER else ""
+        return f"  {query[:34]:<34} {runs:>4} {new_domains:>6} {leads:>5} {per_lead:>8}{retired}"
+
+    calls = sum(r[4] for r in rows)
+    leads = sum(r[3] for r in rows)
+    header = f"  {'query':<34} {'runs':>4} {'fresh':>6} {'leads':>5} {'$/lead':>8}"
+    print(f"\n{'='*60}")
+    print(f"  QUERY YIELD — {len(rows):,} queries | {calls:,} API calls | {leads:,} leads")
+    if leads:
+        print(f"  Cost per lead: ${calls / 1000 * BRAVE_COST_PER_1K / leads:.3f}")
+    print(f"  {'─'*40}\n  Best:\n{header}")
+    for row in rows[:limit]:
+        print(line(row))
+    print(f"  {'─'*40}\n  Worst:\n{header}")
+    for row in rows[limit:][-limit:][::-1]:
+        print(line(row))
+    print(f"{'='*60}\n")
+
+
 # ============================================================
 # BRAVE SEARCH
 # ============================================================
 
-def brave_search(query):
-    global api_calls
+def brave_search(query, offset=0, conn=None):
+    """
+    One page of Brave results for `query` (offset = page number, 0-9).
+    With `conn`, pages fetched in the last SEARCH_CACHE_DAYS come from the
+    search_cache table and cost no API call; fresh pages are cached.
+    Returns None when the request fails, so callers can tell an outage from
+    a query that genuinely found nothing.
+    """
+    global api_calls, search_cache_hits
+    if conn is not None:
+        cached = get_cached_search(conn, query, offset)
+        if cached is not None:
+            search_cache_hits += 1
+            return cached
+
     url = "https://api.search.brave.com/res/v1/web/search"
     api_headers = {
         "Accept": "application/json",
         "Accept-Encoding": "gzip",
         "X-Subscription-Token": BRAVE_API_KEY,
     }
-    params = {"q": query, "count": BRAVE_COUNT, "country": "us"}
+    params = {"q": query, "count": BRAVE_COUNT, "offset": offset, "country": "us"}
+    import requests
     try:
-        resp = requests.get(url, headers=api_headers, params=params, timeout=REQUEST_TIMEOUT)
+        with timed("search"):
+            resp = requests.get(url, headers=api_headers, params=params, timeout=REQUEST_TIMEOUT)
         api_calls += 1
         resp.raise_for_status()
         data = resp.json()
@@ -442,39 +935,55 @@ def brave_search(query):
                 "title": item.get("title", ""),
                 "description": item.get("description", ""),
             })
-        time.sleep(BRAVE_SEARCH_DELAY)
+        if conn is not None:
+            cache_search(conn, query, offset, results)
+        throttle(BRAVE_SEARCH_DELAY)
         return results
     except Exception as e:
         print(f"  [!] '{query}': {e}")
-        return []
+        return None
+
+
+_root_domain_cache = {}
+
+
+def url_host(url):
+    """Lowercased hostname of `url` (scheme optional) — a cheap stand-in for urlparse().hostname."""
+    scheme_end = url.find("://")
+    host = url[scheme_end + 3:] if scheme_end != -1 else url
+    for sep in "/?#":
+        cut = host.find(sep)
+        if cut != -1:
+            host = host[:cut]
+    host = host.rpartition("@")[2]
+    if host.startswith("["):
+        return host.lower()  # IPv6 literal
+    return host.partition(":")[0].lower().strip(".")
 
 
 def extract_root_domain(url):
-    try:
-        parsed = urlparse(url if "://" in url else f"https://{url}")
-        host = (parsed.hostname or "").lower().strip(".")
-        if host.startswith("www."):
-            host = host[4:]
-        parts = host.split(".")
-        if len(parts) < 2:
-            return None
-        double_tlds = {"co.uk", "com.au", "co.in", "co.nz", "com.br", "co.za",
-                       "co.jp", "co.kr", "com.sg", "com.hk", "co.il", "com.mx"}
-        suffix = ".".join(parts[-2:])
-        root = ".".join(parts[-3:]) if suffix in double_tlds and len(parts) >= 3 else ".".join(parts[-2:])
-        if host != root and host != f"www.{root}":
-            return None
-        if root.endswith((".gov", ".edu", ".mil", ".org")):
-            return None  # skip govt, edu, military, and nonprofits/NGOs
-        return root
-    except Exception:
-        return None
+    """Registrable domain of `url` if it IS the site root (or www.), else None."""
+    host = url_host(url)
+    if host in _root_domain_cache:
+        return _root_domain_cache[host]
+    root = host[4:] if host.startswith("www.") else host
+    labels = root.split(".")
+    if len(labels) != public_suffix_length(labels) + 1:
+        root = None  # a bare suffix, or a subdomain rather than the site root
+    elif not NONBUSINESS_SUFFIX_LABELS.isdisjoint(labels[1:]) or ".".join(labels[1:]) in NONBUSINESS_SUFFIXES:
+        root = None  # skip govt, edu, military, and nonprofits/NGOs (labels[1:] is the public suffix)
+    _root_domain_cache[host] = root
+    return root
 
 
 def collect_unique_domains(conn, seen_ever):
-    """Search and collect fresh SMB domains only."""
+    """
+    Search and collect fresh SMB domains only. Each query's new candidates
+    go into the frontier (and its API calls into run_stats) as soon as it
+    finishes, so a crash mid-search loses nothing that was paid for.
+    """
     domain_map = {}
-    all_queries = build_queries()
+    all_queries = [(q, l) for q, l in build_queries() if in_shard(q)]
     used_today = get_used_queries_today(conn)
 
     fresh_queries = [(q, l) for q, l in all_queries if q not in used_today]
@@ -482,13 +991,19 @@ def collect_unique_domains(conn, seen_ever):
         print("  [!] All queries used today. Resetting rotation.")
         fresh_queries = all_queries
 
-    random.shuffle(fresh_queries)
+    purge_search_cache(conn)
+    query_yield = get_query_yield(conn)
+    lead_rates = get_lead_rates(conn)
+    fresh_queries, n_retired = schedule_queries(fresh_queries, query_yield)
     candidate_target = DAILY_LEAD_TARGET * 4  # need more candidates since we filter harder
     total_available = len(fresh_queries)
+    n_untried = sum(1 for q, _ in fresh_queries if q not in query_yield)
 
     print(f"\n{'='*60}")
     print(f"  SEARCH PHASE")
-    print(f"  Fresh queries: {total_available}")
+    print(f"  Fresh queries: {total_available} ({n_untried} never run, {n_retired} retired)")
+    if SHARD[1] > 1:
+        print(f"  Shard:         {SHARD[0] + 1}/{SHARD[1]} of the query space")
     print(f"  History DB:    {len(seen_ever):,} domains")
     print(f"  Target:        {candidate_target} candidates")
     print(f"{'='*60}\n")
@@ -502,297 +1017,561 @@ def collect_unique_domains(conn, seen_ever):
         if idx % 50 == 0 or idx == 1:
             print(f"  --- {idx}/{total_available} queries | {len(domain_map)} fresh domains ---")
 
-        results = brave_search(query)
-        log_query(conn, query)
-        queries_used += 1
+        calls_before = api_calls
+        found_before = len(domain_map)
+        n_results = 0
+        failed = False
+        # Keep paging while pages come back full and still mostly unseen
+        for offset in range(BRAVE_MAX_OFFSET + 1):
+            results = brave_search(query, offset=offset, conn=conn)
+            if results is None:
+                failed = True
+                break
+            n_results += len(results)
+            page_new = collect_page(results, label, query, domain_map, seen_ever)
+            if (len(results) < BRAVE_COUNT or page_new < SEARCH_PAGE_MIN_NEW
+                    or len(domain_map) >= candidate_target):
+                break
+        # A failed search says nothing about the query — keep it in today's
+        # rotation and out of query_yield so an outage can't retire it
+        if not failed:
+            log_query(conn, query)
+            queries_used += 1
+
+        # Checkpoint: today's spend and this query's candidates survive a crash
+        calls = api_calls - calls_before
+        if not failed:
+            record_query_yield(conn, query, n_results, len(domain_map) - found_before, calls)
+        new = dict(itertools.islice(domain_map.items(), found_before, None))
+        for info in new.values():
+            info["prescore"] = prescore(info, lead_rates)
+        frontier_enqueue(conn, new)
+        if calls:
+            with timed("db"):
+                update_run_stats(conn, 0, 0, calls, calls / 1000 * BRAVE_COST_PER_1K)
+
+    print(f"\n[✓] Search done: {len(domain_map)} candidates from {queries_used} queries "
+          f"({api_calls:,} API calls, {search_cache_hits:,} pages from cache)")
+    if domain_map:
+        scores = sorted((info["prescore"] for info in domain_map.values()), reverse=True)
+        print(f"  [i] Pre-score: best {scores[0]} | median {scores[len(scores) // 2]} | "
+              f"{sum(1 for x in scores if x < 0)} below zero (chains, multi-location, online booking) go last")
+    return domain_map
 
-        for r in results:
-            root = extract_root_domain(r["url"])
-            if not root or root in SKIP_DOMAINS or root in seen_ever or root in domain_map:
-                continue
 
-            # Pre-filter: check search result title for junk patterns
-            if JUNK_TITLE_RE.search(r.get("title", "")):
-                continue
+def collect_page(results, label, query, domain_map, seen_ever):
+    """Add one result page's fresh SMB domains to domain_map; returns how many were new."""
+    added = 0
+    for r in results:
+        root = extract_root_domain(r["url"])
+        if not root or root in seen_ever or root in domain_map or is_skip_domain(root):
+            continue
 
-            domain_map[root] = {
-                "title": r["title"],
-                "niche": label,
-                "snippet": r.get("description", ""),
-            }
+        # Pre-filter: check search result title for junk patterns
+        if JUNK_TITLE_RE.search(r.get("title", "")):
+            continue
 
-    print(f"\n[✓] Search done: {len(domain_map)} candidates from {queries_used} queries")
-    return domain_map
+        domain_map[root] = {
+            "title": r["title"],
+            "niche": label,
+            "snippet": r.get("description", ""),
+            "query": query,
+        }
+        added += 1
+    return added
+
+
+def get_lead_rates(conn):
+    """
+    Past lead rate per niche (from seen_domains) and per query (from
+    query_yield), each shrunk towards the level above it by PRESCORE_PRIOR
+    pseudo-candidates so a query with 3 domains and 1 lead isn't a 33% bet.
+    Returns (overall, {niche: rate}, {query: rate}).
+    """
+    c = conn.cursor()
+    c.execute("SELECT niche, COUNT(*), SUM(was_lead) FROM seen_domains GROUP BY niche")
+    by_niche = {niche: (n, leads or 0) for niche, n, leads in c.fetchall()}
+    n_all = sum(n for n, _ in by_niche.values())
+    overall = sum(leads for _, leads in by_niche.values()) / n_all if n_all else 0.0
+    niche_rates = {niche: (leads + PRESCORE_PRIOR * overall) / (n + PRESCORE_PRIOR)
+                   for niche, (n, leads) in by_niche.items()}
+    query_rates = {}
+    for query, (_, new_domains, leads, _, _, _) in get_query_yield(conn).items():
+        prior = niche_rates.get(niche_label(query), overall)
+        query_rates[query] = (leads + PRESCORE_PRIOR * prior) / (new_domains + PRESCORE_PRIOR)
+    return overall, niche_rates, query_rates
+
+
+def prescore(info, lead_rates):
+    """
+    Cheap guess at how promising a candidate is, before its site is fetched:
+    SNIPPET_RULES weights over the search title + snippet, plus its query's
+    (else niche's) past lead rate. Only orders the audit queue.
+    """
+    text = f"{info.get('title', '')} {info.get('snippet', '')}"
+    # Brave marks matched terms with <strong> and entity-encodes the rest
+    text = " ".join(html_lib.unescape(TAG_RE.sub("", text)).lower().split())
+    hits = match_rules(text, SNIPPET_RULES)
+    score = sum(rule["weight"] for rule in SNIPPET_RULES if hits[rule["name"]])
+    overall, niche_rates, query_rates = lead_rates
+    rate = query_rates.get(info.get("query"), niche_rates.get(info.get("niche"), overall))
+    return round(score + PRESCORE_HISTORY_WEIGHT * rate, 2)
 
 
 # ============================================================
-# AI AUTOMATION NEED AUDIT
+# PRE-FLIGHT — DNS + TCP check of the whole batch before any GET
 # ============================================================
+# A dead domain used to cost two full REQUEST_TIMEOUTs (https, then http).
+# The pre-flight resolves and connects to every candidate at once with a
+# short timeout; fetch_homepage() then skips dead/parked hosts outright and
+# goes straight to http:// when 443 was closed.
+
+# Domain-parking / for-sale services, matched against the CNAME chain and NS hosts
+PARKED_HOSTS = {
+    "sedoparking.com", "parkingcrew.net", "bodis.com", "above.com", "parklogic.com",
+    "dan.com", "afternic.com", "hugedomains.com", "undeveloped.com", "uniregistrymarket.link",
+    "domainmarket.com", "parked.com", "voodoo.com", "namebrightdns.com", "ztomy.com",
+}
+PARKED_TRIE = build_suffix_trie(PARKED_HOSTS)
+PREFLIGHT_UNREACHABLE = ("dead", "parked")
 
-# ── Tools/platforms that indicate automation is ALREADY in place ──
-BOOKING_SIGNALS = [
-    "calendly", "acuity", "acuityscheduling", "zocdoc", "localized",
-    "localmed", "nexhealth", "solutionreach", "dentrix ascend",
-    "opencare", "carestack", "patientpop", "schedule online",
-    "book online", "book now", "book appointment", "online booking",
-    "online scheduling", "request appointment", "schedule appointment",
-    "flexbook", "jane.app", "simplepractice",
-]
+_preflight_cache = {}  # domain -> "https" | "http" | "dead" | "parked"
 
-CHATBOT_SIGNALS = [
-    "drift", "intercom", "tidio", "livechat", "tawk.to", "tawk",
-    "zendesk", "freshchat", "crisp.chat", "hubspot-messages",
-    "chatwidget", "live-chat", "chat-widget", "dialogflow",
-    "landbot", "manychat", "chatfuel", "botpress",
-    "kommunicate", "olark", "purechat",
-]
 
-REVIEW_SYSTEM_SIGNALS = [
-    "birdeye", "podium", "weave", "reviewtrackers", "reputation.com",
-    "grade.us", "trustpilot", "broadly", "getjerry", "demandforce",
-    "swell", "nicejob", "reviewwave",
-]
+def preflight_host(domain):
+    """
+    Resolve `domain` and open a TCP connection to 443, then 80, trying each
+    resolved address with PREFLIGHT_TIMEOUT. Returns the scheme of the first
+    port that accepted, "parked" (CNAME or name servers belong to a parking
+    service) or "dead".
+    """
+    with timed("preflight"):
+        try:
+            infos = socket.getaddrinfo(domain, 443, type=socket.SOCK_STREAM, flags=socket.AI_CANONNAME)
+        except (OSError, UnicodeError):
+            return "dead"
+        canonical = (infos[0][3] or "").lower().rstrip(".")
+        if canonical and in_trie(PARKED_TRIE, canonical):
+            return "parked"
+        if any(in_trie(PARKED_TRIE, ns) for ns in _name_servers(domain)):
+            return "parked"
+        # Dual-stack hosts often list an unreachable IPv6 address first
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        for port, scheme in ((443, "https"), (80, "http")):
+            for address in addresses:
+                try:
+                    socket.create_connection((address, port), timeout=PREFLIGHT_TIMEOUT).close()
+                    return scheme
+                except OSError:
+                    continue
+        return "dead"
+
+
+def _name_servers(domain):
+    """NS host names for `domain` ([] without dnspython or on any DNS error)."""
+    try:
+        import dns.resolver
+        answers = dns.resolver.resolve(domain, "NS", lifetime=PREFLIGHT_TIMEOUT)
+        return [str(r.target).lower().rstrip(".") for r in answers]
+    except Exception:
+        return []
 
-PATIENT_PORTAL_SIGNALS = [
-    "patient portal", "patient login", "myportal", "patient access",
-    "secure portal", "online portal", "my account",
-    "patient forms", "digital forms", "online forms",
-    "paperless", "e-forms",
-]
 
-SMS_SIGNALS = [
-    "text us", "sms", "text message", "send a text",
-    "text to schedule", "text reminders", "weave",
-    "solutionreach", "revenuewell", "lighthouse 360",
-    "patient communicator",
-]
+def preflight(domains, verbose=True):
+    """
+    Pre-flight every domain concurrently; returns {domain: verdict} and caches
+    it for fetch_homepage(). Skipped (returns {}) when an HTTP proxy is set —
+    the proxy does its own DNS, so a local lookup proves nothing.
+    """
+    from urllib.request import getproxies
+    if getproxies():
+        if verbose:
+            print("  [i] HTTP proxy set — pre-flight skipped")
+        return {}
+    todo = [d for d in domains if d not in _preflight_cache]
+    if todo:
+        from concurrent.futures import ThreadPoolExecutor
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=PREFLIGHT_WORKERS) as pool:
+            _preflight_cache.update(zip(todo, pool.map(preflight_host, todo)))
+        counts = Counter(_preflight_cache[d] for d in todo)
+        if verbose:
+            print(f"  [✓] Pre-flight: {counts['https'] + counts['http']} reachable "
+                  f"({counts['http']} http-only) | {counts['dead']} dead | {counts['parked']} parked "
+                  f"in {time.perf_counter() - start:.1f}s")
+    return {d: _preflight_cache[d] for d in domains}
 
-PRACTICE_MGMT_SIGNALS = [
-    "dentrix", "eaglesoft", "open dental", "curve dental",
-    "carestack", "denticon", "tab32", "planet dds",
-    "practice-web", "maxident", "ace dental",
-]
 
-EMAIL_MARKETING_SIGNALS = [
-    "mailchimp", "constant contact", "sendgrid", "klaviyo",
-    "activecampaign", "drip", "convertkit", "campaign monitor",
-    "mc.js", "mailerlite", "revenuewell",
-]
+# ============================================================
+# AI AUTOMATION NEED AUDIT
+# ============================================================
 
-# Signs they do things manually (= they need automation)
-MANUAL_SIGNALS = [
-    "call to schedule", "call us to", "call our office",
-    "phone to schedule", "give us a call", "call today",
-    "call for appointment", "call now", "call for",
-]
+# Detection rules, gap weights and outreach phrasing live in signal_rules.py.
+# Rule sets per audit stage, in registry order:
+GATE_RULES = rules_in("enterprise", "nonprofit")
+PAGE_RULES = rules_in("cms", "revenue", "automation", "manual", "smb")
+SUBPAGE_RULES = [RULES_BY_NAME[name] for name in ("booking", "chatbot", "portal", "phone_only", "paper_forms")]
+SMB_RULES = rules_in("smb")
+CMS_RULES = rules_in("cms")
+REVENUE_RULES = rules_in("revenue")
+
+PHONE_RE = re.compile(r"\(?\d{3}\)?[\s.\-]?\d{3}[\s.\-]?\d{4}")
+ADDRESS_RE = re.compile(r"\d+\s+[\w\s]+(?:st|street|ave|avenue|blvd|boulevard|dr|drive|rd|road|ln|lane|ct|court|way|pl|place)\b", re.I)
+NON_DIGIT_RE = re.compile(r"\D")
+TAG_RE = re.compile(r"<[^>]+>")
+
+# ── Feature bitsets stored in audit_features (see --rescore) ──
+# Bit i of a column = the i-th name below was detected. APPEND ONLY —
+# reordering or removing a name silently changes every stored row.
+FEATURE_BITS = {
+    "gap_bits": (GAP_NO_BOOKING, GAP_NO_CHATBOT, GAP_NO_REVIEWS, GAP_NO_PORTAL,
+                 GAP_NO_SMS, GAP_PHONE_ONLY, GAP_PAPER_FORMS, GAP_NO_EMAIL_MKTG),
+    "present_bits": ("Online Booking", "Chatbot/Live Chat", "Review Automation", "Patient Portal",
+                     "SMS/Text", "Email Marketing", "Practice Management Software"),
+    "revenue_bits": tuple(rule["name"] for rule in REVENUE_RULES),
+    "smb_bits": ("local phone", "street address", "smb cms", "small site",
+                 "no careers page", "owner/founder mention", "service-oriented"),
+    "homepage_bits": ("booking", "chatbot", "portal", "phone_only", "paper_forms"),
+}
 
-PAPER_FORM_SIGNALS = [
-    "download and print", "print and fill", "print out",
-    "printable form", "paper form", "fill out and bring",
-    "download the form", "print the form", "bring completed",
-]
 
-def fetch(url, timeout=REQUEST_TIMEOUT):
+def to_bits(names, order):
+    """Pack detected names into an int, bit i = order[i]. Unknown names are ignored."""
+    bits = 0
+    for i, name in enumerate(order):
+        if name in names:
+            bits |= 1 << i
+    return bits
+
+
+def from_bits(bits, order):
+    """Inverse of to_bits()."""
+    return [name for i, name in enumerate(order) if bits >> i & 1]
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+
+def fetch(url, timeout=REQUEST_TIMEOUT, stage="fetch.homepage", max_bytes=None, headers=None):
+    """
+    Streamed GET that never holds more than `max_bytes` (default
+    FETCH_MAX_BYTES) of body.
+    Returns (page, load_time). page is None on network errors and for
+    non-HTML responses, else a dict:
+        status, url, text (first max_bytes, decoded), size (full body bytes
+        when Content-Length says so, else bytes read), truncated,
+        validators ({etag, last_modified, content_hash})
+    `headers` are sent on top of HEADERS (e.g. If-None-Match).
+    """
+    import requests
+    max_bytes = max_bytes or FETCH_MAX_BYTES
+    start = time.time()
     try:
-        start = time.time()
-        r = requests.get(url, headers=HEADERS, timeout=timeout, allow_redirects=True)
-        return r, round(time.time() - start, 2)
+        with timed(stage), requests.get(url, headers={**HEADERS, **(headers or {})}, timeout=timeout,
+                                        allow_redirects=True, stream=True) as r:
+            ctype = r.headers.get("Content-Type", "").lower()
+            if ctype and not ctype.startswith(HTML_CONTENT_TYPES):
+                return None, round(time.time() - start, 2)  # PDF, image, feed...
+
+            chunks = []
+            read = 0
+            truncated = False
+            for chunk in r.iter_content(chunk_size=FETCH_CHUNK_BYTES):
+                chunks.append(chunk)
+                read += len(chunk)
+                if read >= max_bytes:
+                    truncated = True
+                    break
+            body = b"".join(chunks)[:max_bytes]
+            del chunks
+
+            try:
+                declared = int(r.headers.get("Content-Length") or 0)
+            except ValueError:
+                declared = 0
+            page = {
+                "status": r.status_code,
+                "url": r.url,
+                "text": body.decode(r.encoding or "utf-8", errors="replace"),
+                "size": max(read, declared),
+                "truncated": truncated,
+                "validators": {
+                    "etag": r.headers.get("ETag", ""),
+                    "last_modified": r.headers.get("Last-Modified", ""),
+                    "content_hash": hashlib.sha1(body).hexdigest(),
+                },
+            }
+        return page, round(time.time() - start, 2)
     except Exception:
         return None, 0
 
 
-def audit_domain(domain):
-    """Audit dental practice for AI automation needs."""
-    resp, load_time = fetch(f"https://{domain}")
-    if resp is None or resp.status_code >= 400:
-        resp, load_time = fetch(f"http://{domain}")
-        if resp is None or resp.status_code >= 400:
-            return None
+def fetch_homepage(domain, headers=None):
+    """
+    GET the homepage over https, falling back to http. Returns (page, load_time).
+    Uses the pre-flight verdict when there is one: (None, 0) for dead/parked
+    hosts, and http:// directly when only port 80 answered.
+    """
+    verdict = _preflight_cache.get(domain)
+    if verdict in PREFLIGHT_UNREACHABLE:
+        return None, 0
+    if verdict == "http":
+        return fetch(f"http://{domain}", headers=headers)
+    page, load_time = fetch(f"https://{domain}", headers=headers)
+    if page is None or page["status"] >= 400:
+        page, load_time = fetch(f"http://{domain}", headers=headers)
+    return page, load_time
+
+
+# ── Per-domain page set ──────────────────────────────────────
+# audit_domain() and extract_contacts() both want /contact and /about. The
+# site dict fetches each path at most once and shares the bodies; paths come
+# from the homepage's own nav links, with fixed guesses only when the
+# homepage has no same-site links to go on (e.g. JS-rendered menus).
+
+SUBPAGE_GUESSES = {
+    "contact": ["/contact", "/contact-us"],
+    "about": ["/about", "/about-us", "/team"],
+}
+SUBPAGE_LINK_WORDS = {
+    "contact": ["contact", "get in touch", "location", "directions"],
+    "about": ["about", "team", "meet", "our-doctor", "our doctor", "staff"],
+}
+MAX_LINKS_PER_KIND = 2
 
-    html = resp.text
-    size_kb = round(len(resp.content) / 1024, 1)
-    is_https = resp.url.startswith("https")
-    soup = BeautifulSoup(html, "html.parser")
-    html_lower = html.lower()
 
-    # ─── Page title ───
-    title_tag = soup.find("title")
-    title = title_tag.get_text(strip=True) if title_tag else ""
+def new_site(domain, base_url=None):
+    """Page set for one domain. base_url = final homepage URL (keeps its scheme/host)."""
+    parsed = urlparse(base_url or f"https://{domain}")
+    return {
+        "domain": domain,
+        "origin": f"{parsed.scheme}://{parsed.netloc}",
+        "pages": {},      # path -> page dict (200 only) or None
+        "links": {},      # kind -> [path, ...] discovered on the homepage
+    }
 
-    # Double-check title for junk patterns (in case search title was different)
-    if JUNK_TITLE_RE.search(title):
-        return None  # not a business homepage
 
-    # ─── Enterprise detection ───
-    enterprise_hits = 0
-    for kw in ENTERPRISE_KEYWORDS:
-        if kw in html_lower:
-            enterprise_hits += 1
-    if enterprise_hits >= 3:
-        return None  # too big, skip
+def discover_subpages(site, soup):
+    """Fill site["links"] with same-site contact/about paths linked from the homepage."""
+    host = urlparse(site["origin"]).hostname or ""
+    bare_host = host[4:] if host.startswith("www.") else host
+    links = {kind: [] for kind in SUBPAGE_LINK_WORDS}
+    for a in soup.find_all("a", href=True):
+        url = urlparse(urljoin(site["origin"] + "/", a["href"].strip()))
+        if url.scheme not in ("http", "https"):
+            continue
+        link_host = url.hostname or ""
+        if link_host != host and link_host != bare_host and link_host != f"www.{bare_host}":
+            continue
+        path = url.path.rstrip("/")
+        if not path:
+            continue
+        label = f"{path.lower()} {a.get_text(' ', strip=True).lower()}"
+        for kind, words in SUBPAGE_LINK_WORDS.items():
+            if len(links[kind]) < MAX_LINKS_PER_KIND and path not in links[kind] \
+                    and any(w in label for w in words):
+                links[kind].append(path)
+                break
+    site["links"] = links
 
-    # ─── Nonprofit / NGO detection ───
-    nonprofit_hits = 0
-    for kw in NONPROFIT_KEYWORDS:
-        if kw in html_lower:
-            nonprofit_hits += 1
-    if nonprofit_hits >= 2:
-        return None  # nonprofit/NGO, not a revenue business
 
-    # ─── CMS ───
-    cms = "Unknown"
-    cms_checks = [
-        ("WordPress", ["wp-content", "wordpress"]),
-        ("Shopify", ["shopify", "cdn.shopify"]),
-        ("Squarespace", ["squarespace"]),
-        ("Wix", ["wix"]),
-        ("Webflow", ["webflow"]),
-        ("Ghost", ["ghost"]),
-        ("Drupal", ["drupal"]),
-        ("Joomla", ["joomla"]),
-        ("Framer", ["framer"]),
-    ]
-    for name, keywords in cms_checks:
-        if any(kw in html_lower for kw in keywords):
-            cms = name
-            break
+def subpage_paths(site, kind):
+    """Paths worth trying for `kind` — discovered links, else the fixed guesses."""
+    return site["links"].get(kind) or SUBPAGE_GUESSES[kind]
 
-    # ─── Revenue / budget signals ───
-    signals = []
-    signal_checks = [
-        ("Google Analytics", ["gtag(", "google-analytics", "googletagmanager"]),
-        ("Facebook Pixel", ["fbq(", "facebook.com/tr"]),
-        ("Hotjar", ["hotjar"]),
-        ("HubSpot", ["hubspot"]),
-        ("Stripe", ["stripe.com", "checkout.stripe"]),
-        ("Google Ads", ["googleads", "adservice", "conversion.js"]),
-        ("Yelp Widget", ["yelp.com/biz"]),
-    ]
-    for name, keywords in signal_checks:
-        if any(kw in html_lower for kw in keywords):
-            signals.append(name)
 
-    # ═══════════════════════════════════════════════════════════
-    # AI AUTOMATION NEED DETECTION
-    # Check what they DON'T have → automation gaps = opportunities
-    # ═══════════════════════════════════════════════════════════
+def site_page(site, path):
+    """GET origin+path at most once per site. Returns the page dict if 200, else None."""
+    if path not in site["pages"]:
+        page, _ = fetch(f"{site['origin']}{path}", timeout=8, stage="fetch.subpage")
+        site["pages"][path] = page if page and page["status"] == 200 else None
+        throttle(SUBPAGE_DELAY)
+    return site["pages"][path]
 
-    automation_gaps = []    # (gap_description, weight)
-    automation_present = [] # what they already have
 
-    # ── 1. Online Booking — weight 4 ──
-    has_booking = any(sig in html_lower for sig in BOOKING_SIGNALS)
-    if has_booking:
-        automation_present.append("Online Booking")
-    else:
-        automation_gaps.append(("No online booking system", 4))
+# ── Structured data — schema.org business markup on the homepage ──
+BUSINESS_SCHEMA_TYPES = [  # most specific first
+    "Dentist", "MedicalClinic", "MedicalBusiness", "Physician",
+    "HealthAndBeautyBusiness", "ProfessionalService", "LocalBusiness",
+]
+SCHEMA_PROPS = ("name", "telephone", "email", "address")
 
-    # ── 2. Chatbot / Live Chat — weight 3 ──
-    has_chatbot = any(sig in html_lower for sig in CHATBOT_SIGNALS)
-    if has_chatbot:
-        automation_present.append("Chatbot/Live Chat")
-    else:
-        automation_gaps.append(("No chatbot or live chat", 3))
 
-    # ── 3. Automated Review System — weight 3 ──
-    has_reviews = any(sig in html_lower for sig in REVIEW_SYSTEM_SIGNALS)
-    if has_reviews:
-        automation_present.append("Review Automation")
-    else:
-        automation_gaps.append(("No automated review system", 3))
+def extract_structured_data(soup):
+    """
+    {"name", "telephone", "email", "address"} of the most specific schema.org
+    business on the page, from JSON-LD or microdata. Missing fields are "";
+    {} if the page has no business markup at all.
+    """
+    nodes = []
+    for script in soup.find_all("script", type=re.compile(r"ld\+json", re.I)):
+        try:
+            nodes.extend(_jsonld_nodes(json.loads(script.string or "")))
+        except ValueError:
+            continue
+    for item in soup.find_all(itemscope=True, itemtype=True):
+        nodes.append(_microdata_node(item))
+
+    best, best_rank = None, len(BUSINESS_SCHEMA_TYPES)
+    for node in nodes:
+        types = node.get("@type")
+        for t in types if isinstance(types, list) else [types]:
+            if t in BUSINESS_SCHEMA_TYPES and BUSINESS_SCHEMA_TYPES.index(t) < best_rank:
+                best, best_rank = node, BUSINESS_SCHEMA_TYPES.index(t)
+    if best is None:
+        return {}
+
+    email = _first_value(best.get("email")).lower().replace("mailto:", "").strip()
+    return {
+        "name": _first_value(best.get("name")),
+        "telephone": _first_value(best.get("telephone")).replace("tel:", ""),
+        "email": email if is_email_shaped(email) else "",
+        "address": _format_address(best.get("address")),
+    }
 
-    # ── 4. Patient Portal — weight 2 ──
-    has_portal = any(sig in html_lower for sig in PATIENT_PORTAL_SIGNALS)
-    if has_portal:
-        automation_present.append("Patient Portal")
-    else:
-        automation_gaps.append(("No patient portal", 2))
 
-    # ── 5. SMS / Text Capability — weight 2 ──
-    has_sms = any(sig in html_lower for sig in SMS_SIGNALS)
-    if has_sms:
-        automation_present.append("SMS/Text")
-    else:
-        automation_gaps.append(("No SMS or text capability", 2))
-
-    # ── 6. Phone-Only Booking (POSITIVE signal = they need help) — weight 3 ──
-    is_phone_only = any(sig in html_lower for sig in MANUAL_SIGNALS)
-    if is_phone_only and not has_booking:
-        automation_gaps.append(("Phone-only appointment booking", 3))
-
-    # ── 7. Paper/Printable Forms — weight 3 ──
-    has_paper_forms = any(sig in html_lower for sig in PAPER_FORM_SIGNALS)
-    if has_paper_forms:
-        automation_gaps.append(("Still uses paper/printable forms", 3))
-
-    # ── 8. Email Marketing — weight 2 ──
-    has_email_mktg = any(sig in html_lower for sig in EMAIL_MARKETING_SIGNALS)
-    if has_email_mktg:
-        automation_present.append("Email Marketing")
-    else:
-        automation_gaps.append(("No email marketing automation", 2))
-
-    # ── 9. Practice Management Software — weight 2 ──
-    has_pms = any(sig in html_lower for sig in PRACTICE_MGMT_SIGNALS)
-    if has_pms:
-        automation_present.append("Practice Management Software")
-    # Note: not having PMS detected on website doesn't necessarily mean they
-    # don't have it, so we only give a small weight
-    # We don't add a gap for this — too many false positives
-
-    # ── Also scan /contact and /about pages for more signals ──
-    extra_html = ""
-    for path in ["/contact", "/about"]:
-        extra_resp, _ = fetch(f"https://{domain}{path}", timeout=8)
-        if extra_resp and extra_resp.status_code == 200:
-            extra_html += extra_resp.text.lower()
-        time.sleep(0.2)
+def _jsonld_nodes(data):
+    """Every object in a JSON-LD document, including @graph members."""
+    if isinstance(data, list):
+        for item in data:
+            yield from _jsonld_nodes(item)
+    elif isinstance(data, dict):
+        yield data
+        yield from _jsonld_nodes(data.get("@graph", []))
 
-    if extra_html:
-        # Check extra pages for signals we might have missed on homepage
-        if not has_booking and any(sig in extra_html for sig in BOOKING_SIGNALS):
-            # Found on subpage — remove the gap
-            automation_gaps = [(g, w) for g, w in automation_gaps if "booking" not in g.lower()]
-            automation_present.append("Online Booking")
-        if not has_chatbot and any(sig in extra_html for sig in CHATBOT_SIGNALS):
-            automation_gaps = [(g, w) for g, w in automation_gaps if "chatbot" not in g.lower()]
-            automation_present.append("Chatbot/Live Chat")
-        if not has_portal and any(sig in extra_html for sig in PATIENT_PORTAL_SIGNALS):
-            automation_gaps = [(g, w) for g, w in automation_gaps if "portal" not in g.lower()]
-            automation_present.append("Patient Portal")
-        # Check for more manual signals on subpages
-        if not is_phone_only and any(sig in extra_html for sig in MANUAL_SIGNALS):
-            if not any("Phone-only" in g for g, _ in automation_gaps):
-                automation_gaps.append(("Phone-only appointment booking", 3))
-        if not has_paper_forms and any(sig in extra_html for sig in PAPER_FORM_SIGNALS):
-            if not any("paper" in g.lower() for g, _ in automation_gaps):
-                automation_gaps.append(("Still uses paper/printable forms", 3))
+
+def _microdata_node(item):
+    """One itemscope element as a JSON-LD-shaped dict (only the props we use)."""
+    node = {"@type": item["itemtype"].rstrip("/").rsplit("/", 1)[-1]}
+    for prop in SCHEMA_PROPS:
+        el = item.find(itemprop=prop)
+        if el is None:
+            continue
+        if el.has_attr("itemscope"):  # nested PostalAddress
+            node[prop] = {sub["itemprop"]: sub.get("content") or sub.get_text(" ", strip=True)
+                          for sub in el.find_all(itemprop=True)}
+        else:
+            node[prop] = el.get("content") or el.get("href") or el.get_text(" ", strip=True)
+    return node
+
+
+def _first_value(value):
+    if isinstance(value, list):
+        value = value[0] if value else ""
+    return value.strip() if isinstance(value, str) else ""
+
+
+def _format_address(address):
+    """PostalAddress (or plain string) → "12 Main St, Austin, TX 78701"."""
+    if isinstance(address, list):
+        address = address[0] if address else ""
+    if isinstance(address, str):
+        return address.strip()
+    if not isinstance(address, dict):
+        return ""
+    region = " ".join(_first_value(address.get(k)) for k in ("addressRegion", "postalCode")).strip()
+    parts = [_first_value(address.get("streetAddress")), _first_value(address.get("addressLocality")), region]
+    return ", ".join(p for p in parts if p)
+
+
+def has_business_listing(structured):
+    """Markup gives an address plus a phone or email — nothing left to look for on /contact, /about."""
+    return bool(structured.get("address") and (structured.get("telephone") or structured.get("email")))
+
+
+def format_phone(raw):
+    """"+1 512.555.0100" → "(512) 555-0100"; "" unless it is a 10-digit US number."""
+    digits = NON_DIGIT_RE.sub("", raw)
+    if len(digits) == 11 and digits.startswith("1"):
+        digits = digits[1:]
+    if len(digits) == 10:
+        return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
+    return ""
+
+
+def audit_homepage(domain, homepage=None, analyze=None):
+    """
+    Stage 1 of the audit: everything that only needs the homepage.
+    `homepage` = prefetched (page, load_time); `analyze` = what runs the
+    CPU half (default analyze_homepage() in this thread — see
+    analyze_in_pool()). Returns None for dead, junk, enterprise and
+    nonprofit sites; audit_subpages() finishes the job.
+    """
+    page, load_time = homepage or fetch_homepage(domain)
+    if page is None or page["status"] >= 400:
+        return None
+    if is_skip_domain((urlparse(page["url"]).hostname or "").lower()):
+        return None  # redirects to a directory listing / platform profile
+    return (analyze or analyze_homepage)(domain, page, load_time)
+
+
+def analyze_homepage(domain, page, load_time):
+    """
+    CPU half of audit_homepage(): parse + signal scan of an already fetched
+    page. No network, so it can run in an analyzer process.
+    """
+    from bs4 import BeautifulSoup
+    html = page["text"]
+    size_kb = round(page["size"] / 1024, 1)
+    with timed("parse"):
+        soup = BeautifulSoup(html, "html.parser")
+        html_lower = html.lower()
+
+        # ─── Page title ───
+        title_tag = soup.find("title")
+        title = title_tag.get_text(strip=True) if title_tag else ""
+
+        site = new_site(domain, page["url"])
+        discover_subpages(site, soup)
+        structured = extract_structured_data(soup)
+
+    # Double-check title for junk patterns (in case search title was different)
+    if JUNK_TITLE_RE.search(title):
+        return None  # not a business homepage
+
+    signals_start = time.perf_counter()
+    seen = {}  # keyword → found on this page, shared by every rule below
+
+    # ─── Enterprise / nonprofit detection ───
+    gate = match_rules(html_lower, GATE_RULES, seen)
+    enterprise_hits = gate["enterprise"]
+    if enterprise_hits >= 3:
+        record_stage("signals", time.perf_counter() - signals_start, signals_start)
+        return None  # too big, skip
+    if gate["nonprofit"] >= 2:
+        record_stage("signals", time.perf_counter() - signals_start, signals_start)
+        return None  # nonprofit/NGO, not a revenue business
+
+    # ═══════════════════════════════════════════════════════════
+    # CMS, budget signals, automation present / gaps, SMB phrases —
+    # one pass over the rule registry (see signal_rules.py)
+    # ═══════════════════════════════════════════════════════════
+    hits = match_rules(html_lower, PAGE_RULES, seen)
+    cms = next((rule["name"] for rule in CMS_RULES if hits[rule["name"]]), "Unknown")
+    signals = [rule["name"] for rule in REVENUE_RULES if hits[rule["name"]]]
+    gap_codes, automation_present = gaps_from_hits(hits)
+    automation_gaps = [GAP_RULES[g] for g in gap_codes]  # (gap_description, weight)
+    record_stage("signals", time.perf_counter() - signals_start, signals_start)
 
     # ─── SMB signals (positive = small business) ───
     smb_signals = 0
     smb_reasons = []
 
     # Phone number on homepage = local business + approachable
-    phone_re = re.compile(r"\(?\d{3}\)?[\s.\-]?\d{3}[\s.\-]?\d{4}")
-    phone_match = phone_re.search(html)
+    phone_match = None if structured.get("telephone") else PHONE_RE.search(html)
     phone_number = ""
-    if phone_match:
+    if structured.get("telephone") or phone_match:
         smb_signals += 2
         smb_reasons.append("local phone")
         # Clean up the phone number
-        raw_phone = phone_match.group(0)
-        digits = re.sub(r"\D", "", raw_phone)
-        if len(digits) == 10:
-            phone_number = f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
+        phone_number = format_phone(structured.get("telephone") or phone_match.group(0))
 
     # Address on homepage
-    address_re = re.compile(r"\d+\s+[\w\s]+(?:st|street|ave|avenue|blvd|boulevard|dr|drive|rd|road|ln|lane|ct|court|way|pl|place)\b", re.I)
-    if address_re.search(html):
+    if structured.get("address") or ADDRESS_RE.search(html):
         smb_signals += 2
         smb_reasons.append("street address")
 
     # Common SMB CMS = easy sell
-    if cms in ("WordPress", "Wix", "Squarespace", "Webflow", "Joomla"):
+    if RULES_BY_NAME.get(cms, {}).get("smb"):
         smb_signals += 1
         smb_reasons.append(f"{cms} site")
 
@@ -801,20 +1580,11 @@ def audit_domain(domain):
         smb_signals += 1
         smb_reasons.append("small site")
 
-    # No careers page text = small team
-    if "careers" not in html_lower and "job openings" not in html_lower:
-        smb_signals += 1
-        smb_reasons.append("no careers page")
-
-    # "Owner", "founder", "family" = approachable, owner-operated
-    if any(w in html_lower for w in ["owner", "founder", "family owned", "family-owned", "established in", "since 19", "since 20", "locally owned", "veteran owned", "woman owned"]):
-        smb_signals += 2
-        smb_reasons.append("owner/founder mention")
-
-    # "Schedule", "call us" = local service biz
-    if any(w in html_lower for w in ["schedule appointment", "call us today", "free consultation", "free estimate", "free quote", "get a quote"]):
-        smb_signals += 1
-        smb_reasons.append("service-oriented")
+    # No careers page, owner/founder mention, service phrasing
+    for rule in SMB_RULES:
+        if bool(hits[rule["name"]]) != bool(rule.get("absent")):
+            smb_signals += rule["weight"]
+            smb_reasons.append(rule["reason"])
 
     # Negative: enterprise signals reduce SMB score
     if enterprise_hits > 0:
@@ -823,20 +1593,85 @@ def audit_domain(domain):
 
     return {
         "html": html,
+        "emails": find_emails(html),
         "load_time": load_time,
         "page_size_kb": size_kb,
         "title": title,
         "cms": cms,
         "revenue_signals": signals,
         "automation_gaps": automation_gaps,
+        "gap_codes": gap_codes,
         "automation_present": automation_present,
         "smb_signals": smb_signals,
         "smb_reasons": smb_reasons,
         "enterprise_hits": enterprise_hits,
         "phone": phone_number,
+        "structured": structured,
+        "address": structured.get("address", ""),
+        "validators": page["validators"],
+        "site": site,
+        # homepage detections audit_subpages() needs to know about
+        "homepage_hits": {rule["name"]: bool(hits[rule["name"]]) for rule in SUBPAGE_RULES},
+        # a full schema.org listing answers what /contact and /about would
+        "subpages_checked": has_business_listing(structured),
     }
 
 
+def audit_subpages(audit):
+    """
+    Stage 2 of the audit: rescan the contact/about pages for automation the
+    homepage didn't show (removes gaps) and manual-process tells (adds gaps).
+    Updates `audit` in place; a no-op once subpages_checked is set.
+    """
+    if audit["subpages_checked"]:
+        return audit
+    site = audit["site"]
+    hits = audit["homepage_hits"]
+    gap_codes = audit["gap_codes"]
+    automation_present = audit["automation_present"]
+
+    # ── Also scan the contact and about pages for more signals ──
+    extra_pages = []
+    for path in subpage_paths(site, "contact")[:1] + subpage_paths(site, "about")[:1]:
+        extra = site_page(site, path)
+        if extra:
+            extra_pages.append(extra["text"].lower())
+    extra_html = "\n".join(extra_pages)
+    del extra_pages
+
+    signals_start = time.perf_counter()
+    if extra_html:
+        # Check extra pages only for signals the homepage didn't have
+        found = match_rules(extra_html, [rule for rule in SUBPAGE_RULES if not hits[rule["name"]]])
+        if found.get("booking"):
+            # Found on subpage — remove the gap (phone-only goes with it)
+            gap_codes = [g for g in gap_codes if g not in (GAP_NO_BOOKING, GAP_PHONE_ONLY)]
+            automation_present.append(RULES_BY_NAME["booking"]["present"])
+        for name in ("chatbot", "portal"):
+            if found.get(name):
+                gap_codes = [g for g in gap_codes if g != RULES_BY_NAME[name]["gap"]]
+                automation_present.append(RULES_BY_NAME[name]["present"])
+        # Check for more manual signals on subpages
+        for name in ("phone_only", "paper_forms"):
+            if found.get(name) and RULES_BY_NAME[name]["gap"] not in gap_codes:
+                gap_codes.append(RULES_BY_NAME[name]["gap"])
+
+    automation_gaps = [GAP_RULES[g] for g in gap_codes]  # (gap_description, weight)
+    record_stage("signals.extra", time.perf_counter() - signals_start, signals_start)
+    audit["gap_codes"] = gap_codes
+    audit["automation_gaps"] = automation_gaps
+    audit["subpages_checked"] = True
+    return audit
+
+
+def audit_domain(domain, homepage=None, analyze=None):
+    """Audit dental practice for AI automation needs. `homepage` = prefetched (page, load_time)."""
+    audit = audit_homepage(domain, homepage=homepage, analyze=analyze)
+    if audit is not None:
+        audit_subpages(audit)
+    return audit
+
+
 # ============================================================
 # CONTACT EXTRACTION
 # ============================================================
@@ -862,6 +1697,113 @@ JUNK_EMAIL_PREFIXES = {
 }
 
 
+# ── Fast path: find '@' with str.find and grow the address outwards,
+# instead of running EMAIL_RE over megabytes of inline JS/CSS ──
+EMAIL_LOCAL_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%+-")
+EMAIL_HOST_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789.-")
+
+MAILTO_RE = re.compile(r"mailto:([^\"'?>\s]+)", re.I)
+CFEMAIL_RE = re.compile(r"""(?:data-cfemail=["']|/cdn-cgi/l/email-protection#)([0-9a-fA-F]{4,})""")
+# "jane [at] smile [dot] com", "jane(at)smile.com", "jane {at} smile {dot} co {dot} uk"
+AT_MARKER_RE = re.compile(r"[\[({]\s*at\s*[\])}]\s*", re.I)
+OBFUSCATED_HOST_RE = re.compile(r"[a-z0-9\-]+(?:\s*(?:[\[({]\s*dot\s*[\])}]|\.)\s*[a-z0-9\-]+)+", re.I)
+OBFUSCATED_DOT_RE = re.compile(r"\s*(?:[\[({]\s*dot\s*[\])}]|\.)\s*", re.I)
+
+
+def decode_cfemail(hex_str):
+    """Cloudflare email protection: first byte is the XOR key for the rest."""
+    try:
+        data = bytes.fromhex(hex_str)
+        return bytes(b ^ data[0] for b in data[1:]).decode("utf-8")
+    except (ValueError, UnicodeDecodeError):
+        return ""
+
+
+def is_email_shaped(email):
+    local, _, host = email.partition("@")
+    if not local or "." not in host:
+        return False
+    labels = host.split(".")
+    return all(labels) and labels[-1].isalpha() and len(labels[-1]) >= 2
+
+
+def scan_at_signs(text):
+    """Addresses around each '@' in `text` — same shape EMAIL_RE matches, no backtracking."""
+    found = []
+    n = len(text)
+    pos = text.find("@")
+    while pos != -1:
+        start = pos
+        while start > 0 and pos - start < 64 and text[start - 1] in EMAIL_LOCAL_CHARS:
+            start -= 1
+        end = pos + 1
+        while end < n and end - pos < 254 and text[end] in EMAIL_HOST_CHARS:
+            end += 1
+        if start < pos and end > pos + 1:
+            candidate = text[start:end].rstrip(".-")
+            if is_email_shaped(candidate):
+                found.append(candidate)
+        pos = text.find("@", end)
+    return found
+
+
+def scan_obfuscated(text):
+    """"name [at] domain [dot] com" forms, matched only around each [at]/(at)/{at} marker."""
+    found = []
+    for marker in AT_MARKER_RE.finditer(text):
+        local_end = marker.start()
+        while local_end > 0 and text[local_end - 1].isspace():
+            local_end -= 1
+        start = local_end
+        while start > 0 and local_end - start < 64 and text[start - 1] in EMAIL_LOCAL_CHARS:
+            start -= 1
+        host = OBFUSCATED_HOST_RE.match(text, marker.end())
+        if start < local_end and host:
+            found.append(f"{text[start:local_end]}@{OBFUSCATED_DOT_RE.sub('.', host.group(0))}")
+    return found
+
+
+def visible_segments(html):
+    """
+    `html` minus <script>/<style> bodies — where the megabytes of inline
+    code live. JSON-LD blocks are kept: practices list their email there.
+    """
+    lower = html.lower()
+    pos = 0
+    while True:
+        script = lower.find("<script", pos)
+        style = lower.find("<style", pos)
+        block = min(i for i in (script, style, len(html)) if i != -1)
+        yield html[pos:block]
+        if block == len(html):
+            return
+        close_tag = "</script" if block == script else "</style"
+        end = lower.find(close_tag, block)
+        end = len(html) if end == -1 else end
+        tag_end = lower.find(">", block, end)
+        if "ld+json" in lower[block:tag_end]:
+            yield html[tag_end + 1:end]
+        pos = end
+
+
+def find_emails(html):
+    """
+    All plausible contact emails in a page, junk filtered out. mailto:
+    links and Cloudflare-protected addresses first, then every '@' and
+    "name [at] domain [dot] com" obfuscation outside <script>/<style>.
+    """
+    with timed("contacts"):
+        raw = [unquote(m).split(",")[0] for m in MAILTO_RE.findall(html)]
+        if "cdn-cgi" in html or "cfemail" in html:
+            raw += [decode_cfemail(h) for h in CFEMAIL_RE.findall(html)]
+        if "&#64;" in html or "&#x40;" in html.lower():
+            html = html_lib.unescape(html)  # entity-encoded addresses
+        for text in visible_segments(html):
+            raw += scan_at_signs(text)
+            raw += scan_obfuscated(text)
+        return clean_emails(em for em in raw if is_email_shaped(em))
+
+
 def clean_emails(raw):
     clean = []
     for em in raw:
@@ -881,22 +1823,35 @@ def clean_emails(raw):
     return list(dict.fromkeys(clean))[:5]
 
 
-def extract_contacts(domain, homepage_html):
-    emails = clean_emails(EMAIL_RE.findall(homepage_html))
+def extract_contacts(domain, homepage_html, site=None, structured=None, homepage_emails=None):
+    """
+    Emails from the homepage (plus its schema.org markup), else from
+    contact/about pages (reusing any the audit fetched). Pages with a full
+    business listing are never crawled further. `homepage_emails` =
+    find_emails(homepage_html) when the caller already has it.
+    """
+    structured = structured or {}
+    emails = find_emails(homepage_html) if homepage_emails is None else homepage_emails
+    if structured.get("email"):
+        emails = clean_emails([structured["email"]] + emails)
     if emails:
         return emails, ""
+    if site is None:
+        site = new_site(domain)
+    if has_business_listing(structured):
+        contact_paths = subpage_paths(site, "contact")
+        return [], f"{site['origin']}{contact_paths[0] if contact_paths else '/contact'}"
     contact_page = ""
-    for path in ["/contact", "/contact-us", "/about", "/about-us", "/team"]:
-        url = f"https://{domain}{path}"
-        resp, _ = fetch(url, timeout=8)
-        if resp and resp.status_code == 200:
-            found = clean_emails(EMAIL_RE.findall(resp.text))
+    contact_paths = subpage_paths(site, "contact")
+    for path in contact_paths + subpage_paths(site, "about"):
+        page = site_page(site, path)
+        if page:
+            found = find_emails(page["text"])
             if found:
                 return found, ""
-            if not contact_page and "contact" in path:
-                contact_page = url
-        time.sleep(0.2)
-    return [], contact_page or f"https://{domain}/contact"
+            if not contact_page and path in contact_paths:
+                contact_page = f"{site['origin']}{path}"
+    return [], contact_page or f"{site['origin']}/contact"
 
 
 # ── Email MX verification ────────────────────────────────────
@@ -977,10 +1932,13 @@ def verify_emails(emails):
         return [], False
     verified = []
     for em in emails:
-        if not verify_email_domain(em):
+        with timed("mx"):
+            mx_ok = verify_email_domain(em)
+        if not mx_ok:
             continue
         # SMTP check — skip if address is rejected
-        smtp_ok = verify_email_smtp(em)
+        with timed("smtp"):
+            smtp_ok = verify_email_smtp(em)
         if smtp_ok is False:
             continue
         verified.append(em)
@@ -1015,11 +1973,19 @@ def email_quality_score(emails):
 # MULTI-FACTOR SCORING
 # ============================================================
 
+# Tweak these, then `python ai_leads.py --rescore` re-tiers every stored audit
+SCORE_WEIGHTS = {"contact": 0.35, "automation": 0.25, "biz_fit": 0.25, "budget": 0.15}
+AUTOMATION_MAX_RAW = 25               # gap weight that maps to automation score 100
+BUDGET_SCORES = (10, 30, 55, 75, 100)  # by number of revenue signals (last = 4+)
+HOT_SCORE = 65
+WARM_SCORE = 45                        # COLD starts at MIN_TOTAL_SCORE
+
+
 def calc_automation_score(gaps):
     """Automation need score 0-100. More gaps = higher score = more manual = better lead."""
     raw = sum(w for _, w in gaps)
     # Max possible raw ~25 (all gaps), normalize to 0-100
-    return min(100, int((raw / 25) * 100))
+    return min(100, int((raw / AUTOMATION_MAX_RAW) * 100))
 
 
 def calc_biz_fit_score(smb_signals):
@@ -1031,44 +1997,124 @@ def calc_biz_fit_score(smb_signals):
 
 def calc_budget_score(signals):
     """Budget score 0-100 based on marketing/revenue tools detected."""
-    if len(signals) == 0:
-        return 10
-    elif len(signals) == 1:
-        return 30
-    elif len(signals) == 2:
-        return 55
-    elif len(signals) == 3:
-        return 75
-    else:
-        return 100
+    return BUDGET_SCORES[min(len(signals), len(BUDGET_SCORES) - 1)]
 
 
 def calc_total_score(automation_score, biz_fit_score, budget_score, contact_score):
     """
-    Weighted total score 0-100.
+    Weighted total score 0-100 (SCORE_WEIGHTS).
     Contact:    35% (approachability is #1)
     Automation: 25% (they need automation you can provide)
     Biz fit:    25% (must be small enough to hire you)
     Budget:     15% (nice to know they spend, but not critical)
     """
     return int(
-        contact_score * 0.35 +
-        automation_score * 0.25 +
-        biz_fit_score * 0.25 +
-        budget_score * 0.15
+        contact_score * SCORE_WEIGHTS["contact"] +
+        automation_score * SCORE_WEIGHTS["automation"] +
+        biz_fit_score * SCORE_WEIGHTS["biz_fit"] +
+        budget_score * SCORE_WEIGHTS["budget"]
     )
 
 
+def calc_contact_score(emails, phone):
+    """Contact score 0-100: best email quality, +30 if we also have a phone number."""
+    contact_score = email_quality_score(emails)
+    if phone:
+        contact_score = min(100, contact_score + 30)  # phone = very approachable
+    return contact_score
+
+
+def score_upper_bound(audit, contact_cap):
+    """
+    Best (total, (auto, biz, budget, contact)) a partially evaluated domain
+    can still reach. Biz fit and budget are final after the homepage; the
+    subpage stage can only ADD the phone-only / paper-form gaps (everything
+    else it does removes gaps); email verification only drops emails, so the
+    contact score before verification caps the final one.
+    """
+    gaps = [GAP_RULES[code] for code in _reachable_gap_codes(audit)]
+    scores = (calc_automation_score(gaps), calc_biz_fit_score(audit["smb_signals"]),
+              calc_budget_score(audit["revenue_signals"]), contact_cap)
+    return calc_total_score(*scores), scores
+
+
+def _reachable_gap_codes(audit):
+    """Current gap codes, plus the ones the subpage stage could still add if it hasn't run."""
+    codes = list(audit["gap_codes"])
+    if not audit["subpages_checked"]:
+        for code in (GAP_PHONE_ONLY, GAP_PAPER_FORMS):
+            if code not in codes:
+                codes.append(code)
+    return codes
+
+
 def lead_tier(total_score):
-    if total_score >= 65:
+    if total_score >= HOT_SCORE:
         return "🔥 HOT"
-    elif total_score >= 45:
+    elif total_score >= WARM_SCORE:
         return "🟡 WARM"
     elif total_score >= MIN_TOTAL_SCORE:
         return "🟢 COLD"
     return "SKIP"
 
 
+# ── Batch scoring ────────────────────────────────────────────
+# Same maths as the calc_* functions above, over whole columns at once.
+
+def score_batch(gap_weight, smb_signals, n_revenue_signals, contact_score):
+    """
+    Score many audits in one pass. Takes equal-length sequences of raw
+    features (summed gap weight, SMB signal count, revenue-signal count,
+    contact score) and returns a dict of lists: automation, biz_fit, budget,
+    contact, total, tier. Uses NumPy when installed; results are identical
+    to calling the calc_* functions row by row.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        print("  [–] numpy not installed — scoring row by row (pip install numpy)")
+        return _score_rows(gap_weight, smb_signals, n_revenue_signals, contact_score)
+
+    gap_weight = np.asarray(gap_weight, dtype=np.float64)
+    smb_signals = np.asarray(smb_signals, dtype=np.int64)
+    n_revenue_signals = np.asarray(n_revenue_signals, dtype=np.int64)
+    contact = np.asarray(contact_score, dtype=np.int64)
+
+    automation = np.minimum(100, np.floor((gap_weight / AUTOMATION_MAX_RAW) * 100)).astype(np.int64)
+    biz_fit = np.clip(20 + smb_signals * 10, 0, 100)
+    budget = np.asarray(BUDGET_SCORES)[np.minimum(n_revenue_signals, len(BUDGET_SCORES) - 1)]
+    # same operand order as calc_total_score so float rounding matches exactly
+    total = np.trunc(
+        contact * SCORE_WEIGHTS["contact"] +
+        automation * SCORE_WEIGHTS["automation"] +
+        biz_fit * SCORE_WEIGHTS["biz_fit"] +
+        budget * SCORE_WEIGHTS["budget"]
+    ).astype(np.int64)
+    tier = np.select(
+        [total >= HOT_SCORE, total >= WARM_SCORE, total >= MIN_TOTAL_SCORE],
+        ["🔥 HOT", "🟡 WARM", "🟢 COLD"], default="SKIP",
+    )
+    return {
+        "automation": automation.tolist(), "biz_fit": biz_fit.tolist(),
+        "budget": budget.tolist(), "contact": contact.tolist(),
+        "total": total.tolist(), "tier": tier.tolist(),
+    }
+
+
+def _score_rows(gap_weight, smb_signals, n_revenue_signals, contact_score):
+    """Pure-Python fallback for score_batch()."""
+    out = {k: [] for k in ("automation", "biz_fit", "budget", "contact", "total", "tier")}
+    for gw, smb, n_rev, contact in zip(gap_weight, smb_signals, n_revenue_signals, contact_score):
+        auto = calc_automation_score([("", gw)])
+        biz = calc_biz_fit_score(smb)
+        budget = BUDGET_SCORES[min(n_rev, len(BUDGET_SCORES) - 1)]
+        total = calc_total_score(auto, biz, budget, contact)
+        for key, val in (("automation", auto), ("biz_fit", biz), ("budget", budget),
+                         ("contact", contact), ("total", total), ("tier", lead_tier(total))):
+            out[key].append(val)
+    return out
+
+
 # ============================================================
 # CSV
 # ============================================================
@@ -1084,18 +2130,565 @@ def init_csv():
 
 
 def append_csv(row):
-    with open(OUTPUT_FILE, "a", newline="", encoding="utf-8") as f:
+    with timed("csv"), open(OUTPUT_FILE, "a", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
         writer.writerow(row)
 
 
+# ============================================================
+# LEAD EVALUATION — one domain, audit → contacts → score
+# ============================================================
+
+def evaluate_domain(domain, info, homepage=None, analyze=None):
+    """
+    Audit, extract + verify contacts and score one domain. Touches no DB,
+    CSV or Sheets — record_result() persists. `homepage` is an already
+    fetched (page, load_time) to audit instead of fetching again; `analyze`
+    is passed on to audit_homepage().
+    Runs in stages and bails out as soon as even the best reachable score
+    would tier as SKIP (then total_score/scores are that upper bound and
+    early_exit names the stage that was skipped).
+    Returns {"outcome": "dead" | "no_contact" | "low_score" | "lead",
+             "audit", "scores", "total_score", "tier", "row", "early_exit",
+             "features" (raw scoring inputs, once scored — see score_batch)}
+    """
+    result = {"outcome": "dead", "audit": None, "scores": None, "total_score": 0,
+              "tier": "SKIP", "row": None, "early_exit": None, "features": None}
+
+    with timed("audit"):
+        audit = audit_homepage(domain, homepage=homepage, analyze=analyze)
+    if audit is None:
+        return result  # could be dead, enterprise, or junk title
+    result["audit"] = audit
+    phone = audit.get("phone", "")
+
+    # ─── Contacts: homepage first, contact/about pages only if it has none ───
+    emails, contact_page = extract_contacts(domain, audit["html"], site=audit["site"],
+                                            structured=audit["structured"],
+                                            homepage_emails=audit["emails"])
+
+    # ─── HARD REQUIREMENT: must be reachable ───
+    if not emails and not phone:
+        result["outcome"] = "no_contact"
+        return result
+
+    # ─── Early exits: stop spending round-trips once SKIP is certain ───
+    contact_cap = calc_contact_score(emails, phone)
+    if _stop_if_unreachable(result, audit, contact_cap, "before subpages"):
+        return result
+    with timed("audit.subpages"):
+        audit_subpages(audit)
+    if _stop_if_unreachable(result, audit, contact_cap, "before SMTP"):
+        return result
+
+    # ─── Verify emails (MX record check) ───
+    if emails:
+        verified_emails, all_valid = verify_emails(emails)
+        email_verified = "✓" if verified_emails else "✗"
+        emails = verified_emails  # only keep verified ones
+    else:
+        email_verified = "—"
+
+    if not emails and not phone:
+        result["outcome"] = "no_contact"
+        return result
+
+    # ─── Multi-factor scoring ───
+    auto_score = calc_automation_score(audit["automation_gaps"])
+    biz_fit_score = calc_biz_fit_score(audit["smb_signals"])
+    budget_score = calc_budget_score(audit["revenue_signals"])
+    contact_score = calc_contact_score(emails, phone)
+    total_score = calc_total_score(auto_score, biz_fit_score, budget_score, contact_score)
+    tier = lead_tier(total_score)
+
+    result["scores"] = (auto_score, biz_fit_score, budget_score, contact_score)
+    result["total_score"] = total_score
+    result["tier"] = tier
+    result["features"] = _score_features(audit, audit["gap_codes"], contact_score, exact=True)
+    if tier == "SKIP":
+        result["outcome"] = "low_score"
+        return result
+
+    # ─── Build lead row ───
+    gaps_str = "; ".join(d for d, _ in audit["automation_gaps"])
+    signals_str = "; ".join(audit["revenue_signals"]) if audit["revenue_signals"] else "None"
+
+    company = audit["structured"].get("name") or info.get("title") or audit["title"]
+    company = company.split(" - ")[0].split(" | ")[0].split(" — ")[0].split(" · ")[0].strip()
+    company = TAG_RE.sub("", company).strip()
+    if not company or len(company) < 2:
+        company = domain
+
+    result["outcome"] = "lead"
+    result["row"] = {
+        "Run_Date": TODAY,
+        "Lead_Tier": tier,
+        "Company_Name": company,
+        "Domain": domain,
+        "Niche": info["niche"],
+        "Email": "; ".join(emails) if emails else "",
+        "Email_Verified": email_verified,
+        "Phone": phone,
+        "Contact_Page": contact_page,
+        "Total_Score": total_score,
+        "Automation_Score": auto_score,
+        "Biz_Fit_Score": biz_fit_score,
+        "Budget_Score": budget_score,
+        "Contact_Score": contact_score,
+        "Automation_Gaps": gaps_str,
+        "Revenue_Signals": signals_str,
+        "CMS": audit["cms"],
+        "Page_Load_Time": f"{audit['load_time']}s",
+        "Page_Size_KB": audit["page_size_kb"],
+        "Gap_Codes": ";".join(audit["gap_codes"]),
+        "Address": audit["address"],
+    }
+    return result
+
+
+def _stop_if_unreachable(result, audit, contact_cap, stage):
+    """Mark `result` low_score and return True if even the best case is a SKIP."""
+    best, scores = score_upper_bound(audit, contact_cap)
+    if lead_tier(best) != "SKIP":
+        return False
+    result.update(outcome="low_score", total_score=best, scores=scores, early_exit=stage,
+                  features=_score_features(audit, _reachable_gap_codes(audit), contact_cap, exact=False))
+    return True
+
+
+def _score_features(audit, gap_codes, contact_score, exact):
+    """Everything --rescore needs to re-score this domain offline (one audit_features row)."""
+    smb_reasons = {_smb_reason_key(r) for r in audit["smb_reasons"]}
+    homepage_hits = [name for name, hit in audit["homepage_hits"].items() if hit]
+    return {
+        "exact": int(exact),  # 0 = early exit, gaps/contact are upper bounds
+        "gap_weight": sum(GAP_RULES[code][1] for code in gap_codes),
+        "smb_signals": audit["smb_signals"],
+        "n_revenue_signals": len(audit["revenue_signals"]),
+        "contact_score": contact_score,
+        "gap_bits": to_bits(gap_codes, FEATURE_BITS["gap_bits"]),
+        "present_bits": to_bits(audit["automation_present"], FEATURE_BITS["present_bits"]),
+        "revenue_bits": to_bits(audit["revenue_signals"], FEATURE_BITS["revenue_bits"]),
+        "smb_bits": to_bits(smb_reasons, FEATURE_BITS["smb_bits"]),
+        "homepage_bits": to_bits(homepage_hits, FEATURE_BITS["homepage_bits"]),
+        "enterprise_hits": audit["enterprise_hits"],
+        "has_phone": int(bool(audit["phone"])),
+        "cms": audit["cms"],
+        "page_size_kb": audit["page_size_kb"],
+        "load_time": round(audit["load_time"], 3),
+    }
+
+
+def _smb_reason_key(reason):
+    """smb_reasons entry → FEATURE_BITS["smb_bits"] name ("WordPress site" → "smb cms")."""
+    if reason.endswith(" site") and reason != "small site":
+        return "smb cms"
+    return reason
+
+
+def record_result(conn, domain, info, result, lead_progress=""):
+    """
+    Print the one-line verdict and persist it: seen_domains, validators,
+    run_stats counters, CSV + Sheets.
+    """
+    outcome = result["outcome"]
+    audit = result["audit"]
+    if audit is not None:
+        save_validators(conn, domain, audit["validators"])
+    with timed("db"):
+        update_run_stats(conn, int(outcome == "lead"), 1, 0, 0.0)
+
+    if outcome == "dead":
+        print("✗ skip")
+        mark_domain_seen(conn, domain, was_lead=False, niche=info["niche"])
+        return
+    if outcome == "no_contact":
+        print("✗ no contact info")
+        mark_domain_seen(conn, domain, was_lead=False, niche=info["niche"])
+        return
+
+    total_score = result["total_score"]
+    auto_score, biz_fit_score, budget_score, contact_score = result["scores"]
+    save_audit_features(conn, domain, result["features"], total_score, result["tier"])
+    if outcome == "low_score":
+        bound = f"≤{total_score}, stopped {result['early_exit']}" if result["early_exit"] else total_score
+        print(f"— score {bound} (auto={auto_score} biz={biz_fit_score} budget={budget_score} contact={contact_score})")
+        mark_domain_seen(conn, domain, was_lead=False, niche=info["niche"], score=total_score)
+        return
+
+    # Real-time push
+    row = result["row"]
+    append_csv(row)
+    sheets_ok = push_lead_to_sheets(row)
+    mark_domain_seen(conn, domain, was_lead=True, niche=info["niche"], score=total_score)
+    if info.get("query"):
+        credit_query_lead(conn, info["query"])
+
+    sheets_icon = "📊" if sheets_ok else ""
+    smb_info = ", ".join(audit["smb_reasons"][:3]) if audit["smb_reasons"] else ""
+    print(f"✓ {result['tier']} total={total_score} (auto={auto_score} biz={biz_fit_score} $={budget_score} contact={contact_score}) {smb_info} {sheets_icon} {lead_progress}")
+
+
+# ============================================================
+# FRONTIER — checkpointed candidates, query shards, domain leases
+# ============================================================
+# Every candidate goes into the `frontier` table as soon as its query
+# finishes and is audited by claiming it from there, so a run that dies
+# leaves the exact remaining candidates behind and the next one resumes
+# them without searching again.
+# `--shard i/n` runs only the queries whose crc32 falls in shard i. Each
+# copy claims domains from the frontier under an expiring lease. Domains another shard already found, claimed or finished are never
+# audited twice, and a crashed copy's claims go back to the pool after
+# LEASE_SECONDS. Copies on one host share ai_leads_history.db; copies on
+# other machines point --coordinator at one running --serve-frontier,
+# which keeps the frontier (and seen_domains) in its own DB.
+
+def in_shard(query, shard=None):
+    index, count = shard or SHARD
+    return zlib.crc32(query.encode("utf-8")) % count == index
+
+
+def coordinated():
+    return SHARD[1] > 1 or bool(COORDINATOR_URL)
+
+
+def _coordinator_call(action, payload):
+    import requests
+    r = requests.post(f"{COORDINATOR_URL.rstrip('/')}/{action}", json=payload, timeout=REQUEST_TIMEOUT,
+                      headers={"Authorization": f"Bearer {FRONTIER_TOKEN}"})
+    r.raise_for_status()
+    return r.json()
+
+
+def frontier_enqueue(conn, domain_map):
+    """Add fresh candidates to the frontier; returns how many were new to it."""
+    if COORDINATOR_URL:
+        return _coordinator_call("enqueue", {"domains": domain_map})["added"]
+    with timed("db"):
+        c = conn.cursor()
+        expire_frontier(conn)
+        before = conn.total_changes
+        c.executemany("""
+            INSERT OR IGNORE INTO frontier (domain, info, added, priority)
+            SELECT ?, ?, ?, ? WHERE NOT EXISTS (SELECT 1 FROM seen_domains WHERE domain = ?)
+        """, [(d, json.dumps(info), TODAY, info.get("prescore", 0), d) for d, info in domain_map.items()])
+        added = conn.total_changes - before
+        conn.commit()
+    return added
+
+
+def expire_frontier(conn):
+    """Drop rows from earlier days, open or done; claims a running copy still holds are kept."""
+    conn.execute("DELETE FROM frontier WHERE added < ? AND (done = 1 OR lease_until < ?)", (TODAY, time.time()))
+
+
+def frontier_claim(conn, worker, limit):
+    """
+    Lease up to `limit` open domains to `worker`, highest pre-score first.
+    Returns [(domain, info), ...] — nothing once all copies together have
+    found today's DAILY_LEAD_TARGET.
+    """
+    if COORDINATOR_URL:
+        return [tuple(row) for row in _coordinator_call("claim", {"worker": worker, "limit": limit})["domains"]]
+    if frontier_stats(conn)["leads"] >= DAILY_LEAD_TARGET:
+        return []
+    now = time.time()
+    with timed("db"):
+        conn.commit()
+        conn.execute("BEGIN IMMEDIATE")  # one claimer at a time; others wait on the lock
+        try:
+            rows = conn.execute("""
+                SELECT domain, info FROM frontier
+                WHERE done = 0 AND lease_until < ? ORDER BY priority DESC, added, rowid LIMIT ?
+            """, (now, limit)).fetchall()
+            conn.executemany("UPDATE frontier SET lease_owner = ?, lease_until = ? WHERE domain = ?",
+                             [(worker, now + LEASE_SECONDS, domain) for domain, _ in rows])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return [(domain, json.loads(info)) for domain, info in rows]
+
+
+def frontier_done(conn, domain, worker, result, niche=""):
+    """
+    Report a claimed domain finished. Locally record_result() has already
+    marked it seen; the coordinator does that on its own DB.
+    """
+    outcome = result["outcome"]
+    if COORDINATOR_URL:
+        _coordinator_call("done", {"worker": worker, "domain": domain, "outcome": outcome,
+                                   "score": result["total_score"], "niche": niche})
+        return
+    with timed("db"):
+        conn.execute("UPDATE frontier SET done = 1, outcome = ?, lease_until = 0 WHERE domain = ?",
+                     (outcome, domain))
+        conn.commit()
+
+
+def frontier_release(conn, worker):
+    """Hand back `worker`'s unfinished claims (e.g. after hitting the lead target)."""
+    if COORDINATOR_URL:
+        return _coordinator_call("release", {"worker": worker})["released"]
+    with timed("db"):
+        c = conn.cursor()
+        c.execute("UPDATE frontier SET lease_owner = '', lease_until = 0 WHERE done = 0 AND lease_owner = ?",
+                  (worker,))
+        conn.commit()
+    return c.rowcount
+
+
+def recover_frontier(conn):
+    """
+    Clean up after a run on this host that died: close domains it recorded
+    but never reported done, and hand back claims held by copies that are
+    no longer running so they resume now rather than after LEASE_SECONDS.
+    Returns how many domains were handed back.
+    """
+    with timed("db"):
+        expire_frontier(conn)
+        conn.execute("""
+            UPDATE frontier SET done = 1, lease_until = 0
+            WHERE done = 0 AND domain IN (SELECT domain FROM seen_domains)
+        """)
+        conn.commit()
+    host = socket.gethostname()
+    released = 0
+    owners = conn.execute("SELECT DISTINCT lease_owner FROM frontier WHERE done = 0 AND lease_owner LIKE ?",
+                          (f"{host}:%",)).fetchall()
+    for (owner,) in owners:
+        pid = int(owner.rsplit(":", 1)[1])
+        try:
+            os.kill(pid, 0)
+            continue  # still running
+        except ProcessLookupError:
+            released += frontier_release(conn, owner)
+        except PermissionError:
+            continue  # running as someone else
+    return released
+
+
+def frontier_stats(conn):
+    """
+    {"open", "leased", "done"} counts for today's frontier, and "leads": today's
+    leads across every copy. Copies sharing this DB all add to run_stats; a
+    coordinator only sees remote leads as frontier outcomes, so take the larger.
+    """
+    if COORDINATOR_URL:
+        return _coordinator_call("stats", {})
+    row = conn.execute("""
+        SELECT COALESCE(SUM(done = 0 AND lease_until < ?), 0),
+               COALESCE(SUM(done = 0 AND lease_until >= ?), 0),
+               COALESCE(SUM(done = 1), 0),
+               COALESCE(SUM(done = 1 AND outcome = 'lead'), 0)
+        FROM frontier WHERE added = ?
+    """, (time.time(), time.time(), TODAY)).fetchone()
+    return {"open": row[0], "leased": row[1], "done": row[2],
+            "leads": max(row[3], get_today_lead_count(conn))}
+
+
+def frontier_domains(conn, worker, batch):
+    """Claim and yield (domain, info) until the frontier has nothing open."""
+    while True:
+        claimed = frontier_claim(conn, worker, batch)
+        if not claimed:
+            return
+        preflight([domain for domain, _ in claimed], verbose=False)
+        yield from claimed
+
+
+def serve_frontier(port=FRONTIER_PORT, host=FRONTIER_HOST):
+    """Run the frontier for copies on other machines (--coordinator http://this-host:port).
+
+    Every request must carry FRONTIER_TOKEN as a bearer token; a malformed
+    payload gets a 400 rather than a dropped connection.
+    """
+    import hmac
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    if not FRONTIER_TOKEN:
+        print("ERROR: --serve-frontier needs a shared secret — set FRONTIER_TOKEN or pass --frontier-token")
+        sys.exit(1)
+    expected = f"Bearer {FRONTIER_TOKEN}".encode("utf-8")
+    conn = init_db()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            supplied = self.headers.get("Authorization", "").encode("utf-8")
+            if not hmac.compare_digest(supplied, expected):
+                self.send_error(401)
+                return
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                reply = self.dispatch(self.path.strip("/"), payload)
+            except (KeyError, ValueError, TypeError, AttributeError,
+                    sqlite3.InterfaceError, sqlite3.ProgrammingError):
+                # bad JSON, missing fields, or values sqlite can't bind
+                self.send_error(400)
+                return
+            if reply is None:
+                self.send_error(404)
+                return
+            body = json.dumps(reply).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def dispatch(self, action, payload):
+            if action == "enqueue":
+                reply = {"added": frontier_enqueue(conn, payload["domains"])}
+            elif action == "claim":
+                reply = {"domains": frontier_claim(conn, payload["worker"], int(payload["limit"]))}
+            elif action == "done":
+                was_lead = payload["outcome"] == "lead"
+                mark_domain_seen(conn, payload["domain"], was_lead=was_lead,
+                                 niche=payload.get("niche", ""), score=payload.get("score", 0))
+                frontier_done(conn, payload["domain"], payload["worker"], {"outcome": payload["outcome"]})
+                reply = {}
+            elif action == "release":
+                reply = {"released": frontier_release(conn, payload["worker"])}
+            elif action == "stats":
+                reply = frontier_stats(conn)
+            else:
+                reply = None
+            return reply
+
+        def log_message(self, *args):
+            pass
+
+    # One request at a time on one connection — the lease logic stays trivially atomic
+    server = HTTPServer((host, port), Handler)
+    print(f"  [✓] Frontier coordinator on {host}:{port} ({DB_FILE}) — Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        conn.close()
+
+
+# ============================================================
+# PARALLEL AUDIT — I/O threads + analyzer processes
+# ============================================================
+# Fetching, MX/SMTP checks and politeness delays wait on the network, so
+# AUDIT_WORKERS threads run evaluate_domain() side by side. The CPU-bound
+# part (BeautifulSoup, lower-casing, rule scans, regexes) would then be
+# capped by the GIL, so analyze_homepage() runs in a process pool instead.
+# The page body goes over in a shared-memory block rather than being
+# pickled through the pool's pipe; only the small audit dict comes back.
+
+_analyzer_pool = None
+
+
+def start_analyzers(processes=None):
+    """Start the analyzer pool (one process per core unless `processes` is given)."""
+    global _analyzer_pool
+    if _analyzer_pool is None:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        # spawn, not fork: forking while I/O threads hold locks can deadlock the child
+        _analyzer_pool = ProcessPoolExecutor(max_workers=processes or os.cpu_count() or 1,
+                                             mp_context=multiprocessing.get_context("spawn"))
+    return _analyzer_pool
+
+
+def stop_analyzers():
+    global _analyzer_pool
+    if _analyzer_pool is not None:
+        _analyzer_pool.shutdown(cancel_futures=True)
+        _analyzer_pool = None
+
+
+def analyze_in_pool(domain, page, load_time):
+    """analyze_homepage() in the analyzer pool; drop-in for audit_homepage(analyze=...)."""
+    from multiprocessing import shared_memory
+    data = page["text"].encode("utf-8")
+    size = len(data)
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    try:
+        shm.buf[:size] = data
+        del data
+        meta = {k: v for k, v in page.items() if k != "text"}
+        audit, stages = _analyzer_pool.submit(_analyze_shared, shm.name, size, domain, meta, load_time).result()
+    finally:
+        shm.close()
+        shm.unlink()
+    for stage, times in stages.items():
+        for elapsed in times:
+            record_stage(stage, elapsed)
+    if audit is not None:
+        audit["html"] = page["text"]  # the parent already has it; never sent back
+    return audit
+
+
+def _analyze_shared(shm_name, size, domain, meta, load_time):
+    """Analyzer-process side of analyze_in_pool(). Returns (audit, {stage: [seconds]})."""
+    from multiprocessing import shared_memory
+    shm = shared_memory.SharedMemory(name=shm_name)  # spawn children share the parent's tracker
+    try:
+        view = shm.buf[:size]
+        text = str(view, "utf-8")
+        view.release()
+    finally:
+        shm.close()
+    _stage_times.clear()
+    audit = analyze_homepage(domain, dict(meta, text=text), load_time)
+    if audit is not None:
+        del audit["html"]
+    return audit, dict(_stage_times)
+
+
+def _evaluate_task(domain, info, analyze):
+    with timed("domain"):
+        result = evaluate_domain(domain, info, analyze=analyze)
+    if _preflight_cache.get(domain) not in PREFLIGHT_UNREACHABLE:
+        throttle(SITE_AUDIT_DELAY)
+    return domain, info, result
+
+
+def evaluate_all(items, workers=None):
+    """
+    evaluate_domain() over (domain, info) pairs; yields (domain, info, result)
+    as each finishes. With more than one worker, domains run on I/O threads
+    and homepages are analyzed in the analyzer pool (ANALYZER_PROCESSES).
+    At most 2 × workers domains are in flight, so stopping early (closing
+    the generator) wastes little.
+    """
+    workers = workers or AUDIT_WORKERS
+    if workers <= 1:
+        for domain, info in items:
+            yield _evaluate_task(domain, info, None)
+        return
+
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    analyze = None
+    if ANALYZER_PROCESSES != 0:
+        start_analyzers(ANALYZER_PROCESSES)
+        analyze = analyze_in_pool
+    items = iter(items)
+    pending = set()
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        while True:
+            for domain, info in itertools.islice(items, 2 * workers - len(pending)):
+                pending.add(pool.submit(_evaluate_task, domain, info, analyze))
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    finally:
+        pool.shutdown(cancel_futures=True)
+        stop_analyzers()
+
+
 # ============================================================
 # MAIN
 # ============================================================
 
 def main():
-    global api_calls
-
     if BRAVE_API_KEY == "YOUR_BRAVE_API_KEY_HERE":
         print("ERROR: Set your Brave API key.")
         return
@@ -1132,17 +2725,39 @@ def main():
     print("\n[3/5] CSV...")
     init_csv()
 
-    # ─── Search ───
-    print("\n[4/5] Searching for dental practices...")
-    domain_map = collect_unique_domains(conn, seen_ever)
-
-    if not domain_map:
+    # ─── Search (skipped when a crashed run left candidates behind) ───
+    released = 0
+    if not COORDINATOR_URL:
+        released = recover_frontier(conn)
+        if released:
+            print(f"  [i] Took back {released} domains claimed by a run that died")
+    frontier = frontier_stats(conn)
+    searched = not (released and frontier["open"] and not coordinated())
+    if not searched:
+        print(f"\n[4/5] Resuming: {frontier['open']} candidates left by the run that died — search skipped")
+        domain_map = {}
+    else:
+        print("\n[4/5] Searching for dental practices...")
+        domain_map = collect_unique_domains(conn, seen_ever)
+        frontier = frontier_stats(conn)
+    if coordinated():
+        print(f"  [✓] Frontier: {frontier['open']} open (all shards) | "
+              f"{frontier['leased']} leased by other copies | {frontier['done']} done today")
+    total = frontier["open"]
+
+    if not total:
         print("\n  ⚠ No fresh domains. Try tomorrow.")
         conn.close()
         return
 
     # ─── Audit + Score + Push ───
-    print(f"\n[5/5] Auditing {len(domain_map)} sites (target: {remaining_target} leads)")
+    print(f"\n[5/5] Auditing {total} sites (target: {remaining_target} leads)")
+    if AUDIT_WORKERS > 1:
+        analyzers = os.cpu_count() if ANALYZER_PROCESSES is None else ANALYZER_PROCESSES
+        print(f"  [i] {AUDIT_WORKERS} I/O workers | {analyzers or 'no'} analyzer processes")
+    if coordinated():
+        print(f"  [i] Claiming domains as {WORKER_ID} ({LEASE_SECONDS}s leases)")
+    preflight(list(domain_map))
     print(f"{'='*60}\n")
 
     leads_this_run = 0
@@ -1150,117 +2765,50 @@ def main():
     skipped_junk = 0
     skipped_low_score = 0
     skipped_dead = 0
-    total = len(domain_map)
-    domains_audited = 0
-
-    for i, (domain, info) in enumerate(domain_map.items(), 1):
-        if leads_this_run >= remaining_target:
-            print(f"\n  🎯 TARGET HIT! {leads_this_run} leads. Done.")
-            break
-
-        if i % 25 == 0:
-            print(f"\n  --- {i}/{total} | {leads_this_run}/{remaining_target} leads ---\n")
-        print(f"[{i}/{total}] {domain} ", end="", flush=True)
-
-        audit = audit_domain(domain)
-        domains_audited += 1
-
-        if audit is None:
-            # Could be dead, enterprise, or junk title
-            print("✗ skip")
-            skipped_dead += 1
-            mark_domain_seen(conn, domain, was_lead=False, niche=info["niche"])
-            seen_ever.add(domain)
-            time.sleep(SITE_AUDIT_DELAY)
-            continue
-
-        emails, contact_page = extract_contacts(domain, audit["html"])
-        phone = audit.get("phone", "")
-
-        # ─── Verify emails (MX record check) ───
-        if emails:
-            verified_emails, all_valid = verify_emails(emails)
-            email_verified = "✓" if verified_emails else "✗"
-            emails = verified_emails  # only keep verified ones
-        else:
-            email_verified = "—"
-
-        # ─── HARD REQUIREMENT: must be reachable ───
-        if not emails and not phone:
-            print("✗ no contact info")
-            skipped_low_score += 1
-            mark_domain_seen(conn, domain, was_lead=False, niche=info["niche"])
+    i = 0
+
+    while True:
+        # Results arrive as workers finish; only this thread touches the DB/CSV/Sheets
+        items = frontier_domains(conn, WORKER_ID, batch=4 * AUDIT_WORKERS)
+        results = evaluate_all(items, AUDIT_WORKERS)
+        for domain, info, result in results:
+            i += 1
+            if i % 25 == 0:
+                print(f"\n  --- {i}/{total} | {leads_this_run}/{remaining_target} leads ---\n")
+            print(f"[{i}/{total}] {domain} ", end="", flush=True)
+
+            record_result(conn, domain, info, result, lead_progress=f"[{leads_this_run + 1}/{remaining_target}]")
             seen_ever.add(domain)
-            time.sleep(SITE_AUDIT_DELAY)
-            continue
-
-        # ─── Multi-factor scoring ───
-        auto_score = calc_automation_score(audit["automation_gaps"])
-        biz_fit_score = calc_biz_fit_score(audit["smb_signals"])
-        budget_score = calc_budget_score(audit["revenue_signals"])
-        # Contact score: boost if we have BOTH email and phone
-        contact_score = email_quality_score(emails)
-        if phone:
-            contact_score = min(100, contact_score + 30)  # phone = very approachable
-        total_score = calc_total_score(auto_score, biz_fit_score, budget_score, contact_score)
-
-        tier = lead_tier(total_score)
-
-        if tier == "SKIP":
-            print(f"— score {total_score} (auto={auto_score} biz={biz_fit_score} budget={budget_score} contact={contact_score})")
-            skipped_low_score += 1
-            mark_domain_seen(conn, domain, was_lead=False, niche=info["niche"], score=total_score)
-            seen_ever.add(domain)
-            time.sleep(SITE_AUDIT_DELAY)
-            continue
-
-        # ─── Build lead row ───
-        gaps_str = "; ".join(d for d, _ in audit["automation_gaps"])
-        signals_str = "; ".join(audit["revenue_signals"]) if audit["revenue_signals"] else "None"
-
-        company = info["title"].split(" - ")[0].split(" | ")[0].split(" — ")[0].split(" · ")[0].strip()
-        company = re.sub(r"<[^>]+>", "", company).strip()
-        if not company or len(company) < 2:
-            company = domain
-
-        row = {
-            "Run_Date": TODAY,
-            "Lead_Tier": tier,
-            "Company_Name": company,
-            "Domain": domain,
-            "Niche": info["niche"],
-            "Email": "; ".join(emails) if emails else "",
-            "Email_Verified": email_verified,
-            "Phone": phone,
-            "Contact_Page": contact_page,
-            "Total_Score": total_score,
-            "Automation_Score": auto_score,
-            "Biz_Fit_Score": biz_fit_score,
-            "Budget_Score": budget_score,
-            "Contact_Score": contact_score,
-            "Automation_Gaps": gaps_str,
-            "Revenue_Signals": signals_str,
-            "CMS": audit["cms"],
-            "Page_Load_Time": f"{audit['load_time']}s",
-            "Page_Size_KB": audit["page_size_kb"],
-        }
-
-        # Real-time push
-        append_csv(row)
-        sheets_ok = push_lead_to_sheets(row)
-
-        leads_this_run += 1
-        mark_domain_seen(conn, domain, was_lead=True, niche=info["niche"], score=total_score)
-        seen_ever.add(domain)
-
-        sheets_icon = "📊" if sheets_ok else ""
-        smb_info = ", ".join(audit["smb_reasons"][:3]) if audit["smb_reasons"] else ""
-        print(f"✓ {tier} total={total_score} (auto={auto_score} biz={biz_fit_score} $={budget_score} contact={contact_score}) {smb_info} {sheets_icon} [{leads_this_run}/{remaining_target}]")
-        time.sleep(SITE_AUDIT_DELAY)
-
-    # ─── Stats ───
-    cost = (api_calls / 1000) * 3.0
-    update_run_stats(conn, leads_this_run, domains_audited, api_calls, cost)
+            frontier_done(conn, domain, WORKER_ID, result, niche=info["niche"])
+
+            if result["outcome"] == "dead":
+                skipped_dead += 1
+            elif result["outcome"] == "lead":
+                leads_this_run += 1
+            else:
+                skipped_low_score += 1
+
+            if leads_this_run >= remaining_target:
+                print(f"\n  🎯 TARGET HIT! {leads_this_run} leads. Done.")
+                break
+            # Other copies find leads too — stop once today's shared count is reached
+            if result["outcome"] == "lead" and coordinated() and frontier_stats(conn)["leads"] >= DAILY_LEAD_TARGET:
+                print(f"\n  🎯 TARGET HIT across all copies ({leads_this_run} from this one). Done.")
+                break
+        results.close()  # stops the workers; unfinished domains stay in the frontier
+        frontier_release(conn, WORKER_ID)
+
+        # The dead run's leftovers ran out short of the target — search after all
+        if searched or leads_this_run >= remaining_target:
+            break
+        print(f"\n  [i] Leftover candidates used up at {leads_this_run}/{remaining_target} leads — searching")
+        domain_map = collect_unique_domains(conn, seen_ever)
+        searched = True
+        total = i + frontier_stats(conn)["open"]
+        preflight(list(domain_map))
+
+    # ─── Stats (run_stats was updated as we went) ───
+    cost = (api_calls / 1000) * BRAVE_COST_PER_1K
     total_domains_now, total_leads_now, total_runs_now = get_all_time_stats(conn)
     conn.close()
 
@@ -1276,6 +2824,8 @@ def main():
     print(f"  {'─'*40}")
     print(f"  API calls:      {api_calls:,}")
     print(f"  Cost:           ${cost:.2f}")
+    if leads_this_run:
+        print(f"  Cost per lead:  ${cost / leads_this_run:.3f}")
     print(f"  CSV:            {os.path.basename(OUTPUT_FILE)}")
     if _sheets_ws:
         print(f"  Sheets:         ✅ {leads_this_run} leads pushed live")
@@ -1284,5 +2834,195 @@ def main():
     print(f"{'='*60}\n")
 
 
+# ============================================================
+# RE-AUDIT — cheap monthly revisit of old non-leads
+# ============================================================
+
+def reaudit(older_than_days=REAUDIT_AFTER_DAYS):
+    """
+    Revisit non-leads not checked for `older_than_days`. Each homepage is a
+    conditional GET (If-None-Match / If-Modified-Since); a 304, or a 200 whose
+    body hashes the same as last time, is skipped without parsing. Only sites
+    that changed get the full audit + score, and new leads land in today's CSV.
+    """
+    print("=" * 60)
+    print("  AI AUTOMATION LEAD GENERATOR v1 — Re-audit")
+    print(f"  Date: {TODAY} | non-leads unchecked for {older_than_days}+ days")
+    print("=" * 60)
+
+    conn = init_db()
+    already_today = get_today_lead_count(conn)
+    remaining_target = DAILY_LEAD_TARGET - already_today
+    if remaining_target <= 0:
+        print(f"\n  ⚠ Already {already_today} leads today (target {DAILY_LEAD_TARGET}). Run tomorrow!")
+        conn.close()
+        return
+
+    init_sheets()
+    init_csv()
+    candidates = get_reaudit_candidates(conn, older_than_days)
+    total = len(candidates)
+    print(f"\n  [i] {total:,} domains due for a re-check")
+    verdicts = preflight([c[0] for c in candidates])
+    print()
+
+    unchanged = 0
+    reaudited = 0
+    leads_this_run = 0
+    for i, (domain, niche, etag, last_modified, content_hash) in enumerate(candidates, 1):
+        if leads_this_run >= remaining_target:
+            print(f"\n  🎯 TARGET HIT! {leads_this_run} leads. Done.")
+            break
+        print(f"[{i}/{total}] {domain} ", end="", flush=True)
+
+        conditional = {}
+        if etag:
+            conditional["If-None-Match"] = etag
+        if last_modified:
+            conditional["If-Modified-Since"] = last_modified
+        page, load_time = fetch_homepage(domain, headers=conditional)
+
+        if page is not None and (page["status"] == 304 or
+                                 (content_hash and page["validators"]["content_hash"] == content_hash)):
+            print("= unchanged")
+            touch_validators(conn, domain)
+            unchanged += 1
+            continue
+
+        info = {"title": "", "niche": niche or "Dental"}
+        result = evaluate_domain(domain, info, homepage=(page, load_time))
+        reaudited += 1
+        record_result(conn, domain, info, result, lead_progress=f"[{leads_this_run + 1}/{remaining_target}]")
+        if result["outcome"] == "dead":
+            touch_validators(conn, domain)
+        elif result["outcome"] == "lead":
+            leads_this_run += 1
+        if verdicts.get(domain) not in PREFLIGHT_UNREACHABLE:
+            throttle(SITE_AUDIT_DELAY)
+    conn.close()
+
+    print(f"\n{'='*60}")
+    print(f"  RE-AUDIT RESULTS — {TODAY}")
+    print(f"  {'─'*40}")
+    print(f"  Unchanged (skipped): {unchanged}")
+    print(f"  Re-audited:          {reaudited}")
+    print(f"  New leads:           {leads_this_run}")
+    print(f"{'='*60}\n")
+
+
+# ============================================================
+# RE-SCORE — re-tier every stored audit after a weight change
+# ============================================================
+
+def rescore(dry_run=False):
+    """
+    Re-score all of audit_features with the current GAP_RULES weights,
+    SCORE_WEIGHTS and tier cut-offs. Gap weight is rebuilt from the stored
+    gap bitset, so changing a single gap's weight needs no re-crawl.
+    dry_run = print the new tier counts without writing (A/B a rule change).
+    """
+    conn = init_db()
+    rows = conn.execute("""
+        SELECT domain, gap_bits, gap_weight, smb_signals, n_revenue_signals, contact_score, tier, exact
+        FROM audit_features
+    """).fetchall()
+    if not rows:
+        print("  [!] No stored audits yet — run ai_leads.py first")
+        conn.close()
+        return
+
+    domains, gap_bits, stored_weight, smb, n_rev, contact, old_tiers, exact = zip(*rows)
+    with timed("rescore"):
+        # summed weight for every possible gap bitset — one lookup per row
+        order = FEATURE_BITS["gap_bits"]
+        weight_of = [sum(GAP_RULES[code][1] for code in from_bits(mask, order))
+                     for mask in range(1 << len(order))]
+        gap_weight = [weight_of[bits] if bits is not None else weight
+                      for bits, weight in zip(gap_bits, stored_weight)]
+        scored = score_batch(gap_weight, smb, n_rev, contact)
+    if not dry_run:
+        with timed("db"):
+            conn.executemany("UPDATE audit_features SET gap_weight = ?, total_score = ?, tier = ? WHERE domain = ?",
+                             zip(gap_weight, scored["total"], scored["tier"], domains))
+            conn.executemany("UPDATE seen_domains SET score = ? WHERE domain = ?",
+                             zip(scored["total"], domains))
+            conn.commit()
+    conn.close()
+
+    before = Counter(old_tiers)
+    after = Counter(scored["tier"])
+    promoted = sum(1 for old, new in zip(old_tiers, scored["tier"]) if old == "SKIP" and new != "SKIP")
+    bounded = sum(1 for old, new, ex in zip(old_tiers, scored["tier"], exact)
+                  if old == "SKIP" and new != "SKIP" and not ex)
+    print(f"\n{'='*60}")
+    print(f"  RE-SCORE — {len(rows):,} stored audits{' (dry run, nothing written)' if dry_run else ''}")
+    print(f"  {'─'*40}")
+    for tier in ("🔥 HOT", "🟡 WARM", "🟢 COLD", "SKIP"):
+        print(f"  {tier:<8} {before.get(tier, 0):>8,} → {after.get(tier, 0):,}")
+    print(f"  {'─'*40}")
+    print(f"  Newly qualifying: {promoted:,} ({bounded:,} were early exits — re-audit to confirm)")
+    print(f"{'='*60}\n")
+
+
+def run(trace_path=None, profile_path=None, entry=main):
+    """entry() plus the timing summary, optional JSON trace and optional cProfile."""
+    global _trace_enabled
+    _trace_enabled = bool(trace_path)
+    try:
+        if profile_path:
+            import cProfile
+            import pstats
+            prof = cProfile.Profile()
+            try:
+                prof.runcall(entry)
+            finally:
+                prof.dump_stats(profile_path)
+                print(f"\n  [✓] cProfile stats: {profile_path}")
+                pstats.Stats(prof).sort_stats("cumulative").print_stats(25)
+        else:
+            entry()
+    finally:
+        print_timing_summary()
+        if trace_path:
+            write_trace(trace_path)
+
+
 if __name__ == "__main__":
-    main()
+    args = sys.argv[1:]
+    trace_path = None
+    profile_path = None
+    entry = main
+    for i, arg in enumerate(args):
+        if arg == "--reaudit":
+            has_days = i + 1 < len(args) and args[i + 1].isdigit()
+            days = int(args[i + 1]) if has_days else REAUDIT_AFTER_DAYS
+            entry = lambda: reaudit(days)
+        if arg == "--queries":
+            entry = print_query_report
+        if arg == "--rescore":
+            dry_run = "--dry-run" in args
+            entry = lambda: rescore(dry_run=dry_run)
+        if arg == "--trace" and i + 1 < len(args):
+            trace_path = args[i + 1]
+        if arg == "--workers" and i + 1 < len(args):
+            AUDIT_WORKERS = max(1, int(args[i + 1]))
+        if arg == "--shard" and i + 1 < len(args):
+            index, count = (int(n) for n in args[i + 1].split("/"))
+            if not 1 <= index <= count:
+                print(f"ERROR: --shard wants i/n with 1 ≤ i ≤ n, got {args[i + 1]}")
+                sys.exit(1)
+            SHARD = (index - 1, count)
+        if arg == "--coordinator" and i + 1 < len(args):
+            COORDINATOR_URL = args[i + 1]
+        if arg == "--serve-frontier":
+            has_port = i + 1 < len(args) and args[i + 1].isdigit()
+            port = int(args[i + 1]) if has_port else FRONTIER_PORT
+            entry = lambda: serve_frontier(port, FRONTIER_HOST)
+        if arg == "--frontier-host" and i + 1 < len(args):
+            FRONTIER_HOST = args[i + 1]
+        if arg == "--frontier-token" and i + 1 < len(args):
+            FRONTIER_TOKEN = args[i + 1]
+        if arg == "--profile":
+            has_path = i + 1 < len(args) and not args[i + 1].startswith("--")
+            profile_path = args[i + 1] if has_path else os.path.join(SCRIPT_DIR, f"ai_leads_{TODAY}.prof")
+    run(trace_path=trace_path, profile_path=profile_path, entry=entry)
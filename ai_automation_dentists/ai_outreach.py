@@ -12,11 +12,10 @@ Usage:
     python ai_outreach.py --test you@email   # send 1 test to yourself
     python ai_outreach.py --replied domain.com  # mark as replied (no more follow-ups)
     python ai_outreach.py --status               # show campaign stats
+    python ai_outreach.py --report               # reply/bounce rates per template, subject, account, day
     python ai_outreach.py --csv file.csv          # specific CSV
 """
 
-import smtplib
-import imaplib
 import csv
 import sqlite3
 import os
@@ -26,9 +25,11 @@ import random
 import re
 import socket
 import email as email_lib
-import gspread
+from collections import deque
 from datetime import date, datetime, timedelta
-from email.mime.text import MIMEText
+from signal_rules import ISSUE_PHRASES, ISSUE_TIPS
+# smtplib, imaplib, email.mime and gspread are imported where they are used,
+# so --status and --replied answer without loading ~300 ms of libraries
 
 # ============================================================
 # CONFIG
@@ -58,9 +59,9 @@ ACCOUNTS = [
     # },
 ]
 
-def _account_warmup_limit(created_date):
-    """Auto-ramp fresh daily limit based on account age."""
-    age_days = (date.today() - date.fromisoformat(created_date)).days
+def _account_warmup_limit(created_date, head_start=0):
+    """Auto-ramp fresh daily limit based on account age (+ head_start days for healthy accounts)."""
+    age_days = (date.today() - date.fromisoformat(created_date)).days + head_start
     if age_days < 14:
         return 15       # week 1-2: gentle start
     elif age_days < 28:
@@ -70,14 +71,37 @@ def _account_warmup_limit(created_date):
     else:
         return 50       # week 7+: full speed
 
-# Combined limit across all accounts (uses manual 'limit' override if set, otherwise warmup ramp)
+# Combined limit across all accounts (uses manual 'limit' override if set, otherwise warmup ramp).
+# Each run adjusts every account's share for its health — see plan_accounts().
 FRESH_DAILY_LIMIT = sum(a.get("limit") or _account_warmup_limit(a["created"]) for a in ACCOUNTS)
 FOLLOWUP_DAILY_LIMIT = 100      # follow-ups per day
 TOTAL_DAILY_CAP = 200           # absolute max emails/day
 MIN_DELAY = 20                  # random delay range (seconds)
 MAX_DELAY = 90                  # keeps Gmail happy
+
+# Account health — per-account limit and pace from the last ACCOUNT_HEALTH_DAYS
+ACCOUNT_HEALTH_DAYS = 14
+ACCOUNT_MIN_SAMPLE = 20         # fresh sends in the window before rates count
+BOUNCE_BACKOFF = 0.05           # bounce rate that halves the limit and doubles delays (more for each multiple)
+DEFERRAL_BACKOFF = 0.03         # share of attempts deferred (sender refused, DATA rejected, 421/451/452, 5.4.5) that does the same
+SENDER_PUSHBACK_CODES = (421, 451, 452)  # SMTP replies that mean "slow down", whatever step they come at
+HEALTHY_BOUNCE = 0.02           # at or under this with no deferrals: ramp one warmup tier early
+HEALTHY_REPLY = 0.03            # ...and a second tier early at this reply rate
+ACCOUNT_MIN_LIMIT = 3           # a backed-off account still sends this many
+
+# Per recipient mail provider (resolved from MX), all sender accounts together.
+# Sends to one provider are spaced evenly; others are interleaved in between.
+PROVIDER_SENDS_PER_HOUR = {"google": 20, "microsoft": 20}
+DEFAULT_PROVIDER_SENDS_PER_HOUR = 10
+PROVIDER_LOOKAHEAD = 40         # queued recipients MX-resolved ahead of sending
 MIN_SCORE = 40
 
+# Template choice — round-robin until every template has TEMPLATE_MIN_SENDS
+# fresh sends, then favour the better reply rate (campaign_stats)
+ADAPTIVE_TEMPLATES = True
+TEMPLATE_MIN_SENDS = 50
+REPORT_DAYS = 14                # days shown by --report
+
 # For backward compat — default sender
 SMTP_EMAIL = ACCOUNTS[0]["email"]
 SMTP_APP_PASSWORD = ACCOUNTS[0]["password"]
@@ -86,6 +110,10 @@ SMTP_APP_PASSWORD = ACCOUNTS[0]["password"]
 FOLLOWUP_1_DAYS = 3             # days after first email
 FOLLOWUP_2_DAYS = 7             # days after first email
 
+# Reply detection — replies are matched to the Message-IDs we sent
+REPLY_LOOKBACK_DAYS = 60        # sent messages whose replies are still searched for
+REPLY_SEARCH_BATCH = 25         # Message-IDs per IMAP SEARCH
+
 # Google Sheets (same sheet as lead gen, new tab)
 GOOGLE_CREDS_FILE = "service_account.json"
 GOOGLE_SHEET_URL = ""
@@ -181,6 +209,47 @@ def init_outreach_db():
                 followups_sent INTEGER DEFAULT 0
             )
         """)
+
+    # Message-ID of every email sent (fresh and follow-ups) for reply matching
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS sent_messages (
+            message_id TEXT PRIMARY KEY,
+            domain TEXT NOT NULL,
+            email TEXT NOT NULL,
+            account TEXT DEFAULT '',
+            kind TEXT NOT NULL,
+            sent_date TEXT NOT NULL
+        )
+    """)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_messages_lead ON sent_messages (domain, email)")
+
+    # SMTP push-back per sender account (see ACCOUNT HEALTH)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS smtp_deferrals (
+            event_date TEXT NOT NULL,
+            account TEXT NOT NULL,
+            recipient TEXT DEFAULT '',
+            code INTEGER,
+            detail TEXT DEFAULT ''
+        )
+    """)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_deferrals_account ON smtp_deferrals (account, event_date)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_sent_account ON sent_emails (sender_account, sent_date)")
+
+    # Materialized analytics — built once from sent_emails, then kept up to date
+    c.execute("SELECT 1 FROM sqlite_master WHERE name='campaign_stats'")
+    if not c.fetchone():
+        c.execute("""
+            CREATE TABLE campaign_stats (
+                dimension TEXT NOT NULL,
+                key TEXT NOT NULL,
+                sent INTEGER DEFAULT 0,
+                replied INTEGER DEFAULT 0,
+                bounced INTEGER DEFAULT 0,
+                PRIMARY KEY (dimension, key)
+            )
+        """)
+        rebuild_campaign_stats(conn)
     conn.commit()
     return conn
 
@@ -191,13 +260,18 @@ def already_emailed(conn, domain):
     return c.fetchone() is not None
 
 
-def log_sent(conn, domain, email, template_name, subject, company="", niche="", issues="", sender_account=""):
+def log_sent(conn, domain, email, template_name, subject, company="", niche="", issues="", sender_account="",
+             message_id=""):
     c = conn.cursor()
     c.execute("""
         INSERT OR IGNORE INTO sent_emails
         (domain, email, sent_date, template_used, subject, status, company, niche, issues, sender_account)
         VALUES (?, ?, ?, ?, ?, 'sent', ?, ?, ?, ?)
     """, (domain, email, TODAY, template_name, subject, company, niche, issues, sender_account))
+    if c.rowcount:
+        _bump_campaign_stats(c, _campaign_keys(template_name, subject, company, domain,
+                                               sender_account, TODAY), sent=1)
+    _log_message_id(c, message_id, domain, email, sender_account, "fresh")
     c.execute("""
         INSERT INTO outreach_stats (run_date, fresh_sent)
         VALUES (?, 1)
@@ -206,11 +280,12 @@ def log_sent(conn, domain, email, template_name, subject, company="", niche="",
     conn.commit()
 
 
-def log_followup(conn, domain, email, followup_num):
+def log_followup(conn, domain, email, followup_num, message_id="", sender_account=""):
     c = conn.cursor()
     col = f"followup_{followup_num}_date"
     c.execute(f"UPDATE sent_emails SET {col} = ? WHERE domain = ? AND email = ?",
               (TODAY, domain, email))
+    _log_message_id(c, message_id, domain, email, sender_account, f"followup_{followup_num}")
     c.execute("""
         INSERT INTO outreach_stats (run_date, followups_sent)
         VALUES (?, 1)
@@ -219,6 +294,14 @@ def log_followup(conn, domain, email, followup_num):
     conn.commit()
 
 
+def _log_message_id(c, message_id, domain, email, account, kind):
+    if message_id:
+        c.execute("""
+            INSERT OR IGNORE INTO sent_messages (message_id, domain, email, account, kind, sent_date)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (message_id, domain, email, account, kind, TODAY))
+
+
 def get_today_stats(conn):
     c = conn.cursor()
     c.execute("SELECT fresh_sent, followups_sent FROM outreach_stats WHERE run_date = ?", (TODAY,))
@@ -241,8 +324,10 @@ def get_followup_queue(conn, followup_num, days_after):
     col = f"followup_{followup_num}_date"
     c = conn.cursor()
     c.execute(f"""
-        SELECT domain, email, company, niche, issues, template_used, sender_account
-        FROM sent_emails
+        SELECT domain, email, company, niche, issues, template_used, sender_account,
+               (SELECT message_id FROM sent_messages m
+                WHERE m.domain = s.domain AND m.email = s.email AND m.kind = 'fresh')
+        FROM sent_emails s
         WHERE {col} IS NULL
           AND status = 'sent'
           AND sent_date <= ?
@@ -251,12 +336,46 @@ def get_followup_queue(conn, followup_num, days_after):
     return c.fetchall()
 
 
-def mark_replied(conn, domain):
-    """Mark a domain as replied — stops all follow-ups."""
+def count_followup_queue(conn, followup_num, days_after):
+    """Size of get_followup_queue() without fetching the rows (for --status)."""
+    cutoff = (date.today() - timedelta(days=days_after)).isoformat()
+    col = f"followup_{followup_num}_date"
     c = conn.cursor()
-    c.execute("UPDATE sent_emails SET status = 'replied' WHERE domain = ?", (domain,))
+    c.execute(f"""
+        SELECT COUNT(*) FROM sent_emails
+        WHERE {col} IS NULL
+          AND status = 'sent'
+          AND sent_date <= ?
+    """, (cutoff,))
+    return c.fetchone()[0]
+
+
+def set_status(conn, domain, status):
+    """Set every contact at `domain` to `status`, moving its campaign_stats counts along. Returns rows matched."""
+    c = conn.cursor()
+    c.execute("""
+        SELECT status, template_used, subject, company, sender_account, sent_date
+        FROM sent_emails WHERE domain = ?
+    """, (domain,))
+    rows = c.fetchall()
+    for old, template, subject, company, account, sent_date in rows:
+        if old == status:
+            continue
+        delta = {"replied": 0, "bounced": 0}
+        if old in delta:
+            delta[old] -= 1
+        if status in delta:
+            delta[status] += 1
+        _bump_campaign_stats(c, _campaign_keys(template, subject, company, domain, account, sent_date),
+                             **delta)
+    c.execute("UPDATE sent_emails SET status = ? WHERE domain = ?", (status, domain))
     conn.commit()
-    return c.rowcount > 0
+    return len(rows)
+
+
+def mark_replied(conn, domain):
+    """Mark a domain as replied — stops all follow-ups."""
+    return set_status(conn, domain, "replied") > 0
 
 
 def get_pending_followup_domains(conn):
@@ -266,56 +385,281 @@ def get_pending_followup_domains(conn):
     return {row[0] for row in c.fetchall()}
 
 
+def get_pending_message_ids(conn, account):
+    """{Message-ID: domain} for mail `account` sent to leads still in 'sent' status."""
+    cutoff = (date.today() - timedelta(days=REPLY_LOOKBACK_DAYS)).isoformat()
+    c = conn.cursor()
+    c.execute("""
+        SELECT m.message_id, m.domain FROM sent_messages m
+        JOIN sent_emails s ON s.domain = m.domain AND s.email = m.email
+        WHERE m.account = ? AND m.sent_date >= ? AND s.status = 'sent'
+    """, (account, cutoff))
+    return dict(c.fetchall())
+
+
+def get_tracked_domains(conn):
+    """Domains with at least one stored Message-ID."""
+    c = conn.cursor()
+    c.execute("SELECT DISTINCT domain FROM sent_messages")
+    return {row[0] for row in c.fetchall()}
+
+
+# ============================================================
+# CAMPAIGN ANALYTICS — per template / subject / account / day
+# ============================================================
+# Each fresh send adds 1 to `sent` under four keys: its template, its
+# subject variant, its sender account and the day it went out. Replies and
+# bounces are counted against the same four keys of the send that started
+# the thread (so day rows are send-day cohorts). log_sent() and
+# set_status() keep the counts current, so --report reads a few dozen rows
+# however large sent_emails grows.
+
+CAMPAIGN_DIMENSIONS = ("template", "subject", "account", "day")
+
+
+def subject_variant(subject, company="", domain=""):
+    """The subject line with the lead filled back out: 'Quick note about {company}'."""
+    if domain:
+        subject = subject.replace(domain, "{domain}")
+    if company:
+        subject = subject.replace(company, "{company}")
+    return subject
+
+
+def _campaign_keys(template, subject, company, domain, account, sent_date):
+    return (("template", template),
+            ("subject", subject_variant(subject, company, domain)),
+            ("account", account or ""),
+            ("day", sent_date))
+
+
+def _bump_campaign_stats(c, keys, sent=0, replied=0, bounced=0):
+    c.executemany("""
+        INSERT INTO campaign_stats (dimension, key, sent, replied, bounced)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(dimension, key) DO UPDATE SET
+            sent = sent + excluded.sent,
+            replied = replied + excluded.replied,
+            bounced = bounced + excluded.bounced
+    """, [(dim, key, sent, replied, bounced) for dim, key in keys])
+
+
+def rebuild_campaign_stats(conn):
+    """Recount campaign_stats from sent_emails (one full scan — run once when the table is created)."""
+    totals = {}
+    c = conn.cursor()
+    c.execute("SELECT template_used, subject, company, domain, sender_account, sent_date, status FROM sent_emails")
+    for template, subject, company, domain, account, sent_date, status in c.fetchall():
+        for key in _campaign_keys(template, subject, company, domain, account, sent_date):
+            row = totals.setdefault(key, [0, 0, 0])
+            row[0] += 1
+            row[1] += status == "replied"
+            row[2] += status == "bounced"
+    c.execute("DELETE FROM campaign_stats")
+    c.executemany("INSERT INTO campaign_stats (dimension, key, sent, replied, bounced) VALUES (?, ?, ?, ?, ?)",
+                  [(dim, key, *row) for (dim, key), row in totals.items()])
+    conn.commit()
+
+
+def get_campaign_stats(conn, dimension):
+    """[(key, sent, replied, bounced)] for one dimension, most sends first."""
+    c = conn.cursor()
+    c.execute("""
+        SELECT key, sent, replied, bounced FROM campaign_stats
+        WHERE dimension = ? ORDER BY sent DESC, key
+    """, (dimension,))
+    return c.fetchall()
+
+
+def print_campaign_report(conn):
+    titles = {"template": "Template", "subject": "Subject variant", "account": "Sender account", "day": "Send day"}
+    for dimension in CAMPAIGN_DIMENSIONS:
+        rows = get_campaign_stats(conn, dimension)
+        if dimension == "day":
+            rows = sorted(rows, reverse=True)[:REPORT_DAYS]
+        print(f"\n  {titles[dimension]:<44} {'Sent':>6} {'Replied':>9} {'Bounced':>9}")
+        print(f"  {'─'*70}")
+        if not rows:
+            print("  (nothing sent yet)")
+        for key, sent, replied, bounced in rows:
+            if not sent:
+                continue
+            label = key if len(key) <= 44 else key[:43] + "…"
+            print(f"  {label:<44} {sent:>6} {replied:>4} {replied / sent:>4.0%} {bounced:>4} {bounced / sent:>4.0%}")
+    print()
+
+
+def pick_template(conn, template_idx):
+    """
+    Round-robin over TEMPLATES until each has TEMPLATE_MIN_SENDS sends, then
+    draw from each template's reply rate (Beta posterior) and take the best
+    draw — the leader gets most sends, the others still get some.
+    """
+    if ADAPTIVE_TEMPLATES:
+        stats = {key: (sent, replied) for key, sent, replied, _ in get_campaign_stats(conn, "template")}
+        counts = [stats.get(TEMPLATE_NAMES[fn], (0, 0)) for fn in TEMPLATES]
+        if min(sent for sent, _ in counts) >= TEMPLATE_MIN_SENDS:
+            draws = [random.betavariate(replied + 1, max(sent - replied, 0) + 1) for sent, replied in counts]
+            return TEMPLATES[draws.index(max(draws))]
+    return TEMPLATES[template_idx % len(TEMPLATES)]
+
+
+# ============================================================
+# ACCOUNT HEALTH — per-account limit and pace from feedback
+# ============================================================
+# _account_warmup_limit() sets a limit from account age alone. plan_accounts()
+# adjusts it with each account's last ACCOUNT_HEALTH_DAYS of fresh sends.
+# Bounce and reply rates come from sent_emails; deferrals (sender refused, DATA
+# rejected, 421/451/452, 5.4.5 quota — never a refused recipient) come from
+# smtp_deferrals. Clean numbers ramp the
+# account a warmup tier early, two if leads reply. Going over BOUNCE_BACKOFF or
+# DEFERRAL_BACKOFF halves the limit and makes the account wait 2x the normal
+# delay between its own sends; 2x the threshold quarters it at 3x, 3x eighths
+# it at 4x. The other accounts keep sending at the normal pace meanwhile. A
+# deferral during a run rests the account until tomorrow.
+
+_account_limits = {}       # email -> fresh sends allowed today
+_account_sent_today = {}   # email -> fresh sends so far today
+_account_pace = {}         # email -> multiplier on the delay between its own sends
+_account_ready_at = {}     # email -> time.time() a backing-off account may send again
+_account_resting = set()   # deferred during this run — no more sends today
+
+
+def account_health(conn, email):
+    """Rolling {'sent', 'bounce', 'reply', 'deferral'} for one sender account."""
+    cutoff = (date.today() - timedelta(days=ACCOUNT_HEALTH_DAYS)).isoformat()
+    c = conn.cursor()
+    c.execute("""
+        SELECT COUNT(*), SUM(status = 'bounced'), SUM(status = 'replied')
+        FROM sent_emails WHERE sender_account = ? AND sent_date >= ?
+    """, (email, cutoff))
+    sent, bounced, replied = c.fetchone()
+    c.execute("SELECT COUNT(*) FROM smtp_deferrals WHERE account = ? AND event_date >= ?", (email, cutoff))
+    deferred = c.fetchone()[0]
+    return {"sent": sent,
+            "bounce": (bounced or 0) / max(sent, 1),
+            "reply": (replied or 0) / max(sent, 1),
+            "deferral": deferred / max(sent + deferred, 1)}
+
+
+def account_plan(conn, account):
+    """Today's {'limit', 'pace', 'state'} for one account, plus its account_health()."""
+    health = account_health(conn, account["email"])
+    limit = account.get("limit") or _account_warmup_limit(account["created"])
+    state, pace = "no track record", 1
+    if health["sent"] >= ACCOUNT_MIN_SAMPLE:
+        over = max(health["bounce"] / BOUNCE_BACKOFF, health["deferral"] / DEFERRAL_BACKOFF)
+        if over >= 1:
+            steps = min(int(over), 3)
+            state, pace = "backing off", 1 + steps
+            limit = max(ACCOUNT_MIN_LIMIT, limit >> steps)
+        elif health["bounce"] <= HEALTHY_BOUNCE and not health["deferral"]:
+            state = "healthy"
+            if not account.get("limit"):
+                tiers = 2 if health["reply"] >= HEALTHY_REPLY else 1
+                limit = _account_warmup_limit(account["created"], head_start=14 * tiers)
+        else:
+            state = "steady"
+    return {"limit": limit, "pace": pace, "state": state, **health}
+
+
+def plan_accounts(conn):
+    """Set today's limit and pace for every account in ACCOUNTS; returns {email: plan}."""
+    plans = {account["email"]: account_plan(conn, account) for account in ACCOUNTS}
+    c = conn.cursor()
+    c.execute("SELECT sender_account, COUNT(*) FROM sent_emails WHERE sent_date = ? GROUP BY sender_account",
+              (TODAY,))
+    sent_today = dict(c.fetchall())
+    for email, plan in plans.items():
+        _account_limits[email] = plan["limit"]
+        _account_sent_today[email] = sent_today.get(email, 0)
+        _account_pace[email] = plan["pace"]
+    return plans
+
+
+def fresh_capacity():
+    """Fresh sends left today across accounts that aren't resting."""
+    return sum(max(limit - _account_sent_today.get(email, 0), 0)
+               for email, limit in _account_limits.items() if email not in _account_resting)
+
+
+def _smtp_reply(exc):
+    """(code, enhanced status + text) from an smtplib exception, or (None, '')."""
+    code, detail = getattr(exc, "smtp_code", None), getattr(exc, "smtp_error", b"")
+    if isinstance(detail, bytes):
+        detail = detail.decode("utf-8", errors="ignore")
+    return code, " ".join(str(detail).split())
+
+
+def _note_deferral(conn, account_email, to_email, exc):
+    """
+    If `exc` is the provider pushing back on the sender, log it and rest the
+    account for today. A refused recipient is that recipient's problem, not
+    the account's, so it never counts.
+    """
+    import smtplib
+    code, detail = _smtp_reply(exc)
+    if not isinstance(code, int):
+        return False
+    if not (isinstance(exc, (smtplib.SMTPSenderRefused, smtplib.SMTPDataError))
+            or code in SENDER_PUSHBACK_CODES or detail.startswith("5.4.5")):
+        return False
+    print(f"  [!] {account_email} deferred ({code} {detail[:60]}) — resting it for today")
+    _account_resting.add(account_email)
+    if conn is not None:
+        conn.execute("INSERT INTO smtp_deferrals (event_date, account, recipient, code, detail) VALUES (?, ?, ?, ?, ?)",
+                     (TODAY, account_email, to_email, code, detail[:200]))
+        conn.commit()
+    return True
+
+
+def format_plan(email, plan):
+    return (f"{email}: {plan['limit']}/day, {plan['state']}"
+            + (f" — {plan['bounce']:.1%} bounced, {plan['deferral']:.1%} deferred, "
+               f"{plan['reply']:.1%} replied over {plan['sent']} sends" if plan["sent"] else ""))
+
+
 # ============================================================
 # REPLY DETECTION VIA IMAP
 # ============================================================
 
 def check_replies_imap(conn, dry_run=False):
     """
-    Connect to Gmail via IMAP for EVERY sender account, scan inbox for
-    replies from lead domains.  Auto-marks any replied domains in the DB.
+    Connect to Gmail via IMAP for EVERY sender account and find replies to
+    the emails it sent.  Auto-marks any replied domains in the DB.
     Returns set of domains that replied.
+
+    Replies are matched exactly: the server searches In-Reply-To and
+    References for our stored Message-IDs, so a reply from a personal
+    address still counts and only matching messages are downloaded.
+    Leads emailed before Message-IDs were stored are matched by the
+    From domain of recent mail, as before.
     """
     pending_domains = get_pending_followup_domains(conn)
     if not pending_domains:
         return set()
 
+    import imaplib
     replied = set()
+    untracked = pending_domains - get_tracked_domains(conn)
+    # Search for emails received in the last 14 days
+    since_date = (date.today() - timedelta(days=14)).strftime("%d-%b-%Y")
 
     for account in ACCOUNTS:
         acct_email = account["email"]
         acct_password = account["password"]
+        pending_ids = get_pending_message_ids(conn, acct_email)
+        if not pending_ids and not untracked:
+            continue
         try:
             mail = imaplib.IMAP4_SSL("imap.gmail.com")
             mail.login(acct_email, acct_password)
             mail.select("INBOX", readonly=True)
 
-            # Search for emails received in the last 14 days
-            since_date = (date.today() - timedelta(days=14)).strftime("%d-%b-%Y")
-            status, messages = mail.search(None, f'(SINCE "{since_date}")')
-
-            if status != "OK" or not messages[0]:
-                mail.logout()
-                continue
-
-            msg_ids = messages[0].split()
-            # Check latest 500 messages max per account to keep it fast
-            for msg_id in msg_ids[-500:]:
-                try:
-                    status, data = mail.fetch(msg_id, "(BODY[HEADER.FIELDS (FROM)])")
-                    if status != "OK":
-                        continue
-                    raw_from = data[0][1].decode("utf-8", errors="ignore")
-                    # Extract email domain from From header
-                    from_match = re.search(r'[\w.+-]+@([\w.-]+)', raw_from)
-                    if not from_match:
-                        continue
-                    from_domain = from_match.group(1).lower()
-                    # Check if this sender's domain matches any pending lead
-                    if from_domain in pending_domains:
-                        replied.add(from_domain)
-                except Exception:
-                    continue
+            if pending_ids:
+                replied |= _search_replies_by_message_id(mail, pending_ids, since_date)
+            if untracked:
+                replied |= _scan_reply_senders(mail, untracked, since_date)
 
             mail.logout()
         except imaplib.IMAP4.error as e:
@@ -335,6 +679,60 @@ def check_replies_imap(conn, dry_run=False):
     return replied
 
 
+def _search_replies_by_message_id(mail, pending_ids, since_date):
+    """Domains whose Message-IDs appear in In-Reply-To / References of recent inbox mail."""
+    found = set()
+    message_ids = list(pending_ids)
+    for start in range(0, len(message_ids), REPLY_SEARCH_BATCH):
+        batch = message_ids[start:start + REPLY_SEARCH_BATCH]
+        terms = [f'HEADER {field} "{mid}"' for mid in batch for field in ("In-Reply-To", "References")]
+        # IMAP OR is binary and prefix: "OR OR a b c" = (a OR b) OR c
+        query = " ".join(["OR"] * (len(terms) - 1) + terms)
+        status, data = mail.uid("SEARCH", None, f'SINCE "{since_date}" ({query})')
+        if status != "OK" or not data[0]:
+            continue
+        uids = b",".join(data[0].split()).decode()
+        status, data = mail.uid("FETCH", uids, "(BODY.PEEK[HEADER.FIELDS (IN-REPLY-TO REFERENCES)])")
+        if status != "OK":
+            continue
+        for part in data:
+            if not isinstance(part, tuple):
+                continue
+            headers = part[1].decode("utf-8", errors="ignore")
+            for mid in re.findall(r"<[^<>\s]+>", headers):
+                if mid in pending_ids:
+                    found.add(pending_ids[mid])
+    return found
+
+
+def _scan_reply_senders(mail, domains, since_date):
+    """Domains in `domains` that sent recent inbox mail (latest 500 messages, From header only)."""
+    found = set()
+    status, messages = mail.search(None, f'(SINCE "{since_date}")')
+    if status != "OK" or not messages[0]:
+        return found
+
+    msg_ids = messages[0].split()
+    # Check latest 500 messages max per account to keep it fast
+    for msg_id in msg_ids[-500:]:
+        try:
+            status, data = mail.fetch(msg_id, "(BODY[HEADER.FIELDS (FROM)])")
+            if status != "OK":
+                continue
+            raw_from = data[0][1].decode("utf-8", errors="ignore")
+            # Extract email domain from From header
+            from_match = re.search(r'[\w.+-]+@([\w.-]+)', raw_from)
+            if not from_match:
+                continue
+            from_domain = from_match.group(1).lower()
+            # Check if this sender's domain matches any pending lead
+            if from_domain in domains:
+                found.add(from_domain)
+        except Exception:
+            continue
+    return found
+
+
 def check_bounces_imap(conn, dry_run=False):
     """
     Scan ALL sender account inboxes for bounce/delivery-failure notifications.
@@ -345,6 +743,7 @@ def check_bounces_imap(conn, dry_run=False):
     if not pending_domains:
         return set()
 
+    import imaplib
     bounced = set()
 
     for account in ACCOUNTS:
@@ -394,9 +793,7 @@ def check_bounces_imap(conn, dry_run=False):
     # Mark bounced domains
     for domain in bounced:
         if not dry_run:
-            c = conn.cursor()
-            c.execute("UPDATE sent_emails SET status = 'bounced' WHERE domain = ?", (domain,))
-            conn.commit()
+            set_status(conn, domain, "bounced")
         print(f"  [BOUNCE] {domain} bounced — removed from follow-up queue")
 
     return bounced
@@ -414,6 +811,11 @@ def init_outreach_sheets():
     if not os.path.exists(creds_path):
         print("  [i] No service_account.json — Sheets disabled")
         return
+    try:
+        import gspread
+    except ImportError:
+        print("  [✗] gspread not installed — run: pip install gspread")
+        return
 
     try:
         gc = gspread.service_account(filename=creds_path)
@@ -453,7 +855,67 @@ def push_to_sheets(date_str, domain, company, email, template, email_type, subje
 # EMAIL TEMPLATES — AI Automation for Dentists
 # ============================================================
 
-def pick_top_issues(issues_str, max_issues=3):
+# ── Gap codes (emitted by ai_leads.audit_domain, stored in the CSV Gap_Codes column) ──
+# Phrases and tips (ISSUE_PHRASES / ISSUE_TIPS) live in signal_rules.py, next to
+# the rule that detects each gap
+
+# Descriptions ai_leads wrote to Automation_Gaps before it emitted codes
+LEGACY_GAP_TEXT = {
+    "no online booking system":         "no_booking",
+    "no chatbot or live chat":          "no_chatbot",
+    "no automated review system":       "no_reviews",
+    "no patient portal":                "no_portal",
+    "no sms or text capability":        "no_sms",
+    "phone-only appointment booking":   "phone_only",
+    "still uses paper/printable forms": "paper_forms",
+    "no email marketing automation":    "no_email_mktg",
+}
+
+_issue_code_cache = {}  # free-text gap description -> code (or None)
+
+
+def issue_code(issue):
+    """
+    Map an issue to its gap code. Codes pass straight through; free-text
+    descriptions (CSVs written before Gap_Codes existed) are classified once
+    and cached, since every lead with the same gap text gets the same answer.
+    """
+    if issue in ISSUE_PHRASES:
+        return issue
+    if issue in _issue_code_cache:
+        return _issue_code_cache[issue]
+
+    i_lower = issue.lower()
+    if i_lower in LEGACY_GAP_TEXT:
+        code = LEGACY_GAP_TEXT[i_lower]
+    elif "booking" in i_lower or "appointment" in i_lower:
+        code = "no_booking"
+    elif "chatbot" in i_lower or "chat" in i_lower:
+        code = "no_chatbot"
+    elif "review" in i_lower:
+        code = "no_reviews"
+    elif "portal" in i_lower:
+        code = "no_portal"
+    elif "sms" in i_lower or "text" in i_lower:
+        code = "no_sms"
+    elif "phone-only" in i_lower or "call" in i_lower:
+        code = "phone_only"
+    elif "paper" in i_lower or "print" in i_lower:
+        code = "paper_forms"
+    elif "email marketing" in i_lower:
+        code = "no_email_mktg"
+    else:
+        code = None
+    _issue_code_cache[issue] = code
+    return code
+
+
+def pick_top_issues(issues_str, max_issues=3, gap_codes=""):
+    """Top issues for a lead — gap codes when the CSV has them, else the legacy text."""
+    if gap_codes:
+        codes = [c for c in gap_codes.split(";") if c]
+        if codes:
+            return codes[:max_issues]
     if not issues_str:
         return ["some technical issues"]
     issues = [i.strip() for i in issues_str.split(";") if i.strip()]
@@ -515,27 +977,7 @@ def format_issues_list(issues):
     if not issues:
         return "a few areas where things could run more smoothly"
     
-    cleaned = []
-    for issue in issues:
-        i_lower = issue.lower()
-        if "booking" in i_lower or "appointment" in i_lower:
-            cleaned.append("how patients book appointments")
-        elif "chatbot" in i_lower or "chat" in i_lower:
-            cleaned.append("after-hours patient communication")
-        elif "review" in i_lower:
-            cleaned.append("how you're collecting patient reviews")
-        elif "portal" in i_lower:
-            cleaned.append("patient access to their records")
-        elif "sms" in i_lower or "text" in i_lower:
-            cleaned.append("text-based communication with patients")
-        elif "phone-only" in i_lower or "call" in i_lower:
-            cleaned.append("the booking flow relying entirely on phone calls")
-        elif "paper" in i_lower or "print" in i_lower:
-            cleaned.append("intake forms that still need to be printed")
-        elif "email marketing" in i_lower:
-            cleaned.append("staying in touch with patients between visits")
-        else:
-            cleaned.append("some workflow gaps")
+    cleaned = [ISSUE_PHRASES.get(issue_code(issue), "some workflow gaps") for issue in issues]
 
     cleaned = list(dict.fromkeys(cleaned))
     
@@ -702,24 +1144,16 @@ I've helped other practices sort this out and it's usually a pretty painless pro
 
 def get_actionable_tip(issue):
     """Return a conversational, non-technical tip for a specific automation gap."""
-    issue_lower = issue.lower()
-    tips = {
-        "no online booking": "Right now it looks like patients have to call in to schedule. Most practices that add online booking see a noticeable bump in new patient appointments, especially from people searching after hours.",
-        "no chatbot": "There's no way for patients to get quick answers when your office is closed. A simple automated chat can handle the most common questions and capture leads overnight.",
-        "no automated review": "It looks like you're not automatically asking patients for reviews after visits. The practices that do this consistently tend to build their Google rating much faster.",
-        "no patient portal": "Patients don't seem to have a way to access their info online. A simple portal for forms, records, and appointment history tends to reduce front desk calls significantly.",
-        "no sms": "Text messaging is becoming the default way patients want to communicate. Automated appointment reminders via text alone can cut no-shows by a third or more.",
-        "phone-only": "Right now everything goes through the phone, which means your front desk is the bottleneck. Giving patients other ways to book and communicate takes a lot of pressure off your team.",
-        "paper": "It looks like intake forms still need to be printed and filled out. Digital forms that patients complete on their phone before they arrive save everyone time and reduce errors.",
-        "no email marketing": "There doesn't appear to be any automated patient communication between visits. Even basic things like recall reminders and birthday messages help with retention.",
-    }
-    for key, tip in tips.items():
-        if key in issue_lower:
-            return tip
+    tip = ISSUE_TIPS.get(issue_code(issue))
+    if tip:
+        return tip
     return f"I noticed {issue} at your practice. It's a common gap that's usually straightforward to address."
 
 
 TEMPLATES = [template_quick_audit, template_competitor_angle, template_helpful_tip]
+# Name each template records in sent_emails.template_used / campaign_stats
+TEMPLATE_NAMES = {template_quick_audit: "quick_audit", template_competitor_angle: "competitor",
+                  template_helpful_tip: "helpful_tip"}
 
 
 # ── Follow-up templates ──────────────────────────────────────
@@ -817,6 +1251,7 @@ def _get_smtp_for(account):
     except Exception:
         _smtp_pool.pop(email, None)
 
+    import smtplib
     server = smtplib.SMTP(SMTP_HOST, SMTP_PORT)
     server.ehlo()
     server.starttls()
@@ -825,13 +1260,48 @@ def _get_smtp_for(account):
     _smtp_pool[email] = server
     return server
 
-def _next_sender():
-    """Round-robin: pick the next sender account."""
+def _next_sender(dry_run=False):
+    """
+    Round-robin: pick the next sender account that is under today's limit
+    (None if none is). A backing-off account is skipped until its own delay
+    is up; only when every account left is waiting does this wait too.
+    """
     global _sender_idx
-    account = ACCOUNTS[_sender_idx % len(ACCOUNTS)]
-    _sender_idx += 1
+    waiting = []
+    for _ in range(len(ACCOUNTS)):
+        account = ACCOUNTS[_sender_idx % len(ACCOUNTS)]
+        _sender_idx += 1
+        email = account["email"]
+        if email in _account_resting:
+            continue
+        if email not in _account_limits or _account_sent_today.get(email, 0) < _account_limits[email]:
+            if _account_ready_at.get(email, 0) <= time.time():
+                return account
+            waiting.append(account)
+    if not waiting:
+        return None
+    account = min(waiting, key=lambda a: _account_ready_at[a["email"]])
+    _wait_for_account(account["email"], dry_run)
     return account
 
+
+def _note_account_send(email, dry_run=False):
+    """After a send from `email`: a backing-off account sits out `pace` normal delays."""
+    pace = _account_pace.get(email, 1)
+    if pace > 1 and not dry_run:
+        _account_ready_at[email] = time.time() + pace * _send_delay()
+
+
+def _wait_for_account(email, dry_run=False):
+    """Sleep until a backing-off account may send again (a dry run doesn't wait)."""
+    at = _account_ready_at.get(email, 0)
+    if at > time.time() and not dry_run:
+        delay = int(at - time.time()) + 1
+        print(f"  ⏳ Waiting {delay}s for {email} (backing off)...", end="", flush=True)
+        time.sleep(delay)
+        print(" go")
+
+
 def close_smtp():
     """Close all persistent SMTP connections."""
     for email, conn in list(_smtp_pool.items()):
@@ -850,9 +1320,29 @@ def _find_account_by_email(sender_email):
     return ACCOUNTS[0]
 
 
-def _do_send(account, to_email, subject, body, dry_run=False):
-    """Core send logic — sends via a specific account."""
+def _build_message(sender_email, to_email, subject, body, message_id, in_reply_to=None):
+    from email.mime.text import MIMEText
+    msg = MIMEText(body, "plain", "utf-8")
+    msg["From"] = f"{YOUR_NAME} <{sender_email}>"
+    msg["To"] = to_email
+    msg["Subject"] = subject
+    msg["Message-ID"] = message_id
+    if in_reply_to:
+        # Thread follow-ups under the first email; replies then reference both
+        msg["In-Reply-To"] = in_reply_to
+        msg["References"] = in_reply_to
+    return msg
+
+
+def _do_send(account, to_email, subject, body, dry_run=False, conn=None, in_reply_to=None):
+    """
+    Core send logic — sends via a specific account. Returns the new
+    Message-ID on success (stored for reply matching), False on failure.
+    Deferrals are logged to `conn`.
+    """
+    from email.utils import make_msgid
     sender_email = account["email"]
+    message_id = make_msgid(domain=sender_email.split("@")[-1])
 
     if dry_run:
         tag = f" [{sender_email.split('@')[0]}]" if len(ACCOUNTS) > 1 else ""
@@ -863,17 +1353,14 @@ def _do_send(account, to_email, subject, body, dry_run=False):
         print(f"{'─'*50}")
         print(body)
         print(f"{'─'*50}\n")
-        return True
+        return message_id
 
+    import smtplib
     try:
-        msg = MIMEText(body, "plain", "utf-8")
-        msg["From"] = f"{YOUR_NAME} <{sender_email}>"
-        msg["To"] = to_email
-        msg["Subject"] = subject
-
+        msg = _build_message(sender_email, to_email, subject, body, message_id, in_reply_to)
         server = _get_smtp_for(account)
         server.sendmail(sender_email, to_email, msg.as_string())
-        return True
+        return message_id
     except smtplib.SMTPRecipientsRefused:
         print(f"  [✗] Recipient refused: {to_email}")
         return False
@@ -881,46 +1368,72 @@ def _do_send(account, to_email, subject, body, dry_run=False):
         print(f"  [✗] SMTP auth failed for {sender_email} — check app password")
         return False
     except (smtplib.SMTPServerDisconnected, smtplib.SMTPSenderRefused) as e:
+        if _note_deferral(conn, sender_email, to_email, e):
+            return False
         # Connection died — reconnect and retry once
         _smtp_pool.pop(sender_email, None)
         try:
             server = _get_smtp_for(account)
-            msg = MIMEText(body, "plain", "utf-8")
-            msg["From"] = f"{YOUR_NAME} <{sender_email}>"
-            msg["To"] = to_email
-            msg["Subject"] = subject
+            msg = _build_message(sender_email, to_email, subject, body, message_id, in_reply_to)
             server.sendmail(sender_email, to_email, msg.as_string())
-            return True
+            return message_id
         except Exception as e2:
-            print(f"  [✗] Send failed after reconnect: {e2}")
+            if not _note_deferral(conn, sender_email, to_email, e2):
+                print(f"  [✗] Send failed after reconnect: {e2}")
             return False
     except Exception as e:
-        print(f"  [✗] Send failed: {e}")
+        if not _note_deferral(conn, sender_email, to_email, e):
+            print(f"  [✗] Send failed: {e}")
         return False
 
 
-def send_email(to_email, subject, body, dry_run=False):
-    """Send a fresh email — rotates sender via round-robin. Returns (success, sender_email)."""
-    account = _next_sender()
-    ok = _do_send(account, to_email, subject, body, dry_run)
+def send_email(to_email, subject, body, dry_run=False, conn=None):
+    """Send a fresh email — rotates sender via round-robin. Returns (Message-ID or False, sender_email).
+
+    sender_email is None when every account is at today's limit or resting.
+    """
+    account = _next_sender(dry_run)
+    if account is None:
+        return False, None
+    ok = _do_send(account, to_email, subject, body, dry_run, conn)
+    if ok:
+        _account_sent_today[account["email"]] = _account_sent_today.get(account["email"], 0) + 1
+        _note_account_send(account["email"], dry_run)
     return ok, account["email"]
 
 
-def send_email_from(sender_email, to_email, subject, body, dry_run=False):
-    """Send a follow-up from a specific account (the one that sent the original)."""
+def send_email_from(sender_email, to_email, subject, body, dry_run=False, conn=None, in_reply_to=None):
+    """Send a follow-up from a specific account (the one that sent the original), threaded under `in_reply_to`.
+
+    Returns (Message-ID or False, sender_email) — the account actually used,
+    which is the primary one when `sender_email` is no longer configured.
+    """
     account = _find_account_by_email(sender_email)
-    return _do_send(account, to_email, subject, body, dry_run)
+    if account["email"] in _account_resting:
+        print(f"  [–] {account['email']} is resting today — follow-up waits")
+        return False, account["email"]
+    # The thread stays with its account, so a backing-off one is waited for
+    _wait_for_account(account["email"], dry_run)
+    message_id = _do_send(account, to_email, subject, body, dry_run, conn, in_reply_to)
+    if message_id:
+        _note_account_send(account["email"], dry_run)
+    return message_id, account["email"]
+
+
+def _send_delay():
+    """Seconds to wait between sends — variance keeps Gmail from flagging us."""
+    # Base random delay
+    base = random.randint(MIN_DELAY, MAX_DELAY)
+    # Add extra jitter: ±15s so the pattern is never predictable
+    jitter = random.randint(-15, 15)
+    return max(20, base + jitter)
 
 
 def wait_between_emails(dry_run):
-    """Random delay between sends — variance keeps Gmail from flagging us."""
+    """Random delay between sends, the same whichever account sent (see _note_account_send)."""
     if dry_run:
         return
-    # Base random delay
-    base = random.randint(MIN_DELAY, MAX_DELAY)
-    # Add extra jitter: ±15s so the pattern is never predictable
-    jitter = random.randint(-15, 15)
-    delay = max(20, base + jitter)
+    delay = _send_delay()
     print(f"  ⏳ Waiting {delay}s...", end="", flush=True)
     time.sleep(delay)
     print(" go")
@@ -931,11 +1444,9 @@ def wait_between_emails(dry_run):
 # ============================================================
 
 # ── Pre-send MX verification ────────────────────────────────
-_mx_cache = {}
+_mx_cache = {}   # domain -> (can receive mail, MX hosts best-first)
 
-def _check_mx(email_addr):
-    """Quick MX check — returns True if the email domain can receive mail."""
-    domain = email_addr.split("@")[-1].lower()
+def _resolve_mx(domain):
     if domain in _mx_cache:
         return _mx_cache[domain]
 
@@ -943,23 +1454,117 @@ def _check_mx(email_addr):
     try:
         import dns.resolver
         answers = dns.resolver.resolve(domain, 'MX')
-        valid = len(answers) > 0
-        _mx_cache[domain] = valid
-        return valid
+        hosts = [str(r.exchange).rstrip(".").lower() for r in sorted(answers, key=lambda r: r.preference)]
+        _mx_cache[domain] = (len(answers) > 0, hosts)
+        return _mx_cache[domain]
     except ImportError:
         pass
     except Exception:
-        _mx_cache[domain] = False
-        return False
+        _mx_cache[domain] = (False, [])
+        return _mx_cache[domain]
 
     # Fallback: check if domain resolves at all on port 25
     try:
         socket.getaddrinfo(domain, 25, socket.AF_INET, socket.SOCK_STREAM)
-        _mx_cache[domain] = True
-        return True
+        _mx_cache[domain] = (True, [])
     except socket.gaierror:
-        _mx_cache[domain] = False
-        return False
+        _mx_cache[domain] = (False, [])
+    return _mx_cache[domain]
+
+
+def _check_mx(email_addr):
+    """Quick MX check — returns True if the email domain can receive mail."""
+    return _resolve_mx(email_addr.split("@")[-1].lower())[0]
+
+
+# ── Send scheduling by recipient mail provider ──────────────
+# Practices cluster on a few mail hosts. Sending in score order can put ten
+# emails in a row into Google Workspace, which answers with deferrals and
+# spam-foldering. The queue is grouped by the provider behind each
+# recipient's best MX and drained best-first among the providers that are
+# under their PROVIDER_SENDS_PER_HOUR spacing.
+
+# MX host suffix -> provider
+MX_PROVIDERS = {
+    "google.com": "google", "googlemail.com": "google",
+    "outlook.com": "microsoft", "hotmail.com": "microsoft",
+    "pphosted.com": "proofpoint", "ppe-hosted.com": "proofpoint",
+    "mimecast.com": "mimecast", "barracudanetworks.com": "barracuda",
+    "secureserver.net": "godaddy", "emailsrvr.com": "rackspace",
+    "zoho.com": "zoho", "yahoodns.net": "yahoo", "icloud.com": "apple",
+}
+
+_provider_last_send = {}   # provider -> time of the last send to it
+
+
+def mx_provider(email_addr):
+    """'google', 'microsoft', ... for known hosts; otherwise the best MX host's domain."""
+    domain = email_addr.split("@")[-1].lower()
+    hosts = _resolve_mx(domain)[1]
+    if not hosts:
+        return domain
+    host = hosts[0]
+    for suffix, name in MX_PROVIDERS.items():
+        if host == suffix or host.endswith("." + suffix):
+            return name
+    labels = host.split(".")
+    keep = 3 if len(labels) > 2 and len(labels[-1]) == 2 and labels[-2] in ("co", "com", "net", "org") else 2
+    return ".".join(labels[-keep:])
+
+
+def provider_ready_at(provider):
+    """Earliest time.time() the next email may go to `provider`."""
+    last = _provider_last_send.get(provider)
+    if last is None:
+        return 0
+    return last + 3600 / PROVIDER_SENDS_PER_HOUR.get(provider, DEFAULT_PROVIDER_SENDS_PER_HOUR)
+
+
+def interleave_by_provider(items, email_of, dry_run=False):
+    """
+    Yield (provider, item) from `items` (best first): the best queued item
+    whose provider is ready, or — when none is — the first to become ready,
+    after waiting for it. A dry run records the wait without sleeping, so it
+    previews the real order.
+    """
+    items = iter(items)
+    buckets = {}    # provider -> deque of (position, item)
+    queued = position = 0
+    while True:
+        for item in items:
+            buckets.setdefault(mx_provider(email_of(item)), deque()).append((position, item))
+            position += 1
+            queued += 1
+            if queued >= PROVIDER_LOOKAHEAD:
+                break
+        if not queued:
+            return
+        now = time.time()
+        heads = [(max(provider_ready_at(p), now), q[0][0], p) for p, q in buckets.items() if q]
+        ready = [head for head in heads if head[0] <= now]
+        at, _, provider = min(ready, key=lambda head: head[1]) if ready else min(heads)
+        if at > now and not dry_run:
+            delay = int(at - now) + 1
+            print(f"  ⏳ Waiting {delay}s for {provider} (per-provider limit)...", end="", flush=True)
+            time.sleep(delay)
+            print(" go")
+            at = time.time()
+        _provider_last_send[provider] = at
+        queued -= 1
+        yield provider, buckets[provider].popleft()[1]
+
+
+def deliverable_leads(leads):
+    """(lead, email) for leads with an address whose domain has working MX; prints the skips."""
+    for lead in leads:
+        email_to = lead.get("Email", "").split(";")[0].strip()
+        if not email_to or "@" not in email_to:
+            continue
+        # Pre-send MX check — skip bad domains before wasting a send
+        if not _check_mx(email_to):
+            print(f"  [skip] {lead.get('Domain', '')} — bad MX for {email_to.split('@')[-1]}")
+            continue
+        yield lead, email_to
 
 def find_all_csvs():
     """Find all ai_leads CSVs, newest first."""
@@ -1026,6 +1631,7 @@ def main():
     followups_only = "--followups-only" in args
     replied_domain = None
     show_status = "--status" in args
+    show_report = "--report" in args
 
     for i, arg in enumerate(args):
         if arg == "--test" and i + 1 < len(args):
@@ -1045,16 +1651,23 @@ def main():
         conn.close()
         return
 
+    # Handle --report command
+    if show_report:
+        conn = init_outreach_db()
+        print("\n  Campaign Report — sends, replies and bounces")
+        print_campaign_report(conn)
+        conn.close()
+        return
+
     # Handle --status command
     if show_status:
         conn = init_outreach_db()
         totals = get_total_sent(conn)
         stats = get_today_stats(conn)
-        fu1 = get_followup_queue(conn, 1, FOLLOWUP_1_DAYS)
-        fu2 = get_followup_queue(conn, 2, FOLLOWUP_2_DAYS)
-        c = conn.cursor()
-        c.execute("SELECT COUNT(*) FROM sent_emails WHERE status = 'replied'")
-        replied_count = c.fetchone()[0]
+        fu1 = count_followup_queue(conn, 1, FOLLOWUP_1_DAYS)
+        fu2 = count_followup_queue(conn, 2, FOLLOWUP_2_DAYS)
+        replied_count = sum(replied for _, _, replied, _ in get_campaign_stats(conn, "account"))
+        plans = {account["email"]: account_plan(conn, account) for account in ACCOUNTS}
         conn.close()
         print(f"\n  Campaign Stats")
         print(f"  {'─'*30}")
@@ -1062,8 +1675,13 @@ def main():
         print(f"  All-time followups: {totals['followups']}")
         print(f"  Replied:           {replied_count}")
         print(f"  Today:             {stats['fresh']} fresh + {stats['followups']} FU")
-        print(f"  FU #1 queue:       {len(fu1)} leads ready")
-        print(f"  FU #2 queue:       {len(fu2)} leads ready\n")
+        print(f"  FU #1 queue:       {fu1} leads ready")
+        print(f"  FU #2 queue:       {fu2} leads ready")
+        print(f"\n  Sender Accounts (last {ACCOUNT_HEALTH_DAYS} days)")
+        print(f"  {'─'*30}")
+        for email, plan in plans.items():
+            print(f"  {format_plan(email, plan)}")
+        print()
         return
 
     print("=" * 60)
@@ -1112,6 +1730,11 @@ def main():
         if not replied_domains and not bounced_domains:
             print(f"  [✓] No replies or bounces detected")
 
+    # Per-account limits and pace from bounce / deferral / reply history
+    plans = plan_accounts(conn)
+    for email, plan in plans.items():
+        print(f"  [{'!' if plan['state'] == 'backing off' else '✓'}] {format_plan(email, plan)}")
+
     # ─── FOLLOW-UPS ───
     followups_sent = 0
     if not fresh_only and not test_email:
@@ -1130,38 +1753,28 @@ def main():
             print(f"  [i] Follow-up #1 queue: {len(fu1_queue)} leads (day {FOLLOWUP_1_DAYS})")
             print(f"  [i] Follow-up #2 queue: {len(fu2_queue)} leads (day {FOLLOWUP_2_DAYS})")
 
-            # Send follow-up #2 first (older leads, more urgent)
-            for domain, email, company, niche, issues_str, orig_template, orig_sender in fu2_queue:
-                if followups_sent >= fu_remaining:
+            # Follow-up #2 first (older leads, more urgent), interleaved by mail provider
+            fu_queue = [(2, row) for row in fu2_queue] + [(1, row) for row in fu1_queue]
+            # Check the quota before pulling the next one — pulling may wait on a provider
+            queue = interleave_by_provider(fu_queue, lambda q: q[1][1], dry_run)
+            while followups_sent < fu_remaining:
+                nxt = next(queue, None)
+                if nxt is None:
                     break
+                provider, (num, row) = nxt
+                domain, email, company, niche, issues_str, orig_template, orig_sender, thread_id = row
                 name = guess_first_name(email)
-                subject, body, tmpl = followup_2_template(name, domain, company, niche)
+                followup_template = followup_2_template if num == 2 else followup_1_template
+                subject, body, tmpl = followup_template(name, domain, company, niche)
 
-                print(f"  [FU2] {company or domain} → {email} (via {orig_sender.split('@')[0] if orig_sender else 'primary'})")
-                ok = send_email_from(orig_sender or ACCOUNTS[0]['email'], email, subject, body, dry_run=dry_run)
-                if ok:
+                print(f"  [FU{num}] {company or domain} → {email} (via {orig_sender.split('@')[0] if orig_sender else 'primary'}, MX {provider})")
+                message_id, sender_used = send_email_from(orig_sender, email, subject, body, dry_run=dry_run,
+                                                          conn=conn, in_reply_to=thread_id)
+                if message_id:
                     followups_sent += 1
                     if not dry_run:
-                        log_followup(conn, domain, email, 2)
-                    push_to_sheets(TODAY, domain, company, email, tmpl, "follow-up #2", subject)
-                    print(f"    ✓ {'Previewed' if dry_run else 'Sent'}")
-                    if followups_sent < fu_remaining:
-                        wait_between_emails(dry_run)
-
-            # Send follow-up #1
-            for domain, email, company, niche, issues_str, orig_template, orig_sender in fu1_queue:
-                if followups_sent >= fu_remaining:
-                    break
-                name = guess_first_name(email)
-                subject, body, tmpl = followup_1_template(name, domain, company, niche)
-
-                print(f"  [FU1] {company or domain} → {email} (via {orig_sender.split('@')[0] if orig_sender else 'primary'})")
-                ok = send_email_from(orig_sender or ACCOUNTS[0]['email'], email, subject, body, dry_run=dry_run)
-                if ok:
-                    followups_sent += 1
-                    if not dry_run:
-                        log_followup(conn, domain, email, 1)
-                    push_to_sheets(TODAY, domain, company, email, tmpl, "follow-up #1", subject)
+                        log_followup(conn, domain, email, num, message_id=message_id, sender_account=sender_used)
+                    push_to_sheets(TODAY, domain, company, email, tmpl, f"follow-up #{num}", subject)
                     print(f"    ✓ {'Previewed' if dry_run else 'Sent'}")
                     if followups_sent < fu_remaining:
                         wait_between_emails(dry_run)
@@ -1174,7 +1787,7 @@ def main():
     fresh_sent = 0
     if not followups_only:
         print("\n[4/4] Fresh emails...")
-        fresh_remaining = min(FRESH_DAILY_LIMIT - stats['fresh'],
+        fresh_remaining = min(fresh_capacity(),
                              TOTAL_DAILY_CAP - total_today - followups_sent)
 
         if fresh_remaining <= 0:
@@ -1201,7 +1814,8 @@ def main():
                     # Test mode
                     if test_email:
                         lead = leads[0]
-                        issues = pick_top_issues(lead.get("Automation_Gaps", ""))
+                        issues = pick_top_issues(lead.get("Automation_Gaps", ""),
+                                                 gap_codes=lead.get("Gap_Codes", ""))
                         template_fn = random.choice(TEMPLATES)
                         subject, body, template_name = template_fn(lead, issues)
                         print(f"\n  [TEST] Template: {template_name}")
@@ -1218,40 +1832,37 @@ def main():
                     print(f"\n  Sending {min(fresh_remaining, len(leads))} fresh emails...\n")
                     template_idx = 0
 
-                    for lead in leads:
-                        if fresh_sent >= fresh_remaining:
+                    queue = interleave_by_provider(deliverable_leads(leads), lambda q: q[1], dry_run)
+                    while fresh_sent < fresh_remaining:
+                        nxt = next(queue, None)
+                        if nxt is None:
                             break
+                        provider, (lead, email_to) = nxt
 
                         domain = lead.get("Domain", "")
                         company = lead.get("Company_Name", domain)
-                        email_to = lead.get("Email", "").split(";")[0].strip()
                         score = lead.get("Total_Score") or lead.get("Automation_Score") or "?"
                         niche = lead.get("Niche", "")
                         issues_str = lead.get("Automation_Gaps", "")
 
-                        if not email_to or "@" not in email_to:
-                            continue
-
-                        # Pre-send MX check — skip bad domains before wasting a send
-                        if not _check_mx(email_to):
-                            print(f"  [skip] {domain} — bad MX for {email_to.split('@')[-1]}")
-                            continue
-
-                        issues = pick_top_issues(issues_str)
-                        template_fn = TEMPLATES[template_idx % len(TEMPLATES)]
+                        issues = pick_top_issues(issues_str, gap_codes=lead.get("Gap_Codes", ""))
+                        template_fn = pick_template(conn, template_idx)
                         template_idx += 1
                         subject, body, template_name = template_fn(lead, issues)
 
                         print(f"  [{fresh_sent + 1}/{fresh_remaining}] {company} ({domain}) → {email_to}")
-                        print(f"    Template: {template_name} | Score: {score}")
+                        print(f"    Template: {template_name} | Score: {score} | MX: {provider}")
 
-                        ok, sender_used = send_email(email_to, subject, body, dry_run=dry_run)
-                        if ok:
+                        message_id, sender_used = send_email(email_to, subject, body, dry_run=dry_run, conn=conn)
+                        if sender_used is None:
+                            print("  [i] Every sender account is at today's limit or resting")
+                            break
+                        if message_id:
                             fresh_sent += 1
                             if not dry_run:
                                 log_sent(conn, domain, email_to, template_name, subject,
                                          company=company, niche=niche, issues=issues_str,
-                                         sender_account=sender_used)
+                                         sender_account=sender_used, message_id=message_id)
                             push_to_sheets(TODAY, domain, company, email_to, template_name, "fresh", subject)
                             print(f"    ✓ {'Previewed' if dry_run else 'Sent'}")
                             if fresh_sent < fresh_remaining:
@@ -0,0 +1,557 @@
+"""
+Offline benchmark for the ai_leads audit pipeline.
+
+Starts a local HTTP server that plays a corpus of practice sites (homepage +
+/contact + /about), routes all `requests` traffic to it through an HTTP proxy,
+swaps DNS/MX and SMTP for in-process stand-ins, then drives
+audit_domain() → extract_contacts() → verify_emails() for every domain.
+Nothing leaves the machine, so runs are reproducible and comparable.
+
+Usage:
+    python bench.py                          # 200 synthetic practices
+    python bench.py --domains 1000           # bigger corpus
+    python bench.py --fixtures bench_fixtures  # + recorded sites (see --record)
+    python bench.py --server-latency 0.05    # simulated per-request latency (s)
+    python bench.py --mx-latency 0.02 --smtp-latency 0.1
+    python bench.py --keep-delays            # keep SUBPAGE_DELAY / SITE_AUDIT_DELAY sleeps
+    python bench.py --workers 8              # I/O threads + analyzer processes (see evaluate_all)
+    python bench.py --workers 8 --analyzers 0  # ...analysis in the I/O threads instead
+    python bench.py --max-bytes 262144       # override FETCH_MAX_BYTES
+    python bench.py --json out.json          # machine-readable results
+
+    python bench.py --record bench_fixtures smile.com ...   # save live sites (needs network)
+    python bench.py --filter 200000          # candidate-domain filter only, vs the old one
+    python bench.py --imports                # CLI cold-start import time vs IMPORT_BUDGET_MS
+
+Recorded fixtures live in <dir>/<domain>/{index,contact,about}.html.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import resource
+import smtplib
+import subprocess
+import threading
+import types
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import ai_leads
+import signal_rules
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCH_SUFFIX = "bench.test"
+SEED = 1234
+
+FIXTURE_PAGES = {"index.html": "/", "contact.html": "/contact", "about.html": "/about"}
+
+
+# ============================================================
+# CORPUS — synthetic practices + optional recorded fixtures
+# ============================================================
+
+FIRST_WORDS = ["Bright", "Gentle", "Family", "Lakeside", "Summit", "Oak", "Harbor",
+               "Main Street", "Willow", "Cedar", "Riverside", "Pioneer", "Sunrise"]
+SECOND_WORDS = ["Smiles", "Dental", "Dentistry", "Dental Care", "Dental Studio",
+                "Orthodontics", "Family Dentistry", "Dental Group"]
+PERSON_EMAILS = ["jane.doe", "mark", "sarah.lee", "drsmith", "info", "office", "hello"]
+
+
+def _filler(rng, n_paragraphs):
+    words = ["patients", "comfortable", "care", "smile", "cleaning", "whitening",
+             "implants", "team", "insurance", "visit", "gentle", "modern", "office"]
+    return "\n".join(
+        "<p>" + " ".join(rng.choice(words) for _ in range(rng.randint(30, 80))) + ".</p>"
+        for _ in range(n_paragraphs)
+    )
+
+
+def _maybe(rng, p, signals):
+    return f"<p>{rng.choice(signals)}</p>" if rng.random() < p else ""
+
+
+def synthetic_site(rng, idx):
+    """One practice: {path: (status, html)} plus the domain name."""
+    domain = f"practice-{idx:05d}.{BENCH_SUFFIX}"
+    name = f"{rng.choice(FIRST_WORDS)} {rng.choice(SECOND_WORDS)}"
+    roll = rng.random()
+
+    if roll < 0.08:  # dead / broken site
+        return domain, {"/": (rng.choice([404, 500, 503]), "<html><body>Error</body></html>")}
+
+    title = f"{name} | Dentist in {rng.choice(ai_leads.US_CITIES)}"
+    if roll < 0.11:
+        title = f"Top 10 Dentists Near Me ({idx})"  # junk listicle
+    parts = [f"<html><head><title>{title}</title>"]
+    if rng.random() < 0.5:
+        parts.append('<script src="https://www.googletagmanager.com/gtag/js"></script>')
+    if rng.random() < 0.2:
+        # page-builder sites inline megabytes of JS/CSS
+        blob = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz0123456789{}();=@.") for _ in range(2000))
+        parts.append("<script>" + blob * rng.randint(150, 450) + "</script>")
+    parts.append("<link href=\"/wp-content/themes/dental/style.css\" rel=\"stylesheet\">"
+                 if rng.random() < 0.6 else "")
+    if idx % 4 == 0:
+        # schema.org listing — lets the audit skip /contact and /about
+        parts.append('<script type="application/ld+json">' + json.dumps({
+            "@context": "https://schema.org", "@type": "Dentist", "name": name,
+            "telephone": f"+1-512-555-{idx % 10000:04d}",
+            "address": {"@type": "PostalAddress", "streetAddress": f"{idx} Main Street",
+                        "addressLocality": "Austin", "addressRegion": "TX"},
+        }) + "</script>")
+    parts.append("</head><body>")
+    parts.append(f"<h1>{name}</h1>")
+    parts.append(_filler(rng, rng.randint(3, 25)))
+    parts.append(_maybe(rng, 0.35, signal_rules.BOOKING_SIGNALS))
+    parts.append(_maybe(rng, 0.15, signal_rules.CHATBOT_SIGNALS))
+    parts.append(_maybe(rng, 0.2, signal_rules.REVIEW_SYSTEM_SIGNALS))
+    parts.append(_maybe(rng, 0.25, signal_rules.PATIENT_PORTAL_SIGNALS))
+    parts.append(_maybe(rng, 0.5, signal_rules.MANUAL_SIGNALS))
+    parts.append(_maybe(rng, 0.15, signal_rules.EMAIL_MARKETING_SIGNALS))
+    if rng.random() < 0.05:
+        parts.append("<p>" + " ".join(signal_rules.ENTERPRISE_KEYWORDS[:5]) + "</p>")
+    if rng.random() < 0.7:
+        parts.append(f"<p>Call us: ({rng.randint(200, 989)}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}</p>")
+    if rng.random() < 0.6:
+        parts.append(f"<p>{rng.randint(10, 9999)} Main Street</p>")
+    if rng.random() < 0.4:
+        parts.append("<p>Family owned since 1998</p>")
+
+    email_spot = rng.random()
+    email = f"{rng.choice(PERSON_EMAILS)}@{domain}"
+    if email_spot < 0.45:
+        parts.append(f'<a href="mailto:{email}">{email}</a>')
+    elif 0.82 <= email_spot < 0.86:
+        local, _, host = email.partition("@")
+        parts.append(f"<p>Email {local} [at] {host.replace('.', ' [dot] ')}</p>")
+    parts.append('<a href="/contact">Contact</a> <a href="/about">About</a></body></html>')
+
+    contact = ["<html><body><h1>Contact</h1>", _filler(rng, 2),
+               _maybe(rng, 0.3, signal_rules.PAPER_FORM_SIGNALS)]
+    if 0.45 <= email_spot < 0.75:
+        contact.append(f"<p>Email: {email}</p>")
+    elif 0.75 <= email_spot < 0.82:
+        # Cloudflare email protection: hex of key byte + XORed address
+        key = idx % 255 + 1
+        encoded = f"{key:02x}" + "".join(f"{ord(c) ^ key:02x}" for c in email)
+        contact.append(f'<p>Email: <a href="/cdn-cgi/l/email-protection#{encoded}">'
+                       f'<span class="__cf_email__" data-cfemail="{encoded}">[email&#160;protected]</span></a></p>')
+    contact.append("</body></html>")
+    about = ["<html><body><h1>About</h1>", _filler(rng, 3),
+             _maybe(rng, 0.2, signal_rules.BOOKING_SIGNALS), "</body></html>"]
+
+    pages = {"/": (200, "".join(parts)), "/contact": (200, "".join(contact))}
+    if rng.random() < 0.8:
+        pages["/about"] = (200, "".join(about))
+    return domain, pages
+
+
+def load_fixtures(fixtures_dir):
+    """Recorded sites: <dir>/<domain>/{index,contact,about}.html → {domain: {path: (200, html)}}."""
+    corpus = {}
+    if not fixtures_dir or not os.path.isdir(fixtures_dir):
+        return corpus
+    for domain in sorted(os.listdir(fixtures_dir)):
+        site_dir = os.path.join(fixtures_dir, domain)
+        if not os.path.isdir(site_dir):
+            continue
+        pages = {}
+        for fname, path in FIXTURE_PAGES.items():
+            fpath = os.path.join(site_dir, fname)
+            if os.path.exists(fpath):
+                with open(fpath, "r", encoding="utf-8", errors="replace") as f:
+                    pages[path] = (200, f.read())
+        if "/" in pages:
+            corpus[domain] = pages
+    return corpus
+
+
+def build_corpus(n_domains, fixtures_dir=None):
+    rng = random.Random(SEED)
+    corpus = dict(synthetic_site(rng, i) for i in range(n_domains))
+    corpus.update(load_fixtures(fixtures_dir))
+    return corpus
+
+
+def record_fixtures(out_dir, domains):
+    """Save live homepages + /contact + /about as fixtures (the only networked mode)."""
+    import requests
+    for domain in domains:
+        site_dir = os.path.join(out_dir, domain)
+        os.makedirs(site_dir, exist_ok=True)
+        for fname, path in FIXTURE_PAGES.items():
+            try:
+                resp = requests.get(f"https://{domain}{path}", headers=ai_leads.HEADERS,
+                                    timeout=ai_leads.REQUEST_TIMEOUT)
+            except Exception as e:
+                print(f"  [!] {domain}{path}: {e}")
+                continue
+            if resp.status_code == 200:
+                with open(os.path.join(site_dir, fname), "w", encoding="utf-8") as f:
+                    f.write(resp.text)
+                print(f"  [✓] {domain}{path} ({len(resp.content) // 1024} KB)")
+            else:
+                print(f"  [–] {domain}{path}: HTTP {resp.status_code}")
+
+
+# ============================================================
+# LOCAL FIXTURE SERVER (acts as an HTTP proxy for every host)
+# ============================================================
+
+def start_server(corpus, latency=0.0):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            # Proxied requests carry an absolute URL; direct ones only a path
+            parsed = urlparse(self.path)
+            host = (parsed.hostname or self.headers.get("Host", "")).split(":")[0].lower()
+            path = parsed.path or "/"
+            if path != "/":
+                path = path.rstrip("/")
+            if latency:
+                time.sleep(latency)
+            status, body = corpus.get(host, {}).get(path, (404, "<html><body>Not found</body></html>"))
+            data = body.encode("utf-8")
+            etag = '"%x"' % zlib.crc32(data)
+            if status == 200 and self.headers.get("If-None-Match") == etag:
+                status, data = 304, b""
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(data)  # capped clients hang up early — see handle_error
+
+        def do_CONNECT(self):
+            # No TLS here — refuse the tunnel so callers fall back to http://
+            self.send_error(502)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+
+        def handle_error(self, request, client_address):
+            if not isinstance(sys.exc_info()[1], ConnectionError):
+                super().handle_error(request, client_address)
+
+    server = Server(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ============================================================
+# DNS / MX + SMTP STAND-INS
+# ============================================================
+
+def install_fake_dns(corpus, latency=0.0):
+    """Stand-in `dns.resolver`: every corpus domain has one MX; anything else is NXDOMAIN."""
+    class MX:
+        def __init__(self, exchange):
+            self.preference = 10
+            self.exchange = exchange
+
+    def resolve(name, rdtype="A"):
+        if latency:
+            time.sleep(latency)
+        name = name.lower().rstrip(".")
+        if name not in corpus:
+            raise Exception(f"NXDOMAIN: {name}")
+        return [MX(f"mx.{name}.")]
+
+    resolver = types.ModuleType("dns.resolver")
+    resolver.resolve = resolve
+    dns = types.ModuleType("dns")
+    dns.resolver = resolver
+    sys.modules["dns"] = dns
+    sys.modules["dns.resolver"] = resolver
+
+
+def install_fake_smtp(latency=0.0, reject_rate=0.1):
+    """Stand-in smtplib.SMTP for RCPT TO probes; rejects a fixed share of mailboxes."""
+    class FakeSMTP:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def connect(self, host, port=25):
+            if latency:
+                time.sleep(latency)
+            return 220, b"fake ready"
+
+        def helo(self, name=""):
+            return 250, b"hi"
+
+        def mail(self, sender):
+            return 250, b"ok"
+
+        def rcpt(self, addr):
+            rejected = random.Random(addr).random() < reject_rate
+            return (550, b"no such user") if rejected else (250, b"ok")
+
+        def quit(self):
+            return 221, b"bye"
+
+    smtplib.SMTP = FakeSMTP
+
+
+# ============================================================
+# DOMAIN FILTER — extract_root_domain + skip list, old vs new
+# ============================================================
+
+def legacy_candidate_root(url):
+    """The filter collect_unique_domains() used before the suffix tries."""
+    try:
+        parsed = urlparse(url if "://" in url else f"https://{url}")
+        host = (parsed.hostname or "").lower().strip(".")
+        if host.startswith("www."):
+            host = host[4:]
+        parts = host.split(".")
+        if len(parts) < 2:
+            return None
+        double_tlds = {"co.uk", "com.au", "co.in", "co.nz", "com.br", "co.za",
+                       "co.jp", "co.kr", "com.sg", "com.hk", "co.il", "com.mx"}
+        suffix = ".".join(parts[-2:])
+        root = ".".join(parts[-3:]) if suffix in double_tlds and len(parts) >= 3 else ".".join(parts[-2:])
+        if host != root and host != f"www.{root}":
+            return None
+        if root.endswith((".gov", ".edu", ".mil", ".org")):
+            return None
+        return None if root in ai_leads.SKIP_DOMAINS else root
+    except Exception:
+        return None
+
+
+def candidate_root(url):
+    root = ai_leads.extract_root_domain(url)
+    return None if not root or ai_leads.is_skip_domain(root) else root
+
+
+def search_result_urls(n):
+    """Search-result-shaped URLs: practices across TLDs, directories, subdomains, .gov/.org."""
+    rng = random.Random(SEED)
+    skip = sorted(ai_leads.SKIP_DOMAINS)
+    tlds = ["com", "com", "com", "net", "dental", "co.uk", "net.au", "org.uk", "ca", "on.ca"]
+    urls = []
+    for i in range(n):
+        name = f"{rng.choice(FIRST_WORDS)}{rng.choice(SECOND_WORDS)}{i}".replace(" ", "").lower()
+        kind = rng.random()
+        if kind < 0.55:
+            host = f"{rng.choice(['', 'www.'])}{name}.{rng.choice(tlds)}"
+        elif kind < 0.80:
+            host = f"{rng.choice(['', 'www.', 'm.'])}{rng.choice(skip)}"
+        elif kind < 0.90:
+            host = f"{rng.choice(['blog', 'book', 'patients'])}.{name}.com"
+        else:
+            host = f"{name}.{rng.choice(['org', 'gov', 'edu', 'k12.tx.us'])}"
+        urls.append(f"https://{host}/{rng.choice(['', 'about', 'dentist/' + name])}")
+    return urls
+
+
+def run_filter_bench(n):
+    urls = search_result_urls(n)
+    results = {}
+    for label, func in (("legacy", legacy_candidate_root), ("trie", candidate_root)):
+        start = time.perf_counter()
+        kept = [func(u) for u in urls]
+        elapsed = time.perf_counter() - start
+        results[label] = {"seconds": round(elapsed, 3),
+                          "ns_per_url": round(elapsed / n * 1e9),
+                          "kept": sum(1 for k in kept if k), "roots": kept}
+    changed = [(u, old, new) for u, old, new in zip(urls, results["legacy"].pop("roots"),
+                                                  results["trie"].pop("roots")) if old != new]
+    results["changed"] = len(changed)
+    results["examples"] = changed[:8]
+    return results
+
+
+# ============================================================
+# IMPORT TIME — cold start of the CLI scripts
+# ============================================================
+# --status, --replied, --queries and --rescore are over in milliseconds, so
+# what the user waits for is the import. Each module is imported in a fresh
+# interpreter under -X importtime; the first run only warms the bytecode cache.
+
+IMPORT_BUDGET_MS = {"ai_leads": 60, "ai_outreach": 40}
+
+
+def import_times(module, runs=5):
+    """Best-of-`runs` cumulative import time (ms) of `module` and its direct imports."""
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    best = None
+    for run in range(runs + 1):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                              cwd=SCRIPT_DIR, env=env, capture_output=True, text=True, check=True)
+        children, total = [], None
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line.split("|")
+            if name.startswith("   ") and not name.startswith("     "):
+                children.append((name.strip(), int(cumulative) / 1000))
+            elif not name.startswith("  "):
+                if name.strip() == module:
+                    total = int(cumulative) / 1000
+                    break
+                children = []
+        if run and (best is None or total < best[0]):
+            best = (total, sorted(children, key=lambda c: -c[1]))
+    return best
+
+
+def run_import_bench():
+    over = 0
+    print("=" * 60)
+    print("  IMPORT TIME — python -X importtime, best of 5")
+    print("=" * 60)
+    for module, budget in IMPORT_BUDGET_MS.items():
+        total, children = import_times(module)
+        flag = "✓" if total <= budget else "!"
+        over += total > budget
+        print(f"  [{flag}] {module:<12} {total:>7.1f} ms  (budget {budget} ms)")
+        for name, ms in children[:5]:
+            print(f"        {name:<28} {ms:>7.1f} ms")
+    return over
+
+
+# ============================================================
+# RUN
+# ============================================================
+
+def peak_rss_mb(who=resource.RUSAGE_SELF):
+    """
+    Peak resident memory of this process, or with RUSAGE_CHILDREN of the
+    largest child that has exited — the analyzer processes, once
+    evaluate_all() has shut the pool down.
+    """
+    rss = resource.getrusage(who).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_bench(corpus, workers=1):
+    """What ai_leads.main() does per domain, minus DB/CSV/Sheets writes."""
+    outcomes = {}
+    domains = list(corpus)
+    info = {"title": "", "niche": "Dental"}
+    start = time.perf_counter()
+    for _, _, result in ai_leads.evaluate_all(((d, info) for d in domains), workers):
+        outcomes[result["outcome"]] = outcomes.get(result["outcome"], 0) + 1
+    elapsed = time.perf_counter() - start
+    latencies = sorted(ai_leads._stage_times["domain"])
+    return {
+        "domains": len(domains),
+        "seconds": round(elapsed, 3),
+        "domains_per_sec": round(len(domains) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(ai_leads._percentile(latencies, 50) * 1000, 1),
+        "p99_ms": round(ai_leads._percentile(latencies, 99) * 1000, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "peak_rss_children_mb": round(peak_rss_mb(resource.RUSAGE_CHILDREN), 1),
+        "outcomes": outcomes,
+        "stages": ai_leads.timing_summary(),
+    }
+
+
+def main():
+    args = sys.argv[1:]
+    n_domains = 200
+    fixtures_dir = None
+    server_latency = mx_latency = smtp_latency = 0.0
+    keep_delays = "--keep-delays" in args
+    json_out = None
+    workers = 1
+
+    if "--filter" in args:
+        i = args.index("--filter")
+        n = int(args[i + 1]) if i + 1 < len(args) else 100000
+        results = run_filter_bench(n)
+        print("=" * 60)
+        print(f"  DOMAIN FILTER BENCHMARK — {n:,} search-result URLs")
+        print("=" * 60)
+        for label in ("legacy", "trie"):
+            r = results[label]
+            print(f"  {label:<7} {r['seconds']:>7}s  {r['ns_per_url']:>6} ns/url  kept {r['kept']:,}")
+        print(f"  Verdicts changed: {results['changed']:,}")
+        for url, old, new in results["examples"]:
+            print(f"    {url:<48} {old or '—'} → {new or '—'}")
+        return
+
+    if "--imports" in args:
+        sys.exit(1 if run_import_bench() else 0)
+
+    if "--record" in args:
+        i = args.index("--record")
+        if i + 2 > len(args):
+            print("Usage: python bench.py --record OUT_DIR domain [domain ...]")
+            return
+        record_fixtures(args[i + 1], args[i + 2:])
+        return
+
+    for i, arg in enumerate(args):
+        if i + 1 >= len(args):
+            break
+        if arg == "--domains":
+            n_domains = int(args[i + 1])
+        elif arg == "--fixtures":
+            fixtures_dir = args[i + 1]
+        elif arg == "--server-latency":
+            server_latency = float(args[i + 1])
+        elif arg == "--mx-latency":
+            mx_latency = float(args[i + 1])
+        elif arg == "--smtp-latency":
+            smtp_latency = float(args[i + 1])
+        elif arg == "--json":
+            json_out = args[i + 1]
+        elif arg == "--max-bytes":
+            ai_leads.FETCH_MAX_BYTES = int(args[i + 1])
+        elif arg == "--workers":
+            workers = int(args[i + 1])
+        elif arg == "--analyzers":
+            ai_leads.ANALYZER_PROCESSES = int(args[i + 1])
+
+    corpus = build_corpus(n_domains, fixtures_dir)
+    server = start_server(corpus, latency=server_latency)
+    proxy = f"http://127.0.0.1:{server.server_address[1]}"
+    for var in ("HTTP_PROXY", "HTTPS_PROXY", "http_proxy", "https_proxy"):
+        os.environ[var] = proxy
+    for var in ("NO_PROXY", "no_proxy", "ALL_PROXY", "all_proxy"):
+        os.environ.pop(var, None)
+    install_fake_dns(corpus, latency=mx_latency)
+    install_fake_smtp(latency=smtp_latency)
+    if not keep_delays:
+        ai_leads.SUBPAGE_DELAY = 0
+        ai_leads.SITE_AUDIT_DELAY = 0
+
+    print("=" * 60)
+    print(f"  AUDIT BENCHMARK — {len(corpus)} domains (offline), {workers} worker(s)")
+    print(f"  Fixture server: {proxy}")
+    print("=" * 60)
+
+    results = run_bench(corpus, workers)
+    server.shutdown()
+
+    print(f"\n  Domains:      {results['domains']}")
+    print(f"  Wall time:    {results['seconds']}s")
+    print(f"  Throughput:   {results['domains_per_sec']} domains/sec")
+    print(f"  Latency:      p50 {results['p50_ms']} ms | p99 {results['p99_ms']} ms")
+    print(f"  Peak RSS:     {results['peak_rss_mb']} MB "
+          f"(+ {results['peak_rss_children_mb']} MB largest child process)")
+    print(f"  Outcomes:     {results['outcomes']}")
+    ai_leads.print_timing_summary()
+
+    if json_out:
+        with open(json_out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"  [✓] Results: {json_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+Signal rules — what ai_leads.py looks for on a practice's website.
+One declarative registry shared by the audit (detection + scoring) and
+ai_outreach.py (email phrasing), so a new signal is a new entry here,
+not another pass over the page.
+
+Each rule:
+    name      unique id (revenue/CMS rules: the label shown in the CSV)
+    category  automation | manual | revenue | cms | smb | enterprise | nonprofit
+    keywords  lowercase substrings searched for in the lowercased page, or
+              whole_word() patterns for short tokens that hide inside other words
+
+plus, by category:
+    automation  present (label when found), gap/weight/description/phrase/tip (when missing)
+    manual      gap/weight/description/phrase/tip (when found); unless = rule that cancels it
+    cms         smb = counts as a small-business CMS
+    smb         weight (SMB points), reason, absent = scores when NOT found
+    enterprise / nonprofit  count = number of distinct keywords found
+
+SNIPPET_RULES use the same shape (category "snippet", weight = pre-score
+points, negative = less promising) but run on a search result's title +
+snippet, to order candidates before any site is fetched.
+"""
+
+import re
+
+
+def whole_word(word):
+    """Keyword that only matches `word` standing alone ("dds", not "odds")."""
+    return re.compile(rf"\b{re.escape(word)}\b")
+
+
+# ── Tools/platforms that indicate automation is ALREADY in place ──
+BOOKING_SIGNALS = [
+    "calendly", "acuity", "acuityscheduling", "zocdoc", "localized",
+    "localmed", "nexhealth", "solutionreach", "dentrix ascend",
+    "opencare", "carestack", "patientpop", "schedule online",
+    "book online", "book now", "book appointment", "online booking",
+    "online scheduling", "request appointment", "schedule appointment",
+    "flexbook", "jane.app", "simplepractice",
+]
+
+CHATBOT_SIGNALS = [
+    "drift", "intercom", "tidio", "livechat", "tawk.to", "tawk",
+    "zendesk", "freshchat", "crisp.chat", "hubspot-messages",
+    "chatwidget", "live-chat", "chat-widget", "dialogflow",
+    "landbot", "manychat", "chatfuel", "botpress",
+    "kommunicate", "olark", "purechat",
+]
+
+REVIEW_SYSTEM_SIGNALS = [
+    "birdeye", "podium", "weave", "reviewtrackers", "reputation.com",
+    "grade.us", "trustpilot", "broadly", "getjerry", "demandforce",
+    "swell", "nicejob", "reviewwave",
+]
+
+PATIENT_PORTAL_SIGNALS = [
+    "patient portal", "patient login", "myportal", "patient access",
+    "secure portal", "online portal", "my account",
+    "patient forms", "digital forms", "online forms",
+    "paperless", "e-forms",
+]
+
+SMS_SIGNALS = [
+    "text us", "sms", "text message", "send a text",
+    "text to schedule", "text reminders", "weave",
+    "solutionreach", "revenuewell", "lighthouse 360",
+    "patient communicator",
+]
+
+PRACTICE_MGMT_SIGNALS = [
+    "dentrix", "eaglesoft", "open dental", "curve dental",
+    "carestack", "denticon", "tab32", "planet dds",
+    "practice-web", "maxident", "ace dental",
+]
+
+EMAIL_MARKETING_SIGNALS = [
+    "mailchimp", "constant contact", "sendgrid", "klaviyo",
+    "activecampaign", "drip", "convertkit", "campaign monitor",
+    "mc.js", "mailerlite", "revenuewell",
+]
+
+# Signs they do things manually (= they need automation)
+MANUAL_SIGNALS = [
+    "call to schedule", "call us to", "call our office",
+    "phone to schedule", "give us a call", "call today",
+    "call for appointment", "call now", "call for",
+]
+
+PAPER_FORM_SIGNALS = [
+    "download and print", "print and fill", "print out",
+    "printable form", "paper form", "fill out and bring",
+    "download the form", "print the form", "bring completed",
+]
+
+# ── ENTERPRISE SIGNALS (links/text in the page) ─────────────
+# If a site has 3+ of these, it's too big to be your client
+
+ENTERPRISE_KEYWORDS = [
+    "investor relations", "investors", "annual report",
+    "press releases", "newsroom", "media center",
+    "careers", "join our team", "open positions", "we're hiring",
+    "global offices", "our locations", "worldwide",
+    "nasdaq", "nyse", "stock price", "sec filing",
+    "fortune 500", "fortune 100",
+    "enterprise solutions", "enterprise platform",
+]
+
+# ── NONPROFIT / NGO SIGNALS (skip if 2+ found) ──────────────
+NONPROFIT_KEYWORDS = [
+    "501(c)", "501c3", "nonprofit", "non-profit", "tax-exempt",
+    "tax exempt", "charitable organization", "donate now",
+    "make a donation", "support our mission", "our mission",
+    "volunteer opportunities", "volunteer with us",
+    "fundraising", "grant funding", "annual fund",
+    "board of directors", "board members",
+    "community outreach", "public benefit",
+]
+
+# ── Chains / DSOs — never small practices, whatever the snippet says ──
+CHAIN_BRANDS = [
+    "aspen dental", "heartland dental", "pacific dental", "western dental",
+    "smile brands", "bright now", "coast dental", "monarch dental",
+    "castle dental", "kool smiles", "great expressions", "dental care alliance",
+    "sonrava", "gentle dental", "perfect teeth", "clearchoice", "clear choice",
+    "smile doctors", "affordable dentures", "familia dental", "dental works",
+]
+
+# ── Gap codes — compact, stable identifiers stored with each lead ──
+# ai_outreach.py maps these straight to phrasing/tips with a dict lookup,
+# so a code must never be renamed once leads carrying it are in a CSV.
+GAP_NO_BOOKING = "no_booking"
+GAP_NO_CHATBOT = "no_chatbot"
+GAP_NO_REVIEWS = "no_reviews"
+GAP_NO_PORTAL = "no_portal"
+GAP_NO_SMS = "no_sms"
+GAP_PHONE_ONLY = "phone_only"
+GAP_PAPER_FORMS = "paper_forms"
+GAP_NO_EMAIL_MKTG = "no_email_mktg"
+
+# Order matters: gaps are reported in this order, CMS is the first hit.
+SIGNAL_RULES = [
+    # ── Enterprise / nonprofit (checked first — either can end the audit) ──
+    {"name": "enterprise", "category": "enterprise", "count": True, "keywords": ENTERPRISE_KEYWORDS},
+    {"name": "nonprofit", "category": "nonprofit", "count": True, "keywords": NONPROFIT_KEYWORDS},
+
+    # ── CMS ──
+    {"name": "WordPress", "category": "cms", "smb": True, "keywords": ["wp-content", "wordpress"]},
+    {"name": "Shopify", "category": "cms", "keywords": ["shopify", "cdn.shopify"]},
+    {"name": "Squarespace", "category": "cms", "smb": True, "keywords": ["squarespace"]},
+    {"name": "Wix", "category": "cms", "smb": True, "keywords": ["wix"]},
+    {"name": "Webflow", "category": "cms", "smb": True, "keywords": ["webflow"]},
+    {"name": "Ghost", "category": "cms", "keywords": ["ghost"]},
+    {"name": "Drupal", "category": "cms", "keywords": ["drupal"]},
+    {"name": "Joomla", "category": "cms", "smb": True, "keywords": ["joomla"]},
+    {"name": "Framer", "category": "cms", "keywords": ["framer"]},
+
+    # ── Revenue / budget signals ──
+    {"name": "Google Analytics", "category": "revenue", "keywords": ["gtag(", "google-analytics", "googletagmanager"]},
+    {"name": "Facebook Pixel", "category": "revenue", "keywords": ["fbq(", "facebook.com/tr"]},
+    {"name": "Hotjar", "category": "revenue", "keywords": ["hotjar"]},
+    {"name": "HubSpot", "category": "revenue", "keywords": ["hubspot"]},
+    {"name": "Stripe", "category": "revenue", "keywords": ["stripe.com", "checkout.stripe"]},
+    {"name": "Google Ads", "category": "revenue", "keywords": ["googleads", "adservice", "conversion.js"]},
+    {"name": "Yelp Widget", "category": "revenue", "keywords": ["yelp.com/biz"]},
+
+    # ── Automation they have (found) or lack (gap) ──
+    {"name": "booking", "category": "automation", "keywords": BOOKING_SIGNALS,
+     "present": "Online Booking", "gap": GAP_NO_BOOKING, "weight": 4,
+     "description": "No online booking system",
+     "phrase": "how patients book appointments",
+     "tip": "Right now it looks like patients have to call in to schedule. Most practices that add online booking see a noticeable bump in new patient appointments, especially from people searching after hours."},
+    {"name": "chatbot", "category": "automation", "keywords": CHATBOT_SIGNALS,
+     "present": "Chatbot/Live Chat", "gap": GAP_NO_CHATBOT, "weight": 3,
+     "description": "No chatbot or live chat",
+     "phrase": "after-hours patient communication",
+     "tip": "There's no way for patients to get quick answers when your office is closed. A simple automated chat can handle the most common questions and capture leads overnight."},
+    {"name": "reviews", "category": "automation", "keywords": REVIEW_SYSTEM_SIGNALS,
+     "present": "Review Automation", "gap": GAP_NO_REVIEWS, "weight": 3,
+     "description": "No automated review system",
+     "phrase": "how you're collecting patient reviews",
+     "tip": "It looks like you're not automatically asking patients for reviews after visits. The practices that do this consistently tend to build their Google rating much faster."},
+    {"name": "portal", "category": "automation", "keywords": PATIENT_PORTAL_SIGNALS,
+     "present": "Patient Portal", "gap": GAP_NO_PORTAL, "weight": 2,
+     "description": "No patient portal",
+     "phrase": "patient access to their records",
+     "tip": "Patients don't seem to have a way to access their info online. A simple portal for forms, records, and appointment history tends to reduce front desk calls significantly."},
+    {"name": "sms", "category": "automation", "keywords": SMS_SIGNALS,
+     "present": "SMS/Text", "gap": GAP_NO_SMS, "weight": 2,
+     "description": "No SMS or text capability",
+     "phrase": "text-based communication with patients",
+     "tip": "Text messaging is becoming the default way patients want to communicate. Automated appointment reminders via text alone can cut no-shows by a third or more."},
+
+    # ── Manual processes (found = gap) ──
+    {"name": "phone_only", "category": "manual", "keywords": MANUAL_SIGNALS, "unless": "booking",
+     "gap": GAP_PHONE_ONLY, "weight": 3,
+     "description": "Phone-only appointment booking",
+     "phrase": "the booking flow relying entirely on phone calls",
+     "tip": "Right now everything goes through the phone, which means your front desk is the bottleneck. Giving patients other ways to book and communicate takes a lot of pressure off your team."},
+    {"name": "paper_forms", "category": "manual", "keywords": PAPER_FORM_SIGNALS,
+     "gap": GAP_PAPER_FORMS, "weight": 3,
+     "description": "Still uses paper/printable forms",
+     "phrase": "intake forms that still need to be printed",
+     "tip": "It looks like intake forms still need to be printed and filled out. Digital forms that patients complete on their phone before they arrive save everyone time and reduce errors."},
+
+    {"name": "email_mktg", "category": "automation", "keywords": EMAIL_MARKETING_SIGNALS,
+     "present": "Email Marketing", "gap": GAP_NO_EMAIL_MKTG, "weight": 2,
+     "description": "No email marketing automation",
+     "phrase": "staying in touch with patients between visits",
+     "tip": "There doesn't appear to be any automated patient communication between visits. Even basic things like recall reminders and birthday messages help with retention."},
+    # Not having PMS detected on the website doesn't mean they don't have it
+    # — too many false positives for a gap, so it only counts as present
+    {"name": "pms", "category": "automation", "keywords": PRACTICE_MGMT_SIGNALS,
+     "present": "Practice Management Software"},
+
+    # ── SMB signals (positive = small business) ──
+    {"name": "no_careers", "category": "smb", "absent": True, "weight": 1, "reason": "no careers page",
+     "keywords": ["careers", "job openings"]},
+    {"name": "owner", "category": "smb", "weight": 2, "reason": "owner/founder mention",
+     "keywords": ["owner", "founder", "family owned", "family-owned", "established in", "since 19",
+                  "since 20", "locally owned", "veteran owned", "woman owned"]},
+    {"name": "service", "category": "smb", "weight": 1, "reason": "service-oriented",
+     "keywords": ["schedule appointment", "call us today", "free consultation", "free estimate",
+                  "free quote", "get a quote"]},
+]
+
+# Search title + snippet markers (see ai_leads.prescore)
+SNIPPET_RULES = [
+    {"name": "phone booking", "category": "snippet", "weight": 3, "keywords": MANUAL_SIGNALS},
+    {"name": "paper forms", "category": "snippet", "weight": 2, "keywords": PAPER_FORM_SIGNALS},
+    {"name": "small practice", "category": "snippet", "weight": 2,
+     "keywords": ["family dentistry", "family dental", "family owned", "family-owned",
+                  "locally owned", "independently owned", whole_word("dds"), whole_word("dmd")]},
+    {"name": "books online", "category": "snippet", "weight": -2,
+     "keywords": ["book online", "schedule online", "online booking", "online scheduling", "book now"]},
+    {"name": "multi-location", "category": "snippet", "weight": -3,
+     "keywords": ["our locations", "find a location", "locations near you", "nationwide", "franchise"]},
+    {"name": "chain brand", "category": "snippet", "weight": -6, "keywords": CHAIN_BRANDS},
+]
+
+RULES_BY_NAME = {rule["name"]: rule for rule in SIGNAL_RULES}
+
+# code → (description, weight), in report order
+GAP_RULES = {rule["gap"]: (rule["description"], rule["weight"]) for rule in SIGNAL_RULES if "gap" in rule}
+ISSUE_PHRASES = {rule["gap"]: rule["phrase"] for rule in SIGNAL_RULES if "gap" in rule}
+ISSUE_TIPS = {rule["gap"]: rule["tip"] for rule in SIGNAL_RULES if "gap" in rule}
+
+FIRST_MATCH_CATEGORIES = {"cms"}  # only the first rule that hits counts
+
+
+def rules_in(*categories):
+    """Rules of the given categories, in registry order."""
+    return [rule for rule in SIGNAL_RULES if rule["category"] in categories]
+
+
+GAP_SOURCE_RULES = rules_in("automation", "manual")  # what gaps_from_hits() reads, built once
+
+
+def match_rules(text, rules, seen=None):
+    """
+    {rule name: hits} for `rules` over lowercased `text`: 0/1, or the number
+    of distinct keywords found for count rules. Each distinct keyword is
+    searched for at most once per `seen` memo — pass the same dict for
+    every call on one page, so keywords shared by rules (and by later
+    stages) cost nothing. Plain substring search per keyword measured
+    ~5x faster than one big regex alternation over the page in CPython.
+    """
+    seen = {} if seen is None else seen
+    hits = {}
+    matched_categories = set()
+    for rule in rules:
+        if rule["category"] in matched_categories:
+            hits[rule["name"]] = 0
+            continue
+        count = 0
+        for kw in rule["keywords"]:
+            found = seen.get(kw)
+            if found is None:
+                found = seen[kw] = kw in text if isinstance(kw, str) else kw.search(text) is not None
+            if found:
+                count += 1
+                if not rule.get("count"):
+                    break
+        hits[rule["name"]] = count
+        if count and rule["category"] in FIRST_MATCH_CATEGORIES:
+            matched_categories.add(rule["category"])
+    return hits
+
+
+def gaps_from_hits(hits):
+    """Gap codes (report order) and automation present, from a page's match_rules() hits."""
+    gap_codes = []
+    present = []
+    for rule in GAP_SOURCE_RULES:
+        hit = hits.get(rule["name"], 0)
+        if rule["category"] == "automation":
+            if hit:
+                present.append(rule["present"])
+            elif "gap" in rule:
+                gap_codes.append(rule["gap"])
+        elif hit and not hits.get(rule.get("unless"), 0):
+            gap_codes.append(rule["gap"])
+    return gap_codes, present
@@ -0,0 +1,211 @@
+"""
+pytest checks for ai_leads.py — real inputs, real outputs, no network.
+
+    python -m pytest -q
+"""
+
+import multiprocessing
+import time
+
+import pytest
+
+import ai_leads
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """A fresh history DB in a temp dir."""
+    monkeypatch.setattr(ai_leads, "DB_PATH", str(tmp_path / "history.db"))
+    conn = ai_leads.init_db()
+    yield conn
+    conn.close()
+
+
+# ── Shared frontier (--shard / --coordinator) ──
+
+def _init_db_at(path, barrier):
+    ai_leads.DB_PATH = path
+    barrier.wait()
+    ai_leads.init_db().close()
+
+
+def test_init_db_survives_copies_starting_together(tmp_path):
+    # README: `--shard 1/3 & --shard 2/3 & ...` on a fresh DB
+    path = str(tmp_path / "history.db")
+    barrier = multiprocessing.Barrier(6)
+    procs = [multiprocessing.Process(target=_init_db_at, args=(path, barrier)) for _ in range(6)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(60)
+    assert [p.exitcode for p in procs] == [0] * 6
+
+
+def test_frontier_claims_best_first_and_never_twice(db):
+    ai_leads.frontier_enqueue(db, {
+        "low.com": {"niche": "Dental", "prescore": 1},
+        "high.com": {"niche": "Dental", "prescore": 9},
+        "mid.com": {"niche": "Dental", "prescore": 5},
+    })
+    first = ai_leads.frontier_claim(db, "a", 2)
+    second = ai_leads.frontier_claim(db, "b", 5)
+    assert [d for d, _ in first] == ["high.com", "mid.com"]
+    assert [d for d, _ in second] == ["low.com"]
+    assert first[0][1] == {"niche": "Dental", "prescore": 9}
+    assert ai_leads.frontier_claim(db, "c", 5) == []
+
+
+def test_frontier_skips_domains_already_seen(db):
+    ai_leads.mark_domain_seen(db, "old.com", was_lead=False, niche="Dental")
+    assert ai_leads.frontier_enqueue(db, {"old.com": {}, "new.com": {}}) == 1
+    assert ai_leads.frontier_enqueue(db, {"new.com": {}}) == 0
+
+
+def test_expired_lease_is_taken_over(db, monkeypatch):
+    monkeypatch.setattr(ai_leads, "LEASE_SECONDS", 60)
+    ai_leads.frontier_enqueue(db, {"a.com": {}})
+    assert ai_leads.frontier_claim(db, "dead-copy", 1) == [("a.com", {})]
+    assert ai_leads.frontier_claim(db, "other", 1) == []
+    later = time.time() + 61
+    monkeypatch.setattr(ai_leads.time, "time", lambda: later)
+    assert ai_leads.frontier_claim(db, "other", 1) == [("a.com", {})]
+    owner, = db.execute("SELECT lease_owner FROM frontier WHERE domain = 'a.com'").fetchone()
+    assert owner == "other"
+
+
+def test_release_and_done(db):
+    ai_leads.frontier_enqueue(db, {"a.com": {}, "b.com": {}})
+    ai_leads.frontier_claim(db, "w", 2)
+    ai_leads.frontier_done(db, "a.com", "w", {"outcome": "lead", "total_score": 70})
+    assert ai_leads.frontier_release(db, "w") == 1
+    assert ai_leads.frontier_stats(db) == {"open": 1, "leased": 0, "done": 1, "leads": 1}
+    assert ai_leads.frontier_claim(db, "x", 5) == [("b.com", {})]
+
+
+def test_no_claims_once_all_copies_reach_the_target(db, monkeypatch):
+    monkeypatch.setattr(ai_leads, "DAILY_LEAD_TARGET", 1)
+    ai_leads.frontier_enqueue(db, {"a.com": {}, "b.com": {}})
+    domain, _ = ai_leads.frontier_claim(db, "w1", 1)[0]
+    ai_leads.frontier_done(db, domain, "w1", {"outcome": "lead", "total_score": 70})
+    assert ai_leads.frontier_claim(db, "w2", 1) == []
+
+
+# ── Candidate domains (public-suffix trie, skip list) ──
+
+@pytest.mark.parametrize("url, root", [
+    ("https://www.smiledental.com/", "smiledental.com"),
+    ("https://smithdental.co.uk/", "smithdental.co.uk"),
+    ("https://smithdental.or.us/", "smithdental.or.us"),     # Oregon, not a nonprofit
+    ("https://www.smithdental.ca.us", "smithdental.ca.us"),
+    ("https://blog.smiledental.com/", None),                 # a subdomain, not the site root
+    ("https://co.uk/", None),                                # a bare suffix
+    ("https://www.dentalboard.gov/", None),
+    ("https://umich.edu/", None),
+    ("https://dental.ac.uk/", None),
+    ("https://smilefoundation.org/", None),
+    ("https://city.or.jp/", None),
+    ("https://ministry.go.kr/", None),
+])
+def test_extract_root_domain(url, root):
+    assert ai_leads.extract_root_domain(url) == root
+
+
+def test_public_suffix_length():
+    assert ai_leads.public_suffix_length(["smithdental", "co", "uk"]) == 2
+    assert ai_leads.public_suffix_length(["smithdental", "or", "us"]) == 2
+    assert ai_leads.public_suffix_length(["smithdental", "com"]) == 1
+    assert ai_leads.public_suffix_length(["smithdental", "unknowntld"]) == 1
+
+
+def test_skip_domains_cover_subdomains():
+    assert ai_leads.is_skip_domain("yelp.com")
+    assert ai_leads.is_skip_domain("m.yelp.com")
+    assert not ai_leads.is_skip_domain("notyelp.com")
+
+
+# ── Gap codes (audit → CSV Gap_Codes → outreach) ──
+
+def _analyze(body):
+    html = f"<html><head><title>Smile Family Dental</title></head><body>{body}</body></html>"
+    page = {"text": html, "size": len(html), "url": "https://smilefamily.com/", "validators": {}}
+    return ai_leads.analyze_homepage("smilefamily.com", page, 0.3)
+
+
+def test_homepage_gaps_come_out_as_codes():
+    audit = _analyze("Give us a call at (512) 555-0100. Please download and print our intake sheet.")
+    assert audit["gap_codes"] == ["no_booking", "no_chatbot", "no_reviews", "no_portal",
+                                  "no_sms", "phone_only", "paper_forms", "no_email_mktg"]
+    assert set(audit["gap_codes"]) <= set(ai_leads.GAP_RULES)
+
+
+def test_online_booking_cancels_phone_only():
+    audit = _analyze("Give us a call, or book online with Calendly.")
+    assert "Online Booking" in audit["automation_present"]
+    assert "no_booking" not in audit["gap_codes"]
+    assert "phone_only" not in audit["gap_codes"]
+
+
+# ── Batch scoring (--rescore) ──
+
+def _calc_row(gap_weight, smb, n_revenue, contact):
+    auto = ai_leads.calc_automation_score([("", gap_weight)])
+    biz = ai_leads.calc_biz_fit_score(smb)
+    budget = ai_leads.calc_budget_score([None] * n_revenue)
+    total = ai_leads.calc_total_score(auto, biz, budget, contact)
+    return auto, biz, budget, contact, total, ai_leads.lead_tier(total)
+
+
+def test_score_batch_matches_calc_functions():
+    rows = [(gw, smb, n_rev, contact)
+            for gw in (0, 2, 3.5, 7, 12, 19, 25, 31)
+            for smb in (-3, -1, 0, 2, 5, 9)
+            for n_rev in (0, 1, 3, 6)
+            for contact in (0, 40, 70, 100)]
+    columns = [list(col) for col in zip(*rows)]
+    expected = [_calc_row(*row) for row in rows]
+    keys = ("automation", "biz_fit", "budget", "contact", "total", "tier")
+    for scored in (ai_leads.score_batch(*columns), ai_leads._score_rows(*columns)):
+        assert list(zip(*(scored[k] for k in keys))) == expected
+
+
+def test_score_batch_tier_boundaries():
+    # 100 * .35 + 0 * .25 + 0 * .25 + 10 * .15 = 36.5 → 36; every part maxed → 100
+    scored = ai_leads.score_batch([0, 25], [-2, 8], [0, 4], [100, 100])
+    assert scored["total"] == [36, 100]
+    assert scored["tier"] == [ai_leads.lead_tier(36), "🔥 HOT"]
+
+
+# ── Email extraction ('@' scan, deobfuscation) ──
+
+def _cfemail(email, key=0x42):
+    return f"{key:02x}" + "".join(f"{ord(ch) ^ key:02x}" for ch in email)
+
+
+def test_decode_cfemail():
+    assert ai_leads.decode_cfemail(_cfemail("office@smiledental.com")) == "office@smiledental.com"
+    assert ai_leads.decode_cfemail(_cfemail("office@smiledental.com", key=0xA7)) == "office@smiledental.com"
+    assert ai_leads.decode_cfemail("not hex") == ""
+    assert ai_leads.decode_cfemail("") == ""
+
+
+def test_find_emails_every_source_once():
+    html = f"""
+    <a href="mailto:Dr.Lee@SmileDental.com?subject=Hello">Email Dr. Lee</a>
+    <a href="/cdn-cgi/l/email-protection" data-cfemail="{_cfemail('office@smiledental.com')}">[email&#160;protected]</a>
+    <p>Front desk: frontdesk [at] smiledental [dot] com, billing&#64;smiledental.com</p>
+    <p>Questions? dr.lee@smiledental.com</p>
+    """
+    assert ai_leads.find_emails(html) == [
+        "dr.lee@smiledental.com", "office@smiledental.com",
+        "billing@smiledental.com", "frontdesk@smiledental.com",
+    ]
+
+
+def test_find_emails_skips_junk():
+    html = """
+    <script>track("tracker@analytics.com")</script>
+    <style>.logo{background:url(logo@2x.png)}</style>
+    <img src="hero@2x.png"> noreply@smiledental.com you@example.com
+    <p>user@host</p>
+    """
+    assert ai_leads.find_emails(html) == []
@@ -0,0 +1,272 @@
+"""
+pytest checks for ai_outreach.py — real inputs, real outputs, no SMTP/IMAP.
+
+    python -m pytest -q
+"""
+
+import pytest
+
+import ai_outreach
+from signal_rules import ISSUE_PHRASES
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """A fresh outreach DB in a temp dir."""
+    monkeypatch.setattr(ai_outreach, "DB_PATH", str(tmp_path / "history.db"))
+    conn = ai_outreach.init_outreach_db()
+    yield conn
+    conn.close()
+
+
+# ── Gap codes (CSV Gap_Codes column, legacy Automation_Gaps text) ──
+
+def test_gap_codes_win_over_legacy_text():
+    issues = ai_outreach.pick_top_issues("No chatbot or live chat",
+                                         gap_codes="no_booking;no_sms;;no_portal;no_reviews")
+    assert issues == ["no_booking", "no_sms", "no_portal"]
+
+
+def test_legacy_text_without_codes():
+    assert ai_outreach.pick_top_issues("No patient portal; No SMS or text capability") == \
+        ["No patient portal", "No SMS or text capability"]
+    assert ai_outreach.pick_top_issues("") == ["some technical issues"]
+
+
+@pytest.mark.parametrize("issue, code", [
+    ("no_booking", "no_booking"),
+    ("No online booking system", "no_booking"),
+    ("Phone-only appointment booking", "phone_only"),
+    ("Still uses paper/printable forms", "paper_forms"),
+    ("No email marketing automation", "no_email_mktg"),
+    ("Slow load time", None),
+])
+def test_issue_code(issue, code):
+    assert ai_outreach.issue_code(issue) == code
+
+
+def test_codes_and_legacy_text_read_the_same():
+    from_codes = ai_outreach.format_issues_list(["no_booking", "no_chatbot"])
+    from_text = ai_outreach.format_issues_list(["No online booking system", "No chatbot or live chat"])
+    assert from_codes == from_text == f"{ISSUE_PHRASES['no_booking']} and {ISSUE_PHRASES['no_chatbot']}"
+
+
+# ── Campaign stats (log_sent / set_status deltas vs a full recount) ──
+
+def _stats(conn):
+    return sorted(conn.execute("SELECT dimension, key, sent, replied, bounced FROM campaign_stats").fetchall())
+
+
+def test_campaign_stats_deltas_match_rebuild(db):
+    sends = [
+        ("smileA.com", "dr@smileA.com", "quick_audit", "Quick note about Smile A", "Smile A", "a@me.com"),
+        ("smileA.com", "office@smileA.com", "quick_audit", "Quick note about Smile A", "Smile A", "a@me.com"),
+        ("brightB.com", "hi@brightB.com", "helpful_tip", "Something I noticed at brightB.com", "Bright B", "b@me.com"),
+        ("gleamC.com", "info@gleamC.com", "quick_audit", "Quick note about Gleam C", "Gleam C", "b@me.com"),
+    ]
+    for domain, email, template, subject, company, account in sends:
+        ai_outreach.log_sent(db, domain, email, template, subject, company=company, sender_account=account)
+    ai_outreach.log_sent(db, *sends[0][:4], company="Smile A", sender_account="a@me.com")  # duplicate: ignored
+
+    ai_outreach.set_status(db, "smileA.com", "replied")
+    ai_outreach.set_status(db, "brightB.com", "bounced")
+    ai_outreach.set_status(db, "brightB.com", "replied")   # a bounce that was really a reply
+    ai_outreach.set_status(db, "gleamC.com", "bounced")
+    ai_outreach.set_status(db, "gleamC.com", "sent")
+
+    incremental = _stats(db)
+    assert ("subject", "Quick note about {company}", 3, 2, 0) in incremental
+    assert ("account", "b@me.com", 2, 1, 0) in incremental
+    assert ("template", "helpful_tip", 1, 1, 0) in incremental
+    ai_outreach.rebuild_campaign_stats(db)
+    assert _stats(db) == incremental
+
+
+def test_subject_variant():
+    assert ai_outreach.subject_variant("Something I noticed at smile.com", "Smile", "smile.com") == \
+        "Something I noticed at {domain}"
+    assert ai_outreach.subject_variant("Thought about Smile Dental", "Smile Dental", "smile.com") == \
+        "Thought about {company}"
+
+
+# ── Provider interleaving (MX → provider, per-provider spacing) ──
+
+@pytest.fixture
+def mx(monkeypatch):
+    """Canned MX answers, a clean per-provider send log and a frozen clock."""
+    monkeypatch.setattr(ai_outreach, "_mx_cache", {
+        "gmailpractice.com": (True, ["aspmx.l.google.com", "alt1.aspmx.l.google.com"]),
+        "googlepractice.com": (True, ["aspmx.l.google.com"]),
+        "officepractice.com": (True, ["officepractice-com.mail.protection.outlook.com"]),
+        "ukpractice.co.uk": (True, ["mx1.mailhost.co.uk"]),
+        "nomx.com": (True, []),
+    })
+    monkeypatch.setattr(ai_outreach, "_provider_last_send", {})
+    monkeypatch.setattr(ai_outreach.time, "time", lambda: 1_000_000.0)
+
+
+def test_mx_provider(mx):
+    assert ai_outreach.mx_provider("dr@GmailPractice.com") == "google"
+    assert ai_outreach.mx_provider("info@officepractice.com") == "microsoft"
+    assert ai_outreach.mx_provider("info@ukpractice.co.uk") == "mailhost.co.uk"
+    assert ai_outreach.mx_provider("info@nomx.com") == "nomx.com"
+
+
+def test_interleave_spreads_one_provider_out(mx):
+    queue = ["a@gmailpractice.com", "b@googlepractice.com", "c@gmailpractice.com",
+             "d@officepractice.com", "e@ukpractice.co.uk"]
+    order = list(ai_outreach.interleave_by_provider(queue, lambda email: email, dry_run=True))
+    assert order == [
+        ("google", "a@gmailpractice.com"),
+        ("microsoft", "d@officepractice.com"),      # google isn't ready again yet
+        ("mailhost.co.uk", "e@ukpractice.co.uk"),
+        ("google", "b@googlepractice.com"),         # then best-first within google
+        ("google", "c@gmailpractice.com"),
+    ]
+    # dry run records the waits it would have made: 3600 / 20 per hour apart
+    assert ai_outreach._provider_last_send["google"] == 1_000_000.0 + 2 * 180
+
+
+def test_interleave_records_only_what_was_pulled(mx):
+    # main() checks its quota before pulling, so an unpulled item never waits or counts
+    queue = ai_outreach.interleave_by_provider(
+        ["a@gmailpractice.com", "b@gmailpractice.com", "c@officepractice.com"], lambda email: email, dry_run=True)
+    assert next(queue) == ("google", "a@gmailpractice.com")
+    assert ai_outreach._provider_last_send == {"google": 1_000_000.0}
+
+
+# ── Account health (limit and pace per sender account) ──
+
+def _seed_sends(conn, account, n, bounced=0, replied=0, deferred=0):
+    for i in range(n):
+        ai_outreach.log_sent(conn, f"p{i}.com", f"dr@p{i}.com", "quick_audit", "Hi", sender_account=account)
+    for i in range(bounced):
+        ai_outreach.set_status(conn, f"p{i}.com", "bounced")
+    for i in range(bounced, bounced + replied):
+        ai_outreach.set_status(conn, f"p{i}.com", "replied")
+    conn.executemany("INSERT INTO smtp_deferrals (event_date, account, code) VALUES (?, ?, 421)",
+                     [(ai_outreach.TODAY, account)] * deferred)
+
+
+def _account(limit=None):
+    # 20 days old: week 3-4 of the warmup ramp (25/day), 35/day two weeks early
+    created = (ai_outreach.date.today() - ai_outreach.timedelta(days=20)).isoformat()
+    return {"email": "me@practice-mail.com", "created": created, "limit": limit}
+
+
+@pytest.mark.parametrize("sends, state, limit, pace", [
+    ({"n": 10, "bounced": 5}, "no track record", 25, 1),     # under ACCOUNT_MIN_SAMPLE
+    ({"n": 40}, "healthy", 35, 1),
+    ({"n": 40, "replied": 2}, "healthy", 50, 1),              # 5% replies: two tiers early
+    ({"n": 40, "bounced": 1}, "steady", 25, 1),               # 2.5%: over HEALTHY_BOUNCE only
+    ({"n": 40, "bounced": 2}, "backing off", 12, 2),          # 5% = BOUNCE_BACKOFF
+    ({"n": 40, "bounced": 4}, "backing off", 6, 3),           # 2x the threshold
+    ({"n": 40, "bounced": 12}, "backing off", 3, 4),          # capped at 3 steps, floor ACCOUNT_MIN_LIMIT
+    ({"n": 40, "deferred": 2}, "backing off", 12, 2),         # 2 / 42 attempts > DEFERRAL_BACKOFF
+])
+def test_account_plan(db, sends, state, limit, pace):
+    _seed_sends(db, "me@practice-mail.com", **sends)
+    plan = ai_outreach.account_plan(db, _account())
+    assert (plan["state"], plan["limit"], plan["pace"]) == (state, limit, pace)
+
+
+def test_manual_limit_is_never_ramped(db):
+    _seed_sends(db, "me@practice-mail.com", 40, replied=4)
+    assert ai_outreach.account_plan(db, _account(limit=10))["limit"] == 10
+
+
+@pytest.fixture
+def senders(monkeypatch):
+    """Two sender accounts, 'slow' backing off at 2x pace, on a clock the test moves."""
+    clock = [1_000_000.0]
+    monkeypatch.setattr(ai_outreach, "ACCOUNTS", [{"email": "slow@me.com"}, {"email": "fast@me.com"}])
+    monkeypatch.setattr(ai_outreach, "_account_limits", {"slow@me.com": 10, "fast@me.com": 10})
+    monkeypatch.setattr(ai_outreach, "_account_sent_today", {})
+    monkeypatch.setattr(ai_outreach, "_account_pace", {"slow@me.com": 2, "fast@me.com": 1})
+    monkeypatch.setattr(ai_outreach, "_account_ready_at", {})
+    monkeypatch.setattr(ai_outreach, "_account_resting", set())
+    monkeypatch.setattr(ai_outreach, "_sender_idx", 0)
+    monkeypatch.setattr(ai_outreach.time, "time", lambda: clock[0])
+    return clock
+
+
+def _send_from_next():
+    email = ai_outreach._next_sender()["email"]
+    ai_outreach._account_sent_today[email] = ai_outreach._account_sent_today.get(email, 0) + 1
+    ai_outreach._note_account_send(email)
+    return email
+
+
+def test_backing_off_account_does_not_slow_the_others(senders):
+    assert _send_from_next() == "slow@me.com"
+    ready = ai_outreach._account_ready_at["slow@me.com"]
+    assert ready >= senders[0] + 2 * 20
+    assert "fast@me.com" not in ai_outreach._account_ready_at
+    # 'fast' keeps going at the normal pace while 'slow' sits out its delay
+    assert [_send_from_next() for _ in range(3)] == ["fast@me.com"] * 3
+    senders[0] = ready
+    assert _send_from_next() == "slow@me.com"
+
+
+def test_waits_only_when_every_account_is_backing_off(senders, monkeypatch):
+    slept = []
+    monkeypatch.setattr(ai_outreach.time, "sleep", slept.append)
+    ai_outreach._account_limits["fast@me.com"] = 0
+    assert _send_from_next() == "slow@me.com"
+    assert _send_from_next() == "slow@me.com"
+    assert len(slept) == 1 and slept[0] >= 2 * 20
+
+
+# ── Reply matching by Message-ID (IMAP header search) ──
+
+class FakeImap:
+    """Answers UID SEARCH with `uids` once, and FETCH with canned header blocks."""
+
+    def __init__(self, uids, headers):
+        self.uids, self.headers, self.calls = uids, headers, []
+
+    def uid(self, command, *args):
+        self.calls.append((command, args))
+        if command == "SEARCH":
+            uids, self.uids = self.uids, b""
+            return "OK", [uids]
+        return "OK", [(b"1 (BODY[HEADER.FIELDS (IN-REPLY-TO REFERENCES)] {60}", h) for h in self.headers] + [b")"]
+
+
+def test_reply_search_query_and_matching(monkeypatch):
+    monkeypatch.setattr(ai_outreach, "REPLY_SEARCH_BATCH", 2)
+    pending = {"<a.1@me.com>": "smileA.com", "<b.2@me.com>": "brightB.com", "<c.3@me.com>": "gleamC.com"}
+    mail = FakeImap(b"17 42", [
+        b"In-Reply-To: <b.2@me.com>\r\nReferences: <a.0@me.com>\r\n <b.2@me.com>\r\n\r\n",
+        b"In-Reply-To: <unrelated@elsewhere.com>\r\n\r\n",
+    ])
+    found = ai_outreach._search_replies_by_message_id(mail, pending, "01-Oct-2026")
+    assert found == {"brightB.com"}
+    searches = [args for command, args in mail.calls if command == "SEARCH"]
+    assert searches == [
+        (None, 'SINCE "01-Oct-2026" (OR OR OR '
+               'HEADER In-Reply-To "<a.1@me.com>" HEADER References "<a.1@me.com>" '
+               'HEADER In-Reply-To "<b.2@me.com>" HEADER References "<b.2@me.com>")'),
+        (None, 'SINCE "01-Oct-2026" (OR HEADER In-Reply-To "<c.3@me.com>" HEADER References "<c.3@me.com>")'),
+    ]
+    assert ("FETCH", ("17,42", "(BODY.PEEK[HEADER.FIELDS (IN-REPLY-TO REFERENCES)])")) in mail.calls
+
+
+def test_follow_up_threads_under_the_first_email():
+    msg = ai_outreach._build_message("me@practice-mail.com", "dr@smile.com", "Re: Smile", "Hi",
+                                     "<f.2@practice-mail.com>", in_reply_to="<a.1@practice-mail.com>")
+    assert msg["Message-ID"] == "<f.2@practice-mail.com>"
+    assert msg["In-Reply-To"] == msg["References"] == "<a.1@practice-mail.com>"
+
+
+def test_pending_message_ids_only_for_open_leads(db):
+    ai_outreach.log_sent(db, "smileA.com", "dr@smileA.com", "quick_audit", "Hi",
+                         sender_account="me@practice-mail.com", message_id="<a.1@practice-mail.com>")
+    ai_outreach.log_followup(db, "smileA.com", "dr@smileA.com", 1,
+                             message_id="<f.1@practice-mail.com>", sender_account="me@practice-mail.com")
+    ai_outreach.log_sent(db, "brightB.com", "hi@brightB.com", "quick_audit", "Hi",
+                         sender_account="me@practice-mail.com", message_id="<b.2@practice-mail.com>")
+    ai_outreach.mark_replied(db, "brightB.com")
+    assert ai_outreach.get_pending_message_ids(db, "me@practice-mail.com") == {
+        "<a.1@practice-mail.com>": "smileA.com", "<f.1@practice-mail.com>": "smileA.com"}
+    assert ai_outreach.get_pending_message_ids(db, "other@practice-mail.com") == {}